@@ -1,34 +1,128 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import redis
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
 from app.database import get_database
-from app.models import User, TokenData
+from ugc_shared.models import AuthenticatedUser, User, TokenData, UserRole
+from app.redis_client import get_redis
 from bson import ObjectId
+from pymongo import ReturnDocument
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: Argon2id for new hashes; bcrypt hashes are still verified and flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.password_argon2_time_cost,
+    argon2__memory_cost=settings.password_argon2_memory_cost,
+    argon2__parallelism=settings.password_argon2_parallelism,
+    bcrypt__rounds=settings.password_bcrypt_rounds
+)
+
+# Hashing is CPU bound and releases the GIL, so it runs on a small thread pool instead of the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
+_password_slots: Optional[asyncio.Semaphore] = None
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already waiting for a worker"""
 
 # JWT token scheme
 security = HTTPBearer()
 
+# Redis key holding the lowest token version still accepted for a user
+TOKEN_VERSION_KEY_PREFIX = "auth:token_version:"
+# Response header carrying a fresh access token when the claims of the caller's one went stale
+ACCESS_TOKEN_HEADER = "X-Access-Token"
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    # Passlib's bcrypt handler automatically truncates passwords longer than 72 bytes.
     return pwd_context.hash(password)
 
+async def _run_password_task(func, *args):
+    """Run a hashing call on the password pool, failing fast when its queue is full"""
+    global _password_slots
+    if _password_slots is None:
+        _password_slots = asyncio.Semaphore(settings.password_hash_workers + settings.password_hash_max_pending)
+    if _password_slots.locked():
+        raise PasswordHasherBusy()
+    async with _password_slots:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password off the event loop.
+
+    Returns whether it matches and, if the hash uses an outdated scheme or
+    cost, a new hash to store in its place.
+    """
+    return await _run_password_task(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await _run_password_task(pwd_context.hash, password)
+
+class VerifiedTokenCache:
+    """LRU of decoded access tokens, keyed by their signature.
+
+    A hit skips the HMAC check and claim parsing. The entry keeps the
+    token's signed part, so a token is only served from the cache if it is
+    byte for byte the one that was verified.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, TokenData]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[TokenData]:
+        signing_input, _, signature = token.rpartition(".")
+        entry = self._entries.get(signature)
+        if entry is None or entry[0] != signing_input:
+            return None
+        token_data = entry[1]
+        if token_data.expires_at is not None and token_data.expires_at <= time.time():
+            del self._entries[signature]
+            return None
+        self._entries.move_to_end(signature)
+        return token_data
 
+    def put(self, token: str, token_data: TokenData):
+        signing_input, _, signature = token.rpartition(".")
+        self._entries[signature] = (signing_input, token_data)
+        self._entries.move_to_end(signature)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
 
+_token_cache = VerifiedTokenCache(settings.auth_token_cache_size)
+
+def token_claims(user: User) -> dict:
+    """Claims embedded in a user's tokens, so requests are authenticated without a database read"""
+    db = get_database()
+    profile = db.profiles.find_one({"user_id": user.id}, {"_id": 1})
+    return {
+        "sub": user.email,
+        "uid": str(user.id),
+        "pid": str(profile["_id"]) if profile else None,
+        "role": user.role.value,
+        "act": user.is_active,
+        "ver": user.token_version
+    }
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -52,6 +146,11 @@ def create_refresh_token(data: dict):
 
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
     """Verify and decode JWT token"""
+    if token_type == "access":
+        cached = _token_cache.get(token)
+        if cached:
+            return cached
+    
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
@@ -60,13 +159,60 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
         if email is None or token_type_payload != token_type:
             return None
             
-        token_data = TokenData(email=email)
+        token_data = TokenData(
+            email=email,
+            user_id=payload.get("uid"),
+            profile_id=payload.get("pid"),
+            role=payload.get("role") or UserRole.CREATOR,
+            is_active=payload.get("act", True),
+            token_version=payload.get("ver", 0),
+            expires_at=payload.get("exp")
+        )
+        if token_type == "access":
+            _token_cache.put(token, token_data)
         return token_data
         
-    except JWTError as e:
+    except (JWTError, ValueError) as e:
         logger.error(f"JWT Error: {e}")
         return None
 
+def is_token_revoked(token_data: TokenData) -> bool:
+    """Whether the user's tokens were revoked after this one was issued"""
+    try:
+        current_version = get_redis().get(f"{TOKEN_VERSION_KEY_PREFIX}{token_data.user_id}")
+    except redis.RedisError as e:
+        # Fail open like the other Redis-backed checks; refresh still checks the database
+        logger.warning(f"Token revocation list unavailable: {e}")
+        return False
+    return current_version is not None and token_data.token_version < int(current_version)
+
+def _user_id_query(user_id: str) -> dict:
+    """Query for a user by id; users registered before ids were stored as ObjectIds hold them as strings"""
+    return {"_id": {"$in": [ObjectId(user_id), str(user_id)]}}
+
+def revoke_user_tokens(user_id: str) -> Optional[int]:
+    """Invalidate every token issued to a user so far and return the new token version.
+
+    Returns None if the user does not exist.
+    """
+    db = get_database()
+    user_data = db.users.find_one_and_update(
+        _user_id_query(user_id),
+        {"$inc": {"token_version": 1}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if user_data is None:
+        return None
+    token_version = user_data["token_version"]
+    # Older tokens are all expired once the longest-lived (refresh) token would be
+    get_redis().set(
+        f"{TOKEN_VERSION_KEY_PREFIX}{user_id}",
+        token_version,
+        ex=settings.refresh_token_expire_days * 24 * 3600
+    )
+    return token_version
+
 async def get_user_by_email(email: str) -> Optional[User]:
     """Get user by email from database"""
     try:
@@ -86,7 +232,7 @@ async def get_user_by_id(user_id: str) -> Optional[User]:
     """Get user by ID from database"""
     try:
         db = get_database()
-        user_data = db.users.find_one({"_id": ObjectId(user_id)})
+        user_data = db.users.find_one(_user_id_query(user_id))
         
         if user_data:
             # Comentário: A instanciação de User a partir de user_data funciona com Pydantic v2.
@@ -106,18 +252,36 @@ async def authenticate_user(email: str, password: str) -> Optional[User]:
         if not user_data:
             return None
             
-        if not verify_password(password, user_data["hashed_password"]):
+        verified, new_hash = await verify_and_update_password(password, user_data["hashed_password"])
+        if not verified:
             return None
+        
+        if new_hash:
+            # Transparent upgrade of bcrypt (or outdated Argon2) hashes
+            db.users.update_one({"_id": user_data["_id"]}, {"$set": {"hashed_password": new_hash}})
             
         # Comentário: A instanciação de User a partir de user_data funciona com Pydantic v2.
         return User(**user_data)
         
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         logger.error(f"Error authenticating user: {e}")
         return None
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
-    """Get current authenticated user"""
+async def reissue_access_token(email: str) -> Optional[str]:
+    """New access token with the user's current claims, e.g. once their profile exists"""
+    try:
+        user = await get_user_by_email(email)
+        if user is None:
+            return None
+        return create_access_token(data=token_claims(user))
+    except Exception as e:
+        logger.error(f"Error re-issuing access token: {e}")
+        return None
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthenticatedUser:
+    """Get current authenticated user from the access token claims, without a database read"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -128,42 +292,59 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         token = credentials.credentials
         token_data = verify_token(token, "access")
         
-        if token_data is None:
+        # Tokens issued before the claims were embedded have no user id and must be refreshed
+        if token_data is None or token_data.user_id is None:
             raise credentials_exception
             
-        user = await get_user_by_email(email=token_data.email)
-        if user is None:
+        if is_token_revoked(token_data):
             raise credentials_exception
             
-        if not user.is_active:
+        if not token_data.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Inactive user"
             )
             
-        return user
+        return AuthenticatedUser(
+            id=token_data.user_id,
+            email=token_data.email,
+            role=token_data.role,
+            is_active=token_data.is_active,
+            profile_id=token_data.profile_id,
+            token_version=token_data.token_version
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
         raise credentials_exception
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def refresh_access_token(refresh_token: str) -> Optional[str]:
-    """Generate new access token from refresh token"""
+async def refresh_access_token(refresh_token: str) -> Optional[str]:
+    """Generate new access token from refresh token.
+
+    The user is read from the database here, so the new token carries
+    current claims and revoked or deactivated users cannot refresh.
+    """
     try:
         token_data = verify_token(refresh_token, "refresh")
         if token_data is None:
             return None
             
+        user = await get_user_by_email(token_data.email)
+        if user is None or not user.is_active or token_data.token_version < user.token_version:
+            return None
+        
         # Create new access token
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = create_access_token(
-            data={"sub": token_data.email}, 
+            data=token_claims(user),
             expires_delta=access_token_expires
         )
         
@@ -172,5 +353,3 @@ def refresh_access_token(refresh_token: str) -> Optional[str]:
     except Exception as e:
         logger.error(f"Error refreshing access token: {e}")
         return None
-
-
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
 import os
 
 class Settings(BaseSettings):
@@ -12,6 +12,15 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    auth_token_cache_size: int = 4096  # Verified access tokens kept in memory per process
+    
+    # Password hashing: new hashes use Argon2id, bcrypt hashes are upgraded on login
+    password_argon2_time_cost: int = 2
+    password_argon2_memory_cost: int = 19456  # KiB
+    password_argon2_parallelism: int = 1
+    password_bcrypt_rounds: int = 12  # Only used to verify legacy hashes
+    password_hash_workers: int = 4  # Threads hashing passwords off the event loop
+    password_hash_max_pending: int = 64  # Logins waiting for a hash worker before new ones get 503
     
     # Instagram API
     instagram_app_id: Optional[str] = None
@@ -20,13 +29,57 @@ class Settings(BaseSettings):
     
     # OpenAI
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+    openai_base_url: Optional[str] = None  # Point at a local fake server for testing
+    openai_model: str = "gpt-3.5-turbo"
+    openai_timeout_seconds: float = 60.0
+    openai_max_connections: int = 20
+    openai_max_concurrency: int = 8
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 60000
+    openai_max_retries: int = 4
+    openai_retry_base_delay: float = 0.5
+    openai_retry_max_delay: float = 20.0
     
+    # AI analysis
+    ai_batch_size: int = 5  # Posts scored per batched request
+    ai_batch_max_tokens_per_post: int = 400
+    ai_sweep_llm_max_posts: int = 2  # Posts per profile and sweep sent to the LLM after local scoring
+    ai_sweep_llm_score_threshold: float = 0.6  # Only posts scoring below this locally are sent to the LLM
+    ai_structured_output: str = "function"  # "function" (function calling), "json_object" or "off"
+    ai_cache_enabled: bool = True
+    ai_cache_ttl_seconds: int = 7 * 24 * 3600
+    ai_cache_max_entries: int = 50000
+    ai_budget_enabled: bool = True
+    ai_daily_token_budget: int = 2_000_000  # Tokens per UTC day across all profiles
+    ai_background_budget_share: float = 0.8  # Share of the daily budget sweeps may use
+    ai_profile_daily_token_budget: Dict[str, int] = {"free": 20_000, "basic": 100_000, "premium": 500_000}
+    ai_job_ttl_seconds: int = 3600  # How long job records and their results are kept
+    content_suggestions_max_age_hours: int = 24
+    content_suggestions_refresh_lock_seconds: int = 600
+    audience_insights_refresh_cooldown_seconds: int = 900
+    dashboard_chart_max_points: int = 180  # Longer chart series are downsampled to this many points
+
+    # Report files
+    reports_storage: str = "local"  # "local" (reports_dir) or "s3" (any S3-compatible store, e.g. MinIO)
+    reports_dir: str = "/app/reports"  # Where the worker writes report PDFs
+    reports_accel_redirect_prefix: Optional[str] = None  # e.g. "/protected/reports/": nginx serves the PDF after the API authorizes it
+    reports_download_max_age: int = 86400  # Report files never change once written
+    reports_download_url_expires_seconds: int = 300  # Lifetime of pre-signed download URLs (s3)
+    reports_s3_bucket: str = "reports"
+    reports_s3_endpoint_url: Optional[str] = None  # e.g. "http://minio:9000"; None for AWS
+    reports_s3_public_endpoint_url: Optional[str] = None  # Host browsers use for pre-signed URLs, if different
+    reports_s3_region: Optional[str] = None
+    reports_s3_access_key_id: Optional[str] = None
+    reports_s3_secret_access_key: Optional[str] = None
+    reports_s3_part_size_mb: int = 8
+
     # Email
     sendgrid_api_key: Optional[str] = None
     from_email: str = "noreply@ugcsaas.com"
     
     # Redis (for Celery)
     redis_url: str = "redis://redis:6379/0"
+    redis_socket_timeout: float = 2.0
     
     # CORS
     allowed_origins: list = [
@@ -49,11 +49,22 @@ def create_indexes():
         mongodb.database.metrics.create_index("post_id")
         
         # Reports collection indexes
-        mongodb.database.reports.create_index([("profile_id", 1), ("created_at", -1)])
+        mongodb.database.reports.create_index([("profile_id", 1), ("created_at", -1), ("_id", -1)])
+        mongodb.database.reports.create_index([("profile_id", 1), ("fingerprint", 1), ("created_at", -1)])
         
         # Posts feedback collection indexes
         mongodb.database.posts_feedback.create_index("post_id", unique=True)
         mongodb.database.posts_feedback.create_index("profile_id")
+        mongodb.database.posts_feedback.create_index([("profile_id", 1), ("created_at", -1), ("_id", -1)])
+        
+        # Feedback stats collection indexes (running aggregates, one document per profile)
+        mongodb.database.feedback_stats.create_index("profile_id", unique=True)
+        
+        # Content suggestions collection indexes (latest suggestions per profile)
+        mongodb.database.content_suggestions.create_index([("profile_id", 1), ("created_at", -1)])
+        
+        # Audience insights collection indexes (one document per profile)
+        mongodb.database.audience_insights.create_index("profile_id", unique=True)
         
         logger.info("Database indexes created successfully")
         
@@ -63,4 +74,3 @@ def create_indexes():
 def get_database() -> Database:
     """Get database instance"""
     return mongodb.database
-
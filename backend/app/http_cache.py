@@ -0,0 +1,53 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from pymongo.collection import Collection
+from ugc_shared.list_versions import LIST_VERSIONS_FIELD
+
+# Responses are per user and must be revalidated before reuse
+CACHE_CONTROL = "private, no-cache"
+
+def latest_write(collection: Collection, query: Dict[str, Any], field: str) -> Optional[datetime]:
+    """Timestamp of the most recent document matching `query`, read from the (query, field) index"""
+    document = collection.find_one(query, {"_id": 0, field: 1}, sort=[(field, -1)])
+    return document.get(field) if document else None
+
+def list_version(profile: Dict[str, Any], listing: str) -> int:
+    """Version of a profile's listing, bumped by bump_list_version on every insert or delete"""
+    return (profile.get(LIST_VERSIONS_FIELD) or {}).get(listing, 0)
+
+def compute_etag(*parts: Any) -> str:
+    """Weak ETag from the values a response depends on"""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's cached copy is still current (If-None-Match wins over If-Modified-Since)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> Optional[Response]:
+    """A 304 response if the client's copy is current, else None"""
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=cache_headers(etag, last_modified))
+    return None
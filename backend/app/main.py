@@ -1,12 +1,14 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 import uvicorn
 
 from app.config import settings
 from app.database import connect_to_mongo, close_mongo_connection
+from app.redis_client import close_redis_connection
+from ugc_shared.services.ai_client import ai_client
 from app.routers import auth, profiles, reports, feedback, instagram, ai_insights
 
 # Configure logging
@@ -32,6 +34,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down UGC SaaS Backend...")
+    await ai_client.aclose()
+    close_redis_connection()
     close_mongo_connection()
 
 # Create FastAPI application
@@ -39,7 +43,8 @@ app = FastAPI(
     title="UGC SaaS API",
     description="API for UGC Creators SaaS Platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -49,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Access-Token", "Deprecation"],
 )
 
 # Include routers
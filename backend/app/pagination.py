@@ -0,0 +1,57 @@
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# Listings are ordered newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Set on pages served with the deprecated `skip` offset, which walks the index and slows down with depth
+DEPRECATION_HEADER = "Deprecation"
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """Opaque cursor pointing after `document` in KEYSET_SORT order"""
+    data = json.dumps([document["created_at"].isoformat(), str(document["_id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Keyset position of a cursor; raises 400 if it was not produced by encode_cursor"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, document_id = json.loads(data)
+        return {"created_at": datetime.fromisoformat(created_at), "_id": ObjectId(document_id)}
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def keyset_query(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """`query` restricted to the documents after `cursor`"""
+    if not cursor:
+        return query
+    position = decode_cursor(cursor)
+    return {
+        **query,
+        "$or": [
+            {"created_at": {"$lt": position["created_at"]}},
+            {"created_at": position["created_at"], "_id": {"$lt": position["_id"]}}
+        ]
+    }
+
+def next_cursor(documents: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """Cursor of the following page, or None if this page is the last"""
+    if limit <= 0 or len(documents) < limit:
+        return None
+    return encode_cursor(documents[-1])
+
+def flag_deprecated_skip(headers: Dict[str, str], listing: str, skip: int, cursor: Optional[str]):
+    """Mark a page served with the deprecated `skip` offset, until clients move to the cursor"""
+    if skip and not cursor:
+        logger.warning(f"Deprecated skip={skip} on the {listing} listing")
+        headers[DEPRECATION_HEADER] = "true"
@@ -1,27 +1,150 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
-from app.models import User
+from fastapi import APIRouter, HTTPException, Response, status, Depends
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional
+from ugc_shared.models import AuthenticatedUser, UserRole
 from app.auth import get_current_active_user
 from app.database import get_database
-from app.services.ai_service import ai_service
+from ugc_shared.list_versions import bump_list_version
+from ugc_shared.services.ai_service import ai_service
+from ugc_shared.services.ai_cache import ai_cache
+from ugc_shared.services.ai_parsing import ai_output_parser
+from app.services.ai_jobs import ai_job_service
+from ugc_shared.services.ai_budget import ai_budget, AIBudgetExceeded, BudgetScope, PRIORITY_INTERACTIVE
+from ugc_shared.services.feedback_stats import feedback_stats_service
+from app.services.task_queue import enqueue_task
+from app.redis_client import get_redis
+from app.config import settings
 from bson import ObjectId
+from datetime import datetime, timedelta
+import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ai", tags=["ai-insights"])
 
+# Fallback suggestions based on niche, served until the worker has generated some
+FALLBACK_SUGGESTIONS = {
+    "fashion": [
+        "Mostre seu look do dia com detalhes dos acessórios",
+        "Faça um antes e depois de um styling",
+        "Compartilhe dicas de como combinar peças básicas",
+        "Mostre sua rotina matinal de escolha de roupas",
+        "Crie um post sobre tendências da estação"
+    ],
+    "beauty": [
+        "Tutorial de maquiagem passo a passo",
+        "Rotina de skincare matinal e noturna",
+        "Resenha de produtos que você usa",
+        "Transformação com maquiagem",
+        "Dicas de cuidados com a pele"
+    ],
+    "fitness": [
+        "Treino rápido de 10 minutos",
+        "Receita de pré-treino saudável",
+        "Progresso da sua jornada fitness",
+        "Dicas de motivação para exercícios",
+        "Comparação de antes e depois"
+    ]
+}
+
+DEFAULT_SUGGESTIONS = [
+    "Compartilhe uma dica valiosa do seu nicho",
+    "Mostre os bastidores do seu trabalho",
+    "Faça uma pergunta para engajar sua audiência",
+    "Conte uma história pessoal relacionada ao seu conteúdo",
+    "Crie um post educativo sobre seu tema"
+]
+
+# Headers for Server-Sent Events responses; X-Accel-Buffering stops nginx from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _budget_scope(profile: Dict[str, Any]) -> BudgetScope:
+    """Budget scope for interactive AI calls made on behalf of a profile"""
+    return BudgetScope(str(profile["_id"]), profile.get("subscription_status", "free"), PRIORITY_INTERACTIVE)
+
+def _check_ai_budget(scope: BudgetScope):
+    """Reject the request with 429 when the AI token budget is exhausted"""
+    exceeded = ai_budget.check(ai_budget.estimate_post_analyses(1), scope)
+    if exceeded:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Daily AI usage limit reached",
+            headers={"Retry-After": str(exceeded.retry_after)}
+        )
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+async def _stream_analysis_events(
+    analysis_stream: AsyncIterator,
+    started_at: float,
+    scope: BudgetScope,
+    on_result=None
+) -> AsyncIterator[str]:
+    """Turn AIService.stream_post_analysis events into SSE, measuring time to first byte.
+
+    `on_result` may post-process the final analysis and return extra fields
+    for the closing `done` event.
+    """
+    ttfb_ms = None
+    try:
+        with ai_budget.scope(*scope):
+            async for event, data in analysis_stream:
+                if event == "delta":
+                    if not data:
+                        continue
+                    if ttfb_ms is None:
+                        ttfb_ms = round((time.perf_counter() - started_at) * 1000, 1)
+                    yield _sse_event("delta", {"text": data})
+                    continue
+
+                if not data:
+                    yield _sse_event("error", {"detail": "Failed to analyze post content"})
+                    return
+
+                yield _sse_event("result", data)
+                extra = on_result(data) if on_result else {}
+                total_ms = round((time.perf_counter() - started_at) * 1000, 1)
+                logger.info(f"Streamed post analysis: ttfb={ttfb_ms}ms total={total_ms}ms")
+                yield _sse_event("done", {"ttfb_ms": ttfb_ms, "total_ms": total_ms, **extra})
+
+    except AIBudgetExceeded as e:
+        yield _sse_event("error", {"detail": "Daily AI usage limit reached", "retry_after": e.retry_after})
+    except Exception as e:
+        logger.error(f"Error streaming post analysis: {e}")
+        yield _sse_event("error", {"detail": "Internal server error"})
+
+def _job_response(job: Optional[Dict[str, Any]], response: Response) -> Dict[str, Any]:
+    """Return a job handle, with 202 while the job is still pending"""
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Failed to enqueue AI job"
+        )
+    if job["status"] in ("queued", "running"):
+        response.status_code = status.HTTP_202_ACCEPTED
+    return ai_job_service.public_view(job)
+
 @router.post("/analyze-post")
 async def analyze_post(
     post_caption: str,
     media_type: str,
-    current_user: User = Depends(get_current_active_user)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
-    """Analyze a post using AI"""
+    """Analyze a post using AI.
+    
+    The analysis runs in the worker: the response is a job handle to poll at
+    /ai/jobs/{job_id}. Cached analyses are returned right away as a
+    completed job.
+    """
     try:
         db = get_database()
         
         # Get user\'s profile to determine niche
-        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)})
+        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"niche": 1, "subscription_status": 1})
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -30,20 +153,26 @@ async def analyze_post(
         
         niche = profile.get("niche", "lifestyle")
         
-        # Analyze post with AI
-        analysis = ai_service.analyze_post_content(
-            caption=post_caption,
-            media_type=media_type,
-            niche=niche
+        cached_analysis = ai_service.get_cached_analysis(post_caption, media_type, niche)
+        if cached_analysis:
+            return {"job_id": None, "kind": "post_analysis", "status": "completed", "result": cached_analysis}
+        
+        scope = _budget_scope(profile)
+        _check_ai_budget(scope)
+        
+        job = ai_job_service.submit(
+            "post_analysis",
+            "app.tasks.ai_tasks.run_post_analysis",
+            user_id=str(current_user.id),
+            payload={
+                "caption": post_caption,
+                "media_type": media_type,
+                "niche": niche,
+                "profile_id": scope.profile_id,
+                "tier": scope.tier
+            }
         )
-        
-        if not analysis:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to analyze post content"
-            )
-        
-        return analysis
+        return _job_response(job, response)
         
     except HTTPException:
         raise
@@ -54,14 +183,59 @@ async def analyze_post(
             detail="Internal server error"
         )
 
+@router.post("/analyze-post/stream")
+async def analyze_post_stream(
+    post_caption: str,
+    media_type: str,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Analyze a post using AI, streaming the feedback text as Server-Sent Events.
+
+    Emits `delta` events with partial feedback text, a `result` event with the
+    full analysis (scores, feedback_text, suggestions) and a closing `done`
+    event with timings, or an `error` event.
+    """
+    started_at = time.perf_counter()
+    db = get_database()
+    
+    profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"niche": 1, "subscription_status": 1})
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    scope = _budget_scope(profile)
+    _check_ai_budget(scope)
+    
+    analysis_stream = ai_service.stream_post_analysis(
+        caption=post_caption,
+        media_type=media_type,
+        niche=profile.get("niche", "lifestyle")
+    )
+    
+    return StreamingResponse(
+        _stream_analysis_events(analysis_stream, started_at, scope),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/content-suggestions")
-async def get_content_suggestions(current_user: User = Depends(get_current_active_user)):
-    """Get AI-generated content suggestions"""
+async def get_content_suggestions(current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Get the latest precomputed content suggestions.
+    
+    Suggestions are generated by the worker; when the stored ones are missing
+    or older than the configured max age a background refresh is requested
+    and the current (possibly stale) suggestions are returned right away.
+    """
     try:
         db = get_database()
         
         # Get user\'s profile
-        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)})
+        profile = db.profiles.find_one(
+            {"user_id": ObjectId(current_user.id)},
+            {"_id": 1, "niche": 1}
+        )
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -71,63 +245,36 @@ async def get_content_suggestions(current_user: User = Depends(get_current_activ
         niche = profile.get("niche", "lifestyle")
         profile_id = profile["_id"]
         
-        # Get recent performance data
-        recent_metrics = list(db.metrics.find(
-            {"profile_id": profile_id}
-        ).sort("date", -1).limit(5))
+        latest = db.content_suggestions.find_one(
+            {"profile_id": profile_id},
+            {"_id": 0, "suggestions": 1, "created_at": 1},
+            sort=[("created_at", -1)]
+        )
         
-        # Convert metrics to performance data
-        recent_performance = []
-        for metric in recent_metrics:
-            if metric.get("followers_count", 0) > 0:
-                engagement_rate = metric.get("avg_engagement_rate", 0)
-                recent_performance.append({
-                    "engagement_rate": engagement_rate,
-                    "media_type": "mixed",  # We don\'t have specific type in metrics
-                    "date": metric.get("date")
-                })
+        max_age = timedelta(hours=settings.content_suggestions_max_age_hours)
+        is_stale = not latest or latest["created_at"] < datetime.utcnow() - max_age
         
-        # Generate suggestions
-        suggestions = ai_service.generate_content_suggestions(
-            niche=niche,
-            recent_performance=recent_performance
-        )
+        if is_stale:
+            enqueue_task(
+                "app.tasks.ai_tasks.generate_profile_content_suggestions",
+                args=[str(profile_id)],
+                lock_key=f"refresh:content_suggestions:{profile_id}",
+                lock_ttl=settings.content_suggestions_refresh_lock_seconds
+            )
         
-        if not suggestions:
-            # Fallback suggestions based on niche
-            fallback_suggestions = {
-                "fashion": [
-                    "Mostre seu look do dia com detalhes dos acessórios",
-                    "Faça um antes e depois de um styling",
-                    "Compartilhe dicas de como combinar peças básicas",
-                    "Mostre sua rotina matinal de escolha de roupas",
-                    "Crie um post sobre tendências da estação"
-                ],
-                "beauty": [
-                    "Tutorial de maquiagem passo a passo",
-                    "Rotina de skincare matinal e noturna",
-                    "Resenha de produtos que você usa",
-                    "Transformação com maquiagem",
-                    "Dicas de cuidados com a pele"
-                ],
-                "fitness": [
-                    "Treino rápido de 10 minutos",
-                    "Receita de pré-treino saudável",
-                    "Progresso da sua jornada fitness",
-                    "Dicas de motivação para exercícios",
-                    "Comparação de antes e depois"
-                ]
+        if latest and latest.get("suggestions"):
+            return {
+                "suggestions": latest["suggestions"],
+                "generated_at": latest["created_at"].isoformat(),
+                "stale": is_stale
             }
-            
-            suggestions = fallback_suggestions.get(niche, [
-                "Compartilhe uma dica valiosa do seu nicho",
-                "Mostre os bastidores do seu trabalho",
-                "Faça uma pergunta para engajar sua audiência",
-                "Conte uma história pessoal relacionada ao seu conteúdo",
-                "Crie um post educativo sobre seu tema"
-            ])
         
-        return {"suggestions": suggestions}
+        # Nothing generated yet: serve niche defaults while the worker catches up
+        return {
+            "suggestions": FALLBACK_SUGGESTIONS.get(niche, DEFAULT_SUGGESTIONS),
+            "generated_at": None,
+            "stale": True
+        }
         
     except HTTPException:
         raise
@@ -139,13 +286,21 @@ async def get_content_suggestions(current_user: User = Depends(get_current_activ
         )
 
 @router.get("/audience-insights")
-async def get_audience_insights(current_user: User = Depends(get_current_active_user)):
-    """Get AI-powered audience insights"""
+async def get_audience_insights(
+    refresh: bool = False,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Get the stored AI-powered audience insights.
+    
+    Insights are computed by the worker after each metrics collection. Pass
+    `refresh=true` to force a recomputation (limited to one per cooldown
+    period per user).
+    """
     try:
         db = get_database()
         
         # Get user\'s profile
-        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)})
+        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"_id": 1})
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -154,66 +309,49 @@ async def get_audience_insights(current_user: User = Depends(get_current_active_
         
         profile_id = profile["_id"]
         
-        # Get recent metrics for analysis
-        recent_metrics = list(db.metrics.find(
-            {"profile_id": profile_id}
-        ).sort("date", -1).limit(10))
+        refresh_requested = False
+        if refresh:
+            cooldown_key = f"ratelimit:audience_insights_refresh:{current_user.id}"
+            redis = get_redis()
+            if not redis.set(cooldown_key, "1", nx=True, ex=settings.audience_insights_refresh_cooldown_seconds):
+                retry_after = max(redis.ttl(cooldown_key), 1)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Audience insights were refreshed recently, try again later",
+                    headers={"Retry-After": str(retry_after)}
+                )
+            
+            refresh_requested = enqueue_task(
+                "app.tasks.ai_tasks.compute_audience_insights",
+                args=[str(profile_id)],
+                kwargs={"force": True}
+            ) is not None
+        
+        stored = db.audience_insights.find_one(
+            {"profile_id": profile_id},
+            {"_id": 0, "insights": 1, "version": 1, "updated_at": 1}
+        )
         
-        if not recent_metrics:
+        if not stored:
+            if not refresh_requested:
+                enqueue_task(
+                    "app.tasks.ai_tasks.compute_audience_insights",
+                    args=[str(profile_id)],
+                    lock_key=f"refresh:audience_insights:{profile_id}",
+                    lock_ttl=settings.audience_insights_refresh_cooldown_seconds
+                )
             return {
                 "message": "Não há dados suficientes para análise. Conecte sua conta do Instagram e aguarde a coleta de dados.",
                 "insights": None
             }
         
-        # Prepare follower data
-        latest_metric = recent_metrics[0]
-        oldest_metric = recent_metrics[-1] if len(recent_metrics) > 1 else recent_metrics[0]
-        
-        follower_growth = 0
-        if oldest_metric.get("followers_count", 0) > 0:
-            follower_growth = ((latest_metric.get("followers_count", 0) - oldest_metric.get("followers_count", 0)) / oldest_metric.get("followers_count", 1)) * 100
-        
-        follower_data = {
-            "count": latest_metric.get("followers_count", 0),
-            "growth_rate": follower_growth
+        return {
+            "insights": stored["insights"],
+            "version": stored.get("version", 1),
+            "updated_at": stored["updated_at"].isoformat(),
+            "refresh_requested": refresh_requested
         }
         
-        # Prepare engagement patterns
-        engagement_patterns = []
-        for metric in recent_metrics:
-            engagement_patterns.append({
-                "date": metric.get("date", "").strftime("%Y-%m-%d") if metric.get("date") else "N/A",
-                "engagement_rate": metric.get("avg_engagement_rate", 0)
-            })
-        
-        # Get AI insights
-        insights = ai_service.analyze_audience_insights(
-            follower_data=follower_data,
-            engagement_patterns=engagement_patterns
-        )
-        
-        if not insights:
-            # Provide basic insights based on data
-            avg_engagement = sum(p["engagement_rate"] for p in engagement_patterns) / len(engagement_patterns) if engagement_patterns else 0
-            
-            insights = {
-                "audience_profile": f"Sua audiência de {follower_data['count']} seguidores tem uma taxa de engajamento média de {avg_engagement:.2f}%",
-                "best_posting_times": ["09:00", "12:00", "18:00"],
-                "top_content_types": ["Imagens", "Vídeos", "Stories"],
-                "growth_opportunities": [
-                    "Postar com mais consistência",
-                    "Usar hashtags relevantes",
-                    "Interagir mais com seguidores"
-                ],
-                "strategic_recommendations": [
-                    "Mantenha uma frequência regular de posts",
-                    "Responda aos comentários rapidamente",
-                    "Crie conteúdo que gere conversas"
-                ]
-            }
-        
-        return {"insights": insights}
-        
     except HTTPException:
         raise
     except Exception as e:
@@ -229,66 +367,177 @@ async def generate_post_feedback(
     post_url: str,
     post_caption: str,
     post_type: str,
-    current_user: User = Depends(get_current_active_user)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
-    """Generate AI feedback for a specific post"""
+    """Generate AI feedback for a specific post.
+    
+    The feedback is generated and saved by the worker; the response is a job
+    handle to poll at /ai/jobs/{job_id}, whose result holds the feedback_id.
+    """
     try:
         db = get_database()
         
         # Get user\'s profile
-        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)})
+        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"niche": 1, "subscription_status": 1})
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profile not found"
             )
         
-        profile_id = str(profile["_id"])
-        niche = profile.get("niche", "lifestyle")
-        
         # Check if feedback already exists
-        existing_feedback = db.posts_feedback.find_one({"post_id": post_id})
+        existing_feedback = db.posts_feedback.find_one({"post_id": post_id}, {"_id": 1})
         if existing_feedback:
             return {"message": "Feedback already exists for this post"}
         
-        # Create post feedback using AI
-        feedback = ai_service.create_post_feedback(
-            profile_id=profile_id,
-            post_id=post_id,
-            post_url=post_url,
-            post_caption=post_caption,
-            post_type=post_type,
-            niche=niche
+        _check_ai_budget(_budget_scope(profile))
+        
+        job = ai_job_service.submit(
+            "post_feedback",
+            "app.tasks.ai_tasks.run_post_feedback",
+            user_id=str(current_user.id),
+            payload={
+                "profile_id": str(profile["_id"]),
+                "post_id": post_id,
+                "post_url": post_url,
+                "post_caption": post_caption,
+                "post_type": post_type,
+                "niche": profile.get("niche", "lifestyle"),
+                "tier": profile.get("subscription_status", "free")
+            }
         )
-        
-        if not feedback:
+        return _job_response(job, response)
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating post feedback: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+@router.post("/generate-post-feedback/stream")
+async def generate_post_feedback_stream(
+    post_id: str,
+    post_url: str,
+    post_caption: str,
+    post_type: str,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Generate AI feedback for a specific post, streaming it as Server-Sent Events.
+
+    Same events as /ai/analyze-post/stream; the feedback is saved once the
+    analysis is complete and its id is sent in the `done` event.
+    """
+    started_at = time.perf_counter()
+    db = get_database()
+    
+    profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"niche": 1, "subscription_status": 1})
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    if db.posts_feedback.find_one({"post_id": post_id}, {"_id": 1}):
+        return {"message": "Feedback already exists for this post"}
+    
+    scope = _budget_scope(profile)
+    _check_ai_budget(scope)
+    
+    profile_id = str(profile["_id"])
+    post = {
+        "post_id": post_id,
+        "post_url": post_url,
+        "post_caption": post_caption,
+        "post_type": post_type
+    }
+    
+    def save_feedback(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        from ugc_shared.models import PostFeedbackInDB
+        feedback = ai_service.build_post_feedback(profile_id, post, analysis)
+        feedback_data = PostFeedbackInDB(**feedback.model_dump())
+        feedback_document = feedback_data.model_dump(by_alias=True)
+        # model_dump() turns ObjectIds into strings; feedback is looked up by ObjectId everywhere
+        feedback_document["_id"] = feedback_data.id
+        feedback_document["profile_id"] = feedback_data.profile_id
+        result = db.posts_feedback.insert_one(feedback_document)
+        feedback_stats_service.record(feedback_document)
+        bump_list_version([feedback_document["profile_id"]], "feedback")
+        return {"feedback_id": str(result.inserted_id)}
+    
+    analysis_stream = ai_service.stream_post_analysis(
+        caption=post_caption,
+        media_type=post_type,
+        niche=profile.get("niche", "lifestyle")
+    )
+    
+    return StreamingResponse(
+        _stream_analysis_events(analysis_stream, started_at, scope, on_result=save_feedback),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@router.get("/jobs/{job_id}")
+async def get_ai_job(job_id: str, current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Get the status and, once completed, the result of an AI job"""
+    try:
+        job = ai_job_service.get(job_id)
+        if not job or job.get("user_id") != str(current_user.id):
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to generate post feedback"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
             )
         
-        # Save feedback to database
-        from app.models import PostFeedbackInDB
-        # Comentário: Atualizado feedback.dict() para feedback.model_dump() para Pydantic v2.
-        feedback_data = PostFeedbackInDB(**feedback.model_dump())
-        # Comentário: Atualizado feedback_data.dict(by_alias=True) para feedback_data.model_dump(by_alias=True) para Pydantic v2.
-        result = db.posts_feedback.insert_one(feedback_data.model_dump(by_alias=True))
+        return ai_job_service.public_view(job)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting AI job {job_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+@router.get("/usage")
+async def get_ai_usage(current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Get today's AI token usage for the user's profile (admins also get global and per tier usage)"""
+    try:
+        db = get_database()
         
-        if result.inserted_id:
-            return {"message": "Post feedback generated successfully", "feedback_id": str(result.inserted_id)}
-        else:
+        profile = db.profiles.find_one({"user_id": ObjectId(current_user.id)}, {"subscription_status": 1})
+        if not profile:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save post feedback"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
             )
-            
+        
+        usage = ai_budget.usage(str(profile["_id"]), profile.get("subscription_status", "free"))
+        if current_user.role != UserRole.ADMIN:
+            usage.pop("global", None)
+            usage.pop("tiers", None)
+        
+        return usage
+        
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating post feedback: {e}")
+        logger.error(f"Error getting AI usage: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
         )
 
-
+@router.get("/cache/stats")
+async def get_ai_cache_stats(current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Get AI analysis cache and output parsing statistics (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return {"cache": ai_cache.stats(), "parsing": ai_output_parser.stats()}
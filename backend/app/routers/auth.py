@@ -1,15 +1,19 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPAuthorizationCredentials
 from datetime import timedelta
-from app.models import UserCreate, User, Token, LoginRequest, UserInDB
+from ugc_shared.models import AuthenticatedUser, UserCreate, User, Token, LoginRequest, UserInDB
 from app.auth import (
+    PasswordHasherBusy,
     authenticate_user, 
     create_access_token, 
     create_refresh_token,
-    get_password_hash,
+    get_current_active_user,
+    get_user_by_id,
+    hash_password,
     refresh_access_token,
+    revoke_user_tokens,
     security,
-    verify_token
+    token_claims
 )
 from app.database import get_database
 from app.config import settings
@@ -33,7 +37,7 @@ async def register(user: UserCreate):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hash_password(user.password)
         # Comentário: Atualizado user.dict(exclude={"password"}) para user.model_dump(exclude={"password"}) para Pydantic v2.
         user_data = UserInDB(
             **user.model_dump(exclude={"password"}),
@@ -41,7 +45,10 @@ async def register(user: UserCreate):
         )
         
         # Comentário: Atualizado user_data.dict(by_alias=True) para user_data.model_dump(by_alias=True) para Pydantic v2.
-        result = db.users.insert_one(user_data.model_dump(by_alias=True))
+        user_document = user_data.model_dump(by_alias=True)
+        # model_dump() turns ObjectIds into strings; users are looked up by ObjectId everywhere
+        user_document["_id"] = user_data.id
+        result = db.users.insert_one(user_document)
         
         if result.inserted_id:
             return {"message": "User created successfully", "user_id": str(result.inserted_id)}
@@ -53,6 +60,12 @@ async def register(user: UserCreate):
             
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-ins, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error registering user: {e}")
         raise HTTPException(
@@ -72,13 +85,14 @@ async def login(login_data: LoginRequest):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Create tokens
+        # Create tokens carrying the claims needed to authenticate later requests
+        claims = token_claims(user)
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = create_access_token(
-            data={"sub": user.email}, 
+            data=claims, 
             expires_delta=access_token_expires
         )
-        refresh_token = create_refresh_token(data={"sub": user.email})
+        refresh_token = create_refresh_token(data=claims)
         
         return Token(
             access_token=access_token,
@@ -87,6 +101,12 @@ async def login(login_data: LoginRequest):
         
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-ins, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error during login: {e}")
         raise HTTPException(
@@ -99,7 +119,7 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(secu
     """Refresh access token using refresh token"""
     try:
         refresh_token = credentials.credentials
-        new_access_token = refresh_access_token(refresh_token)
+        new_access_token = await refresh_access_token(refresh_token)
         
         if not new_access_token:
             raise HTTPException(
@@ -119,9 +139,35 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(secu
             detail="Internal server error"
         )
 
+@router.post("/logout", response_model=dict)
+async def logout(current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Revoke every access and refresh token issued to the current user"""
+    try:
+        if revoke_user_tokens(str(current_user.id)) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return {"message": "Logged out successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error logging out: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
 @router.get("/me", response_model=User)
-async def get_current_user_info(current_user: User = Depends(authenticate_user)):
+async def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Get current user information"""
-    return current_user
+    user = await get_user_by_id(str(current_user.id))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
 
 
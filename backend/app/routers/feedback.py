@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from typing import List, Optional
-from app.models import PostFeedback, PostFeedbackCreate, User
+from ugc_shared.models import PostFeedback, PostFeedbackCreate, AuthenticatedUser
 from app.auth import get_current_active_user
 from app.database import get_database
+from app.http_cache import cache_headers, compute_etag, latest_write, list_version, not_modified
+from ugc_shared.services.feedback_stats import feedback_stats_service
+from app.pagination import KEYSET_SORT, NEXT_CURSOR_HEADER, flag_deprecated_skip, keyset_query, next_cursor
+from app.serializers import trusted_json_response
 from bson import ObjectId
 import logging
 
@@ -11,11 +15,17 @@ router = APIRouter(prefix="/feedback", tags=["feedback"])
 
 @router.get("/", response_model=List[PostFeedback])
 async def get_my_feedback(
-    current_user: User = Depends(get_current_active_user),
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
     limit: int = 20,
-    skip: int = 0
+    skip: int = Query(0, ge=0, deprecated=True, description="Deprecated: use cursor"),
+    cursor: Optional[str] = None
 ):
-    """Get current user's post feedback"""
+    """Get current user's post feedback.
+
+    Pass the X-Next-Cursor header of a page as `cursor` to get the next one;
+    `skip` is deprecated: pages it serves carry a Deprecation header, and it is ignored when a cursor is given.
+    """
     try:
         db = get_database()
         
@@ -29,17 +39,28 @@ async def get_my_feedback(
         
         profile_id = profile["_id"]
         
+        # Feedback is only inserted, so the newest one and the list version identify the list
+        query = {"profile_id": profile_id}
+        last_modified = latest_write(db.posts_feedback, query, "created_at")
+        etag = compute_etag("feedback", profile_id, last_modified, list_version(profile, "feedback"), limit, skip, cursor)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+        headers = cache_headers(etag, last_modified)
+        flag_deprecated_skip(headers, "feedback", skip, cursor)
+        
         # Get feedback
-        feedback_cursor = db.posts_feedback.find(
-            {"profile_id": profile_id}
-        ).sort("created_at", -1).skip(skip).limit(limit)
+        feedback_cursor = db.posts_feedback.find(keyset_query(query, cursor)).sort(KEYSET_SORT).limit(limit)
+        if not cursor:
+            feedback_cursor = feedback_cursor.skip(skip)
+        documents = list(feedback_cursor)
         
-        feedback_list = []
-        for feedback_data in feedback_cursor:
-            # Comentário: A instanciação de PostFeedback a partir de feedback_data funciona com Pydantic v2.
-            feedback_list.append(PostFeedback(**feedback_data))
+        page_cursor = next_cursor(documents, limit)
+        if page_cursor:
+            headers[NEXT_CURSOR_HEADER] = page_cursor
         
-        return feedback_list
+        # Documentos validados na escrita: serializados sem instanciar PostFeedback
+        return trusted_json_response(PostFeedback, documents, headers)
         
     except HTTPException:
         raise
@@ -53,7 +74,7 @@ async def get_my_feedback(
 @router.get("/{post_id}", response_model=PostFeedback)
 async def get_post_feedback(
     post_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Get feedback for a specific post"""
     try:
@@ -81,8 +102,7 @@ async def get_post_feedback(
                 detail="Feedback not found for this post"
             )
         
-        # Comentário: A instanciação de PostFeedback a partir de feedback_data funciona com Pydantic v2.
-        return PostFeedback(**feedback_data)
+        return trusted_json_response(PostFeedback, feedback_data)
         
     except HTTPException:
         raise
@@ -95,7 +115,9 @@ async def get_post_feedback(
 
 @router.get("/stats/summary", response_model=dict)
 async def get_feedback_summary(
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Get summary statistics of user's post feedback"""
     try:
@@ -111,48 +133,17 @@ async def get_feedback_summary(
         
         profile_id = profile["_id"]
         
-        # Aggregate feedback statistics
-        pipeline = [
-            {"$match": {"profile_id": profile_id}},
-            {"$group": {
-                "_id": None,
-                "total_posts": {"$sum": 1},
-                "avg_overall_score": {"$avg": "$scores.overall"},
-                "avg_content_quality": {"$avg": "$scores.content_quality"},
-                "avg_engagement_potential": {"$avg": "$scores.engagement_potential"},
-                "avg_visual_appeal": {"$avg": "$scores.visual_appeal"},
-                "best_post": {"$max": "$scores.overall"},
-                "worst_post": {"$min": "$scores.overall"}
-            }}
-        ]
-        
-        result = list(db.posts_feedback.aggregate(pipeline))
-        
-        if result:
-            stats = result[0]
-            return {
-                "total_posts_analyzed": stats.get("total_posts", 0),
-                "average_scores": {
-                    "overall": round(stats.get("avg_overall_score", 0.0), 2),
-                    "content_quality": round(stats.get("avg_content_quality", 0.0), 2),
-                    "engagement_potential": round(stats.get("avg_engagement_potential", 0.0), 2),
-                    "visual_appeal": round(stats.get("avg_visual_appeal", 0.0), 2)
-                },
-                "best_post_score": round(stats.get("best_post", 0.0), 2),
-                "worst_post_score": round(stats.get("worst_post", 0.0), 2)
-            }
-        else:
-            return {
-                "total_posts_analyzed": 0,
-                "average_scores": {
-                    "overall": 0.0,
-                    "content_quality": 0.0,
-                    "engagement_potential": 0.0,
-                    "visual_appeal": 0.0
-                },
-                "best_post_score": 0.0,
-                "worst_post_score": 0.0
-            }
+        # Running aggregates maintained on every feedback insert
+        stats = feedback_stats_service.get(profile_id)
+        
+        last_modified = stats.get("updated_at")
+        etag = compute_etag("feedback_summary", profile_id, stats.get("count", 0), last_modified)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+        response.headers.update(cache_headers(etag, last_modified))
+        
+        return feedback_stats_service.summary(stats)
         
     except HTTPException:
         raise
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import Optional
-from app.models import User
+from ugc_shared.models import AuthenticatedUser
 from app.auth import get_current_active_user
 from app.database import get_database
-from app.services.instagram_service import instagram_service
+from ugc_shared.services.instagram_service import instagram_service
+from app.services.task_queue import enqueue_task
 from bson import ObjectId
 from datetime import datetime, timedelta
 import logging
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/instagram", tags=["instagram"])
 
 @router.get("/auth-url")
 async def get_instagram_auth_url(
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
     state: Optional[str] = None
 ):
     """Get Instagram authorization URL"""
@@ -41,7 +42,7 @@ async def get_instagram_auth_url(
 async def instagram_callback(
     code: str,
     state: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Handle Instagram OAuth callback"""
     try:
@@ -107,7 +108,7 @@ async def instagram_callback(
         )
 
 @router.post("/disconnect")
-async def disconnect_instagram(current_user: User = Depends(get_current_active_user)):
+async def disconnect_instagram(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Disconnect Instagram account"""
     try:
         db = get_database()
@@ -136,7 +137,7 @@ async def disconnect_instagram(current_user: User = Depends(get_current_active_u
         )
 
 @router.get("/status")
-async def get_instagram_status(current_user: User = Depends(get_current_active_user)):
+async def get_instagram_status(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Get Instagram connection status"""
     try:
         db = get_database()
@@ -185,7 +186,7 @@ async def get_instagram_status(current_user: User = Depends(get_current_active_u
         )
 
 @router.post("/collect-metrics")
-async def collect_instagram_metrics(current_user: User = Depends(get_current_active_user)):
+async def collect_instagram_metrics(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Manually trigger Instagram metrics collection"""
     try:
         db = get_database()
@@ -205,6 +206,7 @@ async def collect_instagram_metrics(current_user: User = Depends(get_current_act
         success = await instagram_service.collect_user_metrics(profile_id)
         
         if success:
+            enqueue_task("app.tasks.ai_tasks.compute_audience_insights", args=[profile_id])
             return {"message": "Metrics collected successfully"}
         else:
             raise HTTPException(
@@ -223,7 +225,7 @@ async def collect_instagram_metrics(current_user: User = Depends(get_current_act
 
 @router.get("/recent-posts")
 async def get_recent_instagram_posts(
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
     limit: int = Query(default=10, ge=1, le=25)
 ):
     """Get recent Instagram posts"""
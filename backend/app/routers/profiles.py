@@ -1,13 +1,18 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Optional
-from app.models import (
+from ugc_shared.models import (
     Profile, ProfileCreate, ProfileUpdate, ProfileInDB, 
-    User, DashboardStats, DashboardCharts, ChartDataPoint
+    AuthenticatedUser, DashboardStats, DashboardCharts, DashboardData, DashboardRange, ChartDataPoint
 )
-from app.auth import get_current_active_user
+from app.auth import ACCESS_TOKEN_HEADER, get_current_active_user, reissue_access_token
+from app.config import settings
 from app.database import get_database
+from app.http_cache import cache_headers, compute_etag, latest_write, not_modified
+from app.serializers import DASHBOARD_ADAPTER, json_response, trusted_json_response
+from ugc_shared.services.analytics import growth_rate, lttb_indices
 from bson import ObjectId
 from datetime import datetime, timedelta
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +21,7 @@ router = APIRouter(prefix="/profiles", tags=["profiles"])
 @router.post("/", response_model=Profile)
 async def create_profile(
     profile: ProfileCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Create a new profile for the current user"""
     try:
@@ -40,12 +45,21 @@ async def create_profile(
         )
         
         # Comentário: Atualizado profile_data.dict(by_alias=True) para profile_data.model_dump(by_alias=True) para Pydantic v2.
-        result = db.profiles.insert_one(profile_data.model_dump(by_alias=True))
+        profile_document = profile_data.model_dump(by_alias=True)
+        # model_dump() turns ObjectIds into strings; profiles are looked up by ObjectId everywhere (token pid included)
+        profile_document["_id"] = profile_data.id
+        profile_document["user_id"] = profile_data.user_id
+        result = db.profiles.insert_one(profile_document)
         
         if result.inserted_id:
             created_profile = db.profiles.find_one({"_id": result.inserted_id})
-            # Comentário: A instanciação de Profile a partir de created_profile funciona com Pydantic v2.
-            return Profile(**created_profile)
+            
+            # The caller's token was issued without a profile id (pid); hand back one that carries it
+            headers = {}
+            access_token = await reissue_access_token(current_user.email)
+            if access_token:
+                headers[ACCESS_TOKEN_HEADER] = access_token
+            return trusted_json_response(Profile, created_profile, headers)
         else:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -62,7 +76,7 @@ async def create_profile(
         )
 
 @router.get("/me", response_model=Profile)
-async def get_my_profile(current_user: User = Depends(get_current_active_user)):
+async def get_my_profile(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Get current user's profile"""
     try:
         db = get_database()
@@ -75,8 +89,7 @@ async def get_my_profile(current_user: User = Depends(get_current_active_user)):
                 detail="Profile not found"
             )
         
-        # Comentário: A instanciação de Profile a partir de profile_data funciona com Pydantic v2.
-        return Profile(**profile_data)
+        return trusted_json_response(Profile, profile_data)
         
     except HTTPException:
         raise
@@ -90,7 +103,7 @@ async def get_my_profile(current_user: User = Depends(get_current_active_user)):
 @router.put("/me", response_model=Profile)
 async def update_my_profile(
     profile_update: ProfileUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Update current user's profile"""
     try:
@@ -119,12 +132,10 @@ async def update_my_profile(
         if result.modified_count:
             # Comentário: current_user.id já é um ObjectId após a refatoração de PyObjectId.
             updated_profile = db.profiles.find_one({"user_id": current_user.id})
-            # Comentário: A instanciação de Profile a partir de updated_profile funciona com Pydantic v2.
-            return Profile(**updated_profile)
+            return trusted_json_response(Profile, updated_profile)
         else:
             # Return existing profile if no changes were made
-            # Comentário: A instanciação de Profile a partir de existing_profile funciona com Pydantic v2.
-            return Profile(**existing_profile)
+            return trusted_json_response(Profile, existing_profile)
             
     except HTTPException:
         raise
@@ -135,15 +146,64 @@ async def update_my_profile(
             detail="Internal server error"
         )
 
-@router.get("/me/dashboard", response_model=dict)
-async def get_dashboard_data(current_user: User = Depends(get_current_active_user)):
+# Chart resolution used by default for each supported range
+DASHBOARD_RANGES = {7: "hour", 30: "day", 90: "day", 365: "week"}
+# Date label precision of each resolution
+CHART_LABEL_UNITS = {"hour": "m", "day": "D", "week": "D"}
+
+def _chart_pipeline(profile_id: ObjectId, since: datetime, resolution: str) -> List[dict]:
+    """Aggregation bucketing a profile's metrics since `since` by `resolution`, oldest first"""
+    bucket = {"date": "$date", "unit": resolution}
+    if resolution == "week":
+        bucket["startOfWeek"] = "monday"
+    return [
+        {"$match": {"profile_id": profile_id, "date": {"$gte": since}}},
+        {"$sort": {"date": 1}},
+        {"$group": {
+            "_id": {"$dateTrunc": bucket},
+            "followers_count": {"$last": "$followers_count"},
+            "avg_engagement_rate": {"$avg": "$avg_engagement_rate"},
+            "total_reach": {"$last": "$total_reach"}
+        }},
+        {"$sort": {"_id": 1}}
+    ]
+
+def _chart_series(buckets: List[dict], field: str, resolution: str) -> List[ChartDataPoint]:
+    """Chart points of one field, downsampled to the configured maximum"""
+    if not buckets:
+        return []
+    dates = np.array([bucket["_id"] for bucket in buckets], dtype="datetime64[s]")
+    values = np.array([bucket.get(field) or 0 for bucket in buckets], dtype=float)
+    keep = lttb_indices(dates.astype(np.int64).astype(float), values, settings.dashboard_chart_max_points)
+    labels = np.datetime_as_string(dates[keep], unit=CHART_LABEL_UNITS[resolution]).tolist()
+    return [ChartDataPoint(date=date, value=value) for date, value in zip(labels, values[keep].tolist())]
+
+@router.get("/me/dashboard", response_model=DashboardData)
+async def get_dashboard_data(
+    request: Request,
+    days: int = Query(30, description="Range in days: 7, 30, 90 or 365"),
+    resolution: Optional[str] = Query(None, description="Chart resolution: hour, day or week"),
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
+):
     """Get dashboard data for current user"""
     try:
+        if days not in DASHBOARD_RANGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"days must be one of {', '.join(map(str, DASHBOARD_RANGES))}"
+            )
+        resolution = resolution or DASHBOARD_RANGES[days]
+        if resolution not in CHART_LABEL_UNITS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"resolution must be one of {', '.join(CHART_LABEL_UNITS)}"
+            )
+        
         db = get_database()
         
         # Get user's profile
         # Comentário: current_user.id já é um ObjectId após a refatoração de PyObjectId.
-        profile = db.profiles.find_one({"user_id": current_user.id})
+        profile = db.profiles.find_one({"user_id": current_user.id}, {"_id": 1})
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -151,22 +211,29 @@ async def get_dashboard_data(current_user: User = Depends(get_current_active_use
             )
         
         profile_id = profile["_id"]
+        since = datetime.utcnow() - timedelta(days=days)
         
-        # Get latest metrics
-        latest_metrics = db.metrics.find_one(
-            {"profile_id": profile_id},
-            sort=[("date", -1)]
-        )
+        # The data changes with each new metrics record; the range start moves with the clock,
+        # so the current hour is part of the ETag too
+        last_modified = latest_write(db.metrics, {"profile_id": profile_id}, "date")
+        etag = compute_etag("dashboard", profile_id, last_modified, since.strftime("%Y%m%d%H"), days, resolution)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+        headers = cache_headers(etag, last_modified)
         
-        # Get metrics from 30 days ago for growth calculation
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        # Latest record, and the last record before the range as the growth baseline
+        projection = {"_id": 0, "post_metrics": 0}
+        latest_metrics = db.metrics.find_one({"profile_id": profile_id}, projection, sort=[("date", -1)])
         old_metrics = db.metrics.find_one(
-            {"profile_id": profile_id, "date": {"$lte": thirty_days_ago}},
+            {"profile_id": profile_id, "date": {"$lte": since}},
+            projection,
             sort=[("date", -1)]
         )
         
         # Calculate stats
         if latest_metrics:
+            old_metrics = old_metrics or {}
             stats = DashboardStats(
                 followers_count=latest_metrics.get("followers_count", 0),
                 following_count=latest_metrics.get("following_count", 0),
@@ -174,19 +241,16 @@ async def get_dashboard_data(current_user: User = Depends(get_current_active_use
                 avg_engagement_rate=latest_metrics.get("avg_engagement_rate", 0.0),
                 total_likes=latest_metrics.get("total_likes", 0),
                 total_comments=latest_metrics.get("total_comments", 0),
-                followers_growth=0.0,
-                engagement_growth=0.0
+                # Growth percentages over the range
+                followers_growth=growth_rate(
+                    latest_metrics.get("followers_count", 0),
+                    old_metrics.get("followers_count", 0)
+                ),
+                engagement_growth=growth_rate(
+                    latest_metrics.get("avg_engagement_rate", 0),
+                    old_metrics.get("avg_engagement_rate", 0)
+                )
             )
-            
-            # Calculate growth percentages
-            if old_metrics:
-                old_followers = old_metrics.get("followers_count", 0)
-                if old_followers > 0:
-                    stats.followers_growth = ((stats.followers_count - old_followers) / old_followers) * 100
-                
-                old_engagement = old_metrics.get("avg_engagement_rate", 0)
-                if old_engagement > 0:
-                    stats.engagement_growth = ((stats.avg_engagement_rate - old_engagement) / old_engagement) * 100
         else:
             stats = DashboardStats(
                 followers_count=0,
@@ -199,43 +263,21 @@ async def get_dashboard_data(current_user: User = Depends(get_current_active_use
                 engagement_growth=0.0
             )
         
-        # Get chart data (last 30 days)
-        chart_data = list(db.metrics.find(
-            {"profile_id": profile_id, "date": {"$gte": thirty_days_ago}},
-            sort=[("date", 1)]
-        ))
-        
-        followers_evolution = []
-        engagement_evolution = []
-        reach_evolution = []
-        
-        for data in chart_data:
-            date_str = data["date"].strftime("%Y-%m-%d")
-            followers_evolution.append(ChartDataPoint(
-                date=date_str,
-                value=data.get("followers_count", 0)
-            ))
-            engagement_evolution.append(ChartDataPoint(
-                date=date_str,
-                value=data.get("avg_engagement_rate", 0.0)
-            ))
-            reach_evolution.append(ChartDataPoint(
-                date=date_str,
-                value=data.get("total_reach", 0)
-            ))
+        # Chart data, bucketed by the database
+        buckets = list(db.metrics.aggregate(_chart_pipeline(profile_id, since, resolution)))
         
         charts = DashboardCharts(
-            followers_evolution=followers_evolution,
-            engagement_evolution=engagement_evolution,
-            reach_evolution=reach_evolution
+            followers_evolution=_chart_series(buckets, "followers_count", resolution),
+            engagement_evolution=_chart_series(buckets, "avg_engagement_rate", resolution),
+            reach_evolution=_chart_series(buckets, "total_reach", resolution)
         )
         
-        # Comentário: Atualizado stats.dict() para stats.model_dump() para Pydantic v2.
-        # Comentário: Atualizado charts.dict() para charts.model_dump() para Pydantic v2.
-        return {
-            "stats": stats.model_dump(),
-            "charts": charts.model_dump()
-        }
+        dashboard = DashboardData(
+            stats=stats,
+            charts=charts,
+            range=DashboardRange(days=days, resolution=resolution)
+        )
+        return json_response(DASHBOARD_ADAPTER, dashboard, headers)
         
     except HTTPException:
         raise
@@ -1,23 +1,41 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse
 from typing import List, Optional
-from app.models import Report, ReportCreate, User
+from urllib.parse import quote
+from ugc_shared.models import Report, ReportCreate, AuthenticatedUser, UserRole
 from app.auth import get_current_active_user
+from app.config import settings
 from app.database import get_database
+from ugc_shared.list_versions import bump_list_version
+from app.http_cache import cache_headers, compute_etag, latest_write, list_version, not_modified
+from app.pagination import KEYSET_SORT, NEXT_CURSOR_HEADER, flag_deprecated_skip, keyset_query, next_cursor
+from app.redis_client import get_redis
+from app.serializers import trusted_json_response
+from ugc_shared.services.report_storage import report_file_key, report_storage
 from bson import ObjectId
 import logging
 import os
+import redis
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+# Counters kept by the worker's ReportReuseService
+REPORT_REUSE_STATS_KEY = "reports:reuse:stats"
+
 @router.get("/", response_model=List[Report])
 async def get_my_reports(
-    current_user: User = Depends(get_current_active_user),
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
     limit: int = 10,
-    skip: int = 0
+    skip: int = Query(0, ge=0, deprecated=True, description="Deprecated: use cursor"),
+    cursor: Optional[str] = None
 ):
-    """Get current user's reports"""
+    """Get current user's reports.
+
+    Pass the X-Next-Cursor header of a page as `cursor` to get the next one;
+    `skip` is deprecated: pages it serves carry a Deprecation header, and it is ignored when a cursor is given.
+    """
     try:
         db = get_database()
         
@@ -32,17 +50,28 @@ async def get_my_reports(
         
         profile_id = profile["_id"]
         
+        # Reports are only inserted or deleted, so the newest one and the list version identify the list
+        query = {"profile_id": profile_id}
+        last_modified = latest_write(db.reports, query, "created_at")
+        etag = compute_etag("reports", profile_id, last_modified, list_version(profile, "reports"), limit, skip, cursor)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+        headers = cache_headers(etag, last_modified)
+        flag_deprecated_skip(headers, "reports", skip, cursor)
+        
         # Get reports
-        reports_cursor = db.reports.find(
-            {"profile_id": profile_id}
-        ).sort("created_at", -1).skip(skip).limit(limit)
+        reports_cursor = db.reports.find(keyset_query(query, cursor)).sort(KEYSET_SORT).limit(limit)
+        if not cursor:
+            reports_cursor = reports_cursor.skip(skip)
+        documents = list(reports_cursor)
         
-        reports = []
-        for report_data in reports_cursor:
-            # Comentário: A instanciação de Report a partir de report_data funciona com Pydantic v2.
-            reports.append(Report(**report_data))
+        page_cursor = next_cursor(documents, limit)
+        if page_cursor:
+            headers[NEXT_CURSOR_HEADER] = page_cursor
         
-        return reports
+        # Documentos validados na escrita: serializados sem instanciar Report
+        return trusted_json_response(Report, documents, headers)
         
     except HTTPException:
         raise
@@ -56,7 +85,7 @@ async def get_my_reports(
 @router.get("/{report_id}", response_model=Report)
 async def get_report(
     report_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Get a specific report"""
     try:
@@ -85,8 +114,7 @@ async def get_report(
                 detail="Report not found"
             )
         
-        # Comentário: A instanciação de Report a partir de report_data funciona com Pydantic v2.
-        return Report(**report_data)
+        return trusted_json_response(Report, report_data)
         
     except HTTPException:
         raise
@@ -97,31 +125,78 @@ async def get_report(
             detail="Internal server error"
         )
 
+def _download_response(report_id: str, file_key: str) -> Response:
+    """Response sending a report PDF.
+
+    The API only authorizes: object storage downloads are redirected to a
+    short-lived pre-signed URL, and behind nginx the X-Accel-Redirect
+    header makes nginx send local files itself, with range requests and
+    sendfile. Otherwise the local file is streamed from this process.
+    """
+    filename = f"report_{report_id}.pdf"
+    
+    url = report_storage.url(file_key, filename, settings.reports_download_url_expires_seconds)
+    if url:
+        # The URL expires, so the redirect itself must not be cached
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers={"Cache-Control": "no-store"})
+    
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": f"private, max-age={settings.reports_download_max_age}"
+    }
+    
+    try:
+        file_path = report_storage.path(file_key)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file not found"
+        )
+    
+    if settings.reports_accel_redirect_prefix:
+        relative_path = os.path.relpath(file_path, report_storage.root)
+        headers["X-Accel-Redirect"] = settings.reports_accel_redirect_prefix.rstrip("/") + "/" + quote(relative_path)
+        return Response(media_type="application/pdf", headers=headers)
+    
+    if not os.path.exists(file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file not found"
+        )
+    
+    return FileResponse(
+        path=file_path,
+        filename=filename,
+        media_type="application/pdf",
+        headers={"Cache-Control": headers["Cache-Control"]}
+    )
+
 @router.get("/{report_id}/download")
 async def download_report(
     report_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Download a report PDF"""
     try:
         db = get_database()
         
-        # Get user's profile
-        # Comentário: current_user.id já é um ObjectId após a refatoração de PyObjectId.
-        profile = db.profiles.find_one({"user_id": current_user.id})
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Profile not found"
-            )
-        
-        profile_id = profile["_id"]
+        # The profile id comes from the token; tokens issued before the profile existed fall back to a lookup
+        profile_id = current_user.profile_id
+        if profile_id is None:
+            # Comentário: current_user.id já é um ObjectId após a refatoração de PyObjectId.
+            profile = db.profiles.find_one({"user_id": current_user.id}, {"_id": 1})
+            if not profile:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Profile not found"
+                )
+            profile_id = profile["_id"]
         
         # Get report
-        report_data = db.reports.find_one({
-            "_id": ObjectId(report_id),
-            "profile_id": profile_id
-        })
+        report_data = db.reports.find_one(
+            {"_id": ObjectId(report_id), "profile_id": profile_id},
+            {"is_ready": 1, "file_key": 1, "file_path": 1}
+        )
         
         if not report_data:
             raise HTTPException(
@@ -129,25 +204,14 @@ async def download_report(
                 detail="Report not found"
             )
         
-        if not report_data.get("is_ready") or not report_data.get("file_path"):
+        file_key = report_file_key(report_data)
+        if not report_data.get("is_ready") or not file_key:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Report is not ready for download"
             )
         
-        file_path = report_data["file_path"]
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Report file not found"
-            )
-        
-        return FileResponse(
-            path=file_path,
-            filename=f"report_{report_id}.pdf",
-            media_type="application/pdf"
-        )
+        return _download_response(report_id, file_key)
         
     except HTTPException:
         raise
@@ -161,7 +225,7 @@ async def download_report(
 @router.post("/generate", response_model=dict)
 async def generate_report(
     report_data: ReportCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Request generation of a new report"""
     try:
@@ -179,7 +243,7 @@ async def generate_report(
         profile_id = profile["_id"]
         
         # Create report record
-        from app.models import ReportInDB
+        from ugc_shared.models import ReportInDB
         # Comentário: Atualizado report_data.dict() para report_data.model_dump() para Pydantic v2.
         report = ReportInDB(
             **report_data.model_dump(),
@@ -188,6 +252,7 @@ async def generate_report(
         
         # Comentário: Atualizado report.dict(by_alias=True) para report.model_dump(by_alias=True) para Pydantic v2.
         result = db.reports.insert_one(report.model_dump(by_alias=True))
+        bump_list_version([profile_id], "reports")
         
         if result.inserted_id:
             # TODO: Send task to worker to generate the report
@@ -211,4 +276,26 @@ async def generate_report(
             detail="Internal server error"
         )
 
-
+@router.get("/reuse/stats")
+async def get_report_reuse_stats(current_user: AuthenticatedUser = Depends(get_current_active_user)):
+    """Get how often report requests reused a stored report (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    try:
+        counters = get_redis().hgetall(REPORT_REUSE_STATS_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Report reuse stats unavailable: {e}")
+        return {}
+    
+    hits = int(counters.get("hits", 0))
+    misses = int(counters.get("misses", 0))
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+    }
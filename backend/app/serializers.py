@@ -0,0 +1,115 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+from ugc_shared.models import DashboardData
+
+# Response serializers are compiled once at import time
+DASHBOARD_ADAPTER = TypeAdapter(DashboardData)
+
+# Missing required fields are left out, as model_construct would
+_REQUIRED = object()
+
+DocumentPlan = Tuple[Tuple[str, str, Any, Optional[Tuple[bool, Type[BaseModel]]]], ...]
+
+def _model_in(annotation: Any) -> Optional[Tuple[bool, Type[BaseModel]]]:
+    """(is_list, model) if `annotation` is a model, an optional model or a list of models"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return False, annotation
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        models = [arg for arg in args if isinstance(arg, type) and issubclass(arg, BaseModel)]
+        return (False, models[0]) if len(models) == 1 else None
+    if origin in (list, List) and args:
+        nested = _model_in(args[0])
+        return (True, nested[1]) if nested and not nested[0] else None
+    return None
+
+def _json_default_of(field: FieldInfo) -> Any:
+    if field.is_required():
+        return _REQUIRED
+    if field.default_factory is not None:
+        # Fields with factories (ids, timestamps) are always present in stored documents
+        return field.default_factory
+    if isinstance(field.default, BaseModel):
+        return field.default.model_dump(mode="json", by_alias=True)
+    return field.default
+
+@lru_cache(maxsize=None)
+def _document_plan(model: Type[BaseModel]) -> DocumentPlan:
+    """(output key, field name, default, nested model) for each field of `model`"""
+    return tuple(
+        (field.alias or name, name, _json_default_of(field), _model_in(field.annotation))
+        for name, field in model.model_fields.items()
+    )
+
+def _trusted_document(model: Type[BaseModel], document: Dict[str, Any]) -> Dict[str, Any]:
+    """`document` reduced to the fields of `model`, with their defaults filled in"""
+    output = {}
+    for key, name, default, nested in _document_plan(model):
+        if key in document:
+            value = document[key]
+        elif name in document:
+            value = document[name]
+        elif default is _REQUIRED:
+            continue
+        else:
+            value = default() if callable(default) else default
+        if nested is not None:
+            is_list, nested_model = nested
+            if is_list and isinstance(value, list):
+                value = [_trusted_document(nested_model, item) if isinstance(item, dict) else item for item in value]
+            elif isinstance(value, dict):
+                value = _trusted_document(nested_model, value)
+        output[key] = value
+    return output
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def trusted_json_response(
+    model: Type[BaseModel],
+    documents: Union[Dict[str, Any], List[Dict[str, Any]]],
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200
+) -> Response:
+    """Serialize our own MongoDB documents as `model` without re-validating them.
+
+    Documents in these collections were validated when they were written, so
+    reads only keep the model's fields (dropping internal ones such as
+    tokens), fill in defaults and hand the documents to orjson. The JSON is
+    the one `model` would produce, without building a model per document.
+    """
+    if isinstance(documents, list):
+        content = [_trusted_document(model, document) for document in documents]
+    else:
+        content = _trusted_document(model, documents)
+    return Response(
+        content=orjson.dumps(content, default=_json_default),
+        media_type="application/json",
+        headers=headers,
+        status_code=status_code
+    )
+
+def json_response(
+    adapter: TypeAdapter,
+    value: Any,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200
+) -> Response:
+    """Serialize `value` straight to JSON bytes in pydantic-core.
+
+    Same output as the endpoint's response_model (aliases included), but
+    skips FastAPI's re-validation and jsonable_encoder pass.
+    """
+    return Response(
+        content=adapter.dump_json(value, by_alias=True),
+        media_type="application/json",
+        headers=headers,
+        status_code=status_code
+    )
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+import redis
+from app.config import settings
+from app.redis_client import get_redis
+from app.services.task_queue import celery_client
+
+logger = logging.getLogger(__name__)
+
+class AIJobService:
+    """AI work run by the worker, tracked as jobs in Redis.
+
+    A job record lives at `ai_job:<job_id>` and is updated by the worker as
+    the job runs (queued -> running -> completed | failed). Identical
+    requests from the same user share a job: the request hash maps to the
+    job id, so a repeat while the job runs joins it (single-flight) and a
+    repeat after it completed gets its result. Failed jobs drop the mapping
+    so the request can be retried.
+    """
+
+    JOB_KEY_PREFIX = "ai_job:"
+    REQUEST_KEY_PREFIX = "ai_job:request:"
+
+    @staticmethod
+    def request_hash(kind: str, user_id: str, payload: Dict[str, Any]) -> str:
+        """Hash identifying identical requests"""
+        data = json.dumps(
+            {"kind": kind, "user_id": user_id, "payload": payload},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def submit(
+        self,
+        kind: str,
+        task_name: str,
+        user_id: str,
+        payload: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Enqueue a job, or return the job already handling an identical request.
+
+        The worker task is called with (job_id, request_key, **payload).
+        Returns the job record, or None if the job could not be enqueued.
+        """
+        client = get_redis()
+        request_key = f"{self.REQUEST_KEY_PREFIX}{self.request_hash(kind, user_id, payload)}"
+        job_id = str(uuid.uuid4())
+
+        now = datetime.utcnow().isoformat()
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "user_id": user_id,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+
+        try:
+            # The record is written before the mapping, so a mapping always points at a readable job
+            client.set(f"{self.JOB_KEY_PREFIX}{job_id}", json.dumps(job), ex=settings.ai_job_ttl_seconds)
+
+            if not client.set(request_key, job_id, nx=True, ex=settings.ai_job_ttl_seconds):
+                client.delete(f"{self.JOB_KEY_PREFIX}{job_id}")
+                existing_id = client.get(request_key)
+                existing = self.get(existing_id) if existing_id else None
+                if existing:
+                    return existing
+                # The other job expired in the meantime: take the request over
+                client.set(f"{self.JOB_KEY_PREFIX}{job_id}", json.dumps(job), ex=settings.ai_job_ttl_seconds)
+                client.set(request_key, job_id, ex=settings.ai_job_ttl_seconds)
+
+        except redis.RedisError as e:
+            logger.error(f"Error creating AI job {kind}: {e}")
+            return None
+
+        try:
+            celery_client.send_task(task_name, args=[job_id, request_key], kwargs=payload, task_id=job_id)
+            return job
+
+        except Exception as e:
+            logger.error(f"Error enqueueing AI job {kind}: {e}")
+            try:
+                client.delete(request_key, f"{self.JOB_KEY_PREFIX}{job_id}")
+            except redis.RedisError:
+                pass
+            return None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record"""
+        value = get_redis().get(f"{self.JOB_KEY_PREFIX}{job_id}")
+        return json.loads(value) if value else None
+
+    @staticmethod
+    def public_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job fields returned to clients"""
+        return {key: value for key, value in job.items() if key != "user_id"}
+
+# Global instance
+ai_job_service = AIJobService()
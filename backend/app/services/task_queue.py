@@ -0,0 +1,52 @@
+from celery import Celery
+from typing import Any, Dict, List, Optional
+import redis
+from app.config import settings
+from app.redis_client import get_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Producer-only Celery app: tasks are sent by name and executed by the worker service
+celery_client = Celery(
+    "ugc_saas_backend",
+    broker=settings.redis_url,
+    backend=settings.redis_url
+)
+
+def enqueue_task(
+    task_name: str,
+    args: Optional[List[Any]] = None,
+    kwargs: Optional[Dict[str, Any]] = None,
+    lock_key: Optional[str] = None,
+    lock_ttl: int = 600
+) -> Optional[str]:
+    """Send a task to the worker and return its id.
+
+    When `lock_key` is given the task is only sent if no other request holds
+    the lock, so concurrent requests trigger a single refresh. Returns None if
+    the task was not sent.
+    """
+    try:
+        if lock_key and not get_redis().set(lock_key, "1", nx=True, ex=lock_ttl):
+            return None
+
+        result = celery_client.send_task(task_name, args=args or [], kwargs=kwargs or {})
+        return result.id
+
+    except redis.RedisError as e:
+        logger.error(f"Error acquiring lock {lock_key} for task {task_name}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error enqueueing task {task_name}: {e}")
+        release_lock(lock_key)
+        return None
+
+def release_lock(lock_key: Optional[str]):
+    """Release a lock taken by enqueue_task"""
+    if not lock_key:
+        return
+    try:
+        get_redis().delete(lock_key)
+    except redis.RedisError as e:
+        logger.warning(f"Error releasing lock {lock_key}: {e}")
@@ -0,0 +1,47 @@
+import fakeredis
+import httpx
+import mongomock
+import pytest
+
+from app.config import settings
+from app.database import mongodb
+from app.redis_client import redis_client
+from ugc_shared.services.ai_client import TokenBucket, ai_client
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory MongoDB behind get_database()"""
+    database = mongomock.MongoClient().ugc_saas
+    monkeypatch.setattr(mongodb, "database", database)
+    return database
+
+@pytest.fixture
+def redis(monkeypatch):
+    """In-memory Redis behind get_redis()"""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_client, "client", client)
+    return client
+
+@pytest.fixture
+def ai_settings(monkeypatch, redis):
+    """AI settings for tests: no cache, no budget enforcement and no rate limiting"""
+    monkeypatch.setattr(settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(settings, "openai_max_retries", 0)
+    monkeypatch.setattr(settings, "ai_structured_output", "function")
+    monkeypatch.setattr(settings, "ai_cache_enabled", False)
+    monkeypatch.setattr(settings, "ai_budget_enabled", False)
+    monkeypatch.setattr(ai_client, "request_bucket", TokenBucket(10 ** 9))
+    monkeypatch.setattr(ai_client, "token_bucket", TokenBucket(10 ** 9))
+
+@pytest.fixture
+def openai_server(monkeypatch, ai_settings):
+    """Route the AI client's HTTP pool to a MockTransport handler: openai_server(handler)"""
+    async_client = httpx.AsyncClient
+
+    def serve(handler):
+        class MockTransportClient(async_client):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+        monkeypatch.setattr(httpx, "AsyncClient", MockTransportClient)
+    return serve
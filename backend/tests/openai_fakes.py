@@ -0,0 +1,65 @@
+"""Fake OpenAI responses for httpx.MockTransport handlers"""
+import asyncio
+import json
+
+import httpx
+
+from ugc_shared.services.ai_client import ai_client
+
+def chat_completion(content=None, tool_calls=None):
+    """Chat completion with a text answer or tool calls"""
+    return httpx.Response(200, json={
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-3.5-turbo",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content, "tool_calls": tool_calls},
+            "finish_reason": "tool_calls" if tool_calls else "stop"
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20}
+    })
+
+def tool_call_response(name, arguments):
+    """Chat completion answering with a call to the function `name`"""
+    return chat_completion(tool_calls=[{
+        "id": "call_test",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)}
+    }])
+
+def error_response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, json={"error": {"message": "fake error", "type": "test"}})
+
+def sse_response(deltas, delays=None):
+    """Streamed chat completion sending each delta as its own SSE chunk.
+
+    `delays` maps a delta index to the seconds to wait before sending it.
+    """
+    delays = delays or {}
+
+    async def chunks():
+        for index, delta in enumerate(deltas):
+            if index in delays:
+                await asyncio.sleep(delays[index])
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-3.5-turbo",
+                "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+        yield b"data: [DONE]\n\n"
+
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=chunks())
+
+def run(make_coro):
+    """Run a coroutine in a fresh event loop, closing the AI client pool it opened"""
+    async def main():
+        try:
+            return await make_coro()
+        finally:
+            await ai_client.aclose()
+    return asyncio.run(main())
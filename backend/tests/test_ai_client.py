@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+from openai import BadRequestError, RateLimitError
+
+from app.config import settings
+from openai_fakes import chat_completion, error_response, run, sse_response
+from ugc_shared.services import ai_client as ai_client_module
+from ugc_shared.services.ai_client import AsyncAIClient, TokenBucket, ai_client
+
+MESSAGES = [{"role": "user", "content": "Olá"}]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def backoff_delays(monkeypatch):
+    """Record the backoff delays the client computes, without sleeping them"""
+    delays = []
+    compute_delay = AsyncAIClient._backoff_delay
+
+    def record(attempt, error):
+        delays.append(compute_delay(attempt, error))
+        return 0
+    monkeypatch.setattr(AsyncAIClient, "_backoff_delay", staticmethod(record))
+    return delays
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_client_module, "time", clock)
+    bucket = TokenBucket(60)  # One unit per second
+
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+    clock.now += 31  # Pays back the unit owed and refills 30
+    assert bucket.reserve(30) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+    clock.now += 3600  # Never refills above capacity
+    assert bucket.reserve(60) == pytest.approx(0.0)
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+def test_token_bucket_clamps_requests_to_capacity(monkeypatch):
+    monkeypatch.setattr(ai_client_module, "time", FakeClock())
+    bucket = TokenBucket(60)
+
+    # A request larger than the bucket waits for a full bucket, not forever
+    assert bucket.reserve(10_000) == 0
+    assert bucket.reserve(60) == pytest.approx(60.0)
+
+def test_token_bucket_acquire_waits_for_refill():
+    bucket = TokenBucket(600)  # Ten units per second
+    bucket.reserve(600)
+
+    started_at = time.monotonic()
+    asyncio.run(bucket.acquire(1))
+    assert time.monotonic() - started_at >= 0.09
+
+def test_backoff_delay_grows_exponentially_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "openai_retry_base_delay", 0.5)
+    monkeypatch.setattr(settings, "openai_retry_max_delay", 20.0)
+    monkeypatch.setattr(ai_client_module.random, "uniform", lambda low, high: high)
+
+    delays = [AsyncAIClient._backoff_delay(attempt, Exception()) for attempt in range(7)]
+    assert delays == [0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 20.0]
+
+def test_chat_retries_429_and_5xx_honouring_retry_after(openai_server, monkeypatch, backoff_delays):
+    monkeypatch.setattr(settings, "openai_max_retries", 3)
+    responses = [
+        error_response(429, headers={"retry-after": "2"}),
+        error_response(503),
+        chat_completion("ok")
+    ]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[len(requests) - 1]
+    openai_server(handler)
+
+    text = run(lambda: ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0))
+
+    assert text == "ok"
+    assert len(requests) == 3
+    assert 2.0 <= backoff_delays[0] <= 2.5  # Retry-After plus jitter
+    assert 0 <= backoff_delays[1] <= settings.openai_retry_base_delay * 2
+
+def test_chat_gives_up_after_max_retries(openai_server, monkeypatch, backoff_delays):
+    monkeypatch.setattr(settings, "openai_max_retries", 2)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return error_response(429)
+    openai_server(handler)
+
+    with pytest.raises(RateLimitError):
+        run(lambda: ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0))
+    assert len(requests) == 3
+    assert len(backoff_delays) == 2
+
+def test_chat_does_not_retry_client_errors(openai_server, monkeypatch, backoff_delays):
+    monkeypatch.setattr(settings, "openai_max_retries", 3)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return error_response(400)
+    openai_server(handler)
+
+    with pytest.raises(BadRequestError):
+        run(lambda: ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0))
+    assert len(requests) == 1
+    assert backoff_delays == []
+
+def test_concurrency_is_bounded_by_the_semaphore(openai_server, monkeypatch):
+    monkeypatch.setattr(settings, "openai_max_concurrency", 2)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return chat_completion("ok")
+    openai_server(handler)
+
+    async def six_calls():
+        return await asyncio.gather(*[
+            ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0) for _ in range(6)
+        ])
+
+    assert run(six_calls) == ["ok"] * 6
+    assert peak == 2
+
+def test_stream_releases_the_semaphore_after_retries(openai_server, monkeypatch, backoff_delays):
+    monkeypatch.setattr(settings, "openai_max_concurrency", 1)
+    monkeypatch.setattr(settings, "openai_max_retries", 1)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            return error_response(500)
+        if len(requests) == 2:
+            return sse_response(["Olá", " mundo"])
+        return chat_completion("ok")
+    openai_server(handler)
+
+    async def stream_then_chat():
+        deltas = [delta async for delta in ai_client.stream_text(MESSAGES, max_tokens=10, temperature=0)]
+        text = await ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0)
+        return deltas, text
+
+    async def bounded():
+        # With a single slot this would hang if the failed open or the stream leaked it
+        return await asyncio.wait_for(stream_then_chat(), timeout=2)
+
+    assert run(bounded) == (["Olá", " mundo"], "ok")
+    assert len(backoff_delays) == 1
+
+def test_client_state_is_per_event_loop(openai_server):
+    openai_server(lambda request: chat_completion("ok"))
+
+    async def use_client():
+        client, semaphore = ai_client._get_state()
+        assert ai_client._get_state() == (client, semaphore)
+        await ai_client.chat_text(MESSAGES, max_tokens=10, temperature=0)
+        await ai_client.aclose()
+        assert asyncio.get_running_loop() not in ai_client._loop_state
+        return client
+
+    first = asyncio.run(use_client())
+    second = asyncio.run(use_client())
+    assert first is not second
@@ -0,0 +1,113 @@
+import json
+import re
+
+import pytest
+from bson import ObjectId
+
+from openai_fakes import error_response, run, tool_call_response
+from ugc_shared.services.ai_service import ai_service
+
+PROFILE_ID = str(ObjectId())
+
+def make_post(post_id):
+    return {
+        "post_id": post_id,
+        "post_url": f"https://instagram.com/p/{post_id}",
+        "post_caption": f"Legenda do post {post_id}",
+        "post_type": "image"
+    }
+
+def make_analysis(overall):
+    return {
+        "scores": {"overall": overall, "content_quality": 0.7, "engagement_potential": 0.6, "visual_appeal": 0.8},
+        "feedback_text": "Bom post",
+        "suggestions": ["Use mais hashtags"]
+    }
+
+class FakeOpenAI:
+    """MockTransport handler recording the function each request asked for"""
+
+    def __init__(self, batch_items=None, batch_status=200, single_overall=0.5):
+        self.batch_items = batch_items  # Builds the batch response items from the requested post ids
+        self.batch_status = batch_status
+        self.single_overall = single_overall
+        self.calls = []
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        name = body["tools"][0]["function"]["name"]
+        self.calls.append(name)
+        if name == "submit_post_analyses":
+            if self.batch_status != 200:
+                return error_response(self.batch_status)
+            post_ids = re.findall(r'post_id: "([^"]+)"', body["messages"][-1]["content"])
+            return tool_call_response(name, {"posts": self.batch_items(post_ids)})
+        return tool_call_response(name, make_analysis(self.single_overall))
+
+@pytest.fixture
+def serve(openai_server):
+    """Serve the test's FakeOpenAI and run AI service calls against it"""
+    def start(fake, make_coro):
+        openai_server(fake)
+        return run(make_coro)
+    return start
+
+def test_analyze_posts_batch_returns_every_post(serve):
+    fake = FakeOpenAI(batch_items=lambda ids: [{"post_id": post_id, **make_analysis(0.9)} for post_id in ids])
+    posts = [make_post("p1"), make_post("p2"), make_post("p3")]
+
+    analyses = serve(fake, lambda: ai_service.analyze_posts_batch(posts, "fashion"))
+
+    assert set(analyses) == {"p1", "p2", "p3"}
+    assert analyses["p1"]["scores"]["overall"] == 0.9
+    assert "post_id" not in analyses["p1"]
+    assert fake.calls == ["submit_post_analyses"]
+
+def test_create_posts_feedback_batch_success(serve):
+    fake = FakeOpenAI(batch_items=lambda ids: [{"post_id": post_id, **make_analysis(0.9)} for post_id in ids])
+    posts = [make_post("p1"), make_post("p2"), make_post("p3")]
+
+    feedbacks = serve(fake, lambda: ai_service.create_posts_feedback(PROFILE_ID, "fashion", posts, batch_size=5))
+
+    assert [feedback.post_id for feedback in feedbacks] == ["p1", "p2", "p3"]
+    assert all(feedback.scores.overall == 0.9 for feedback in feedbacks)
+    assert fake.calls == ["submit_post_analyses"]
+
+def test_create_posts_feedback_partial_batch_failure(serve):
+    # p2's item fails validation and p3 is missing: both are analyzed one by one
+    def batch_items(ids):
+        return [
+            {"post_id": "p1", **make_analysis(0.9)},
+            {"post_id": "p2", "feedback_text": "sem notas"}
+        ]
+    fake = FakeOpenAI(batch_items=batch_items, single_overall=0.4)
+    posts = [make_post("p1"), make_post("p2"), make_post("p3")]
+
+    analyses = serve(fake, lambda: ai_service.analyze_posts_batch(posts, "fashion"))
+    assert set(analyses) == {"p1"}
+
+    fake.calls.clear()
+    feedbacks = serve(fake, lambda: ai_service.create_posts_feedback(PROFILE_ID, "fashion", posts, batch_size=5))
+
+    assert [feedback.post_id for feedback in feedbacks] == ["p1", "p2", "p3"]
+    assert [feedback.scores.overall for feedback in feedbacks] == [0.9, 0.4, 0.4]
+    assert fake.calls == ["submit_post_analyses", "submit_post_analysis", "submit_post_analysis"]
+
+def test_create_posts_feedback_falls_back_to_single_posts(serve):
+    # The batch request fails outright; every post is analyzed on its own
+    fake = FakeOpenAI(batch_status=500, single_overall=0.6)
+    posts = [make_post("p1"), make_post("p2")]
+
+    feedbacks = serve(fake, lambda: ai_service.create_posts_feedback(PROFILE_ID, "fashion", posts, batch_size=5))
+
+    assert [feedback.post_id for feedback in feedbacks] == ["p1", "p2"]
+    assert all(feedback.scores.overall == 0.6 for feedback in feedbacks)
+    assert fake.calls == ["submit_post_analyses", "submit_post_analysis", "submit_post_analysis"]
+
+def test_create_posts_feedback_single_post_skips_batch(serve):
+    fake = FakeOpenAI(single_overall=0.7)
+
+    feedbacks = serve(fake, lambda: ai_service.create_posts_feedback(PROFILE_ID, "fashion", [make_post("p1")], batch_size=5))
+
+    assert feedbacks[0].scores.overall == 0.7
+    assert fake.calls == ["submit_post_analysis"]
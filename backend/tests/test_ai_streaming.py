@@ -0,0 +1,144 @@
+import json
+import time
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.auth import get_current_active_user
+from app.main import app
+from openai_fakes import run, sse_response
+from ugc_shared.models import AuthenticatedUser
+from ugc_shared.services.ai_service import FALLBACK_POST_SUGGESTIONS, STREAM_SCORES_MARKER, ai_service
+
+FEEDBACK_TEXT = "Ótimo post! A legenda conversa bem com o público, use #hashtags do nicho.\n"
+SCORES_JSON = json.dumps({
+    "scores": {"overall": 0.8, "content_quality": 0.9, "engagement_potential": 0.7, "visual_appeal": 0.6},
+    "suggestions": ["Poste mais Reels"]
+})
+FULL_RESPONSE = FEEDBACK_TEXT + STREAM_SCORES_MARKER + SCORES_JSON
+
+def collect():
+    """Run stream_post_analysis against the served stream: (text deltas, final analysis)"""
+    async def consume():
+        texts, result = [], None
+        async for event, data in ai_service.stream_post_analysis("Legenda", "image", "fashion"):
+            if event == "delta":
+                texts.append(data)
+            else:
+                result = data
+        return texts, result
+    return run(consume)
+
+@pytest.fixture
+def stream(openai_server):
+    """Serve a fake streamed completion made of the given deltas"""
+    def serve(deltas, delays=None):
+        openai_server(lambda request: sse_response(deltas, delays))
+    return serve
+
+def test_marker_split_across_chunks(stream):
+    marker_split = len(FEEDBACK_TEXT) + 5
+    stream([FULL_RESPONSE[:20], FULL_RESPONSE[20:marker_split], FULL_RESPONSE[marker_split:marker_split + 4], FULL_RESPONSE[marker_split + 4:]])
+
+    texts, analysis = collect()
+
+    assert "".join(texts) == FEEDBACK_TEXT
+    assert analysis["feedback_text"] == FEEDBACK_TEXT.strip()
+    assert analysis["scores"]["overall"] == 0.8
+    assert analysis["suggestions"] == ["Poste mais Reels"]
+
+@pytest.mark.parametrize("split", range(1, len(FEEDBACK_TEXT) + len(STREAM_SCORES_MARKER) + 2))
+def test_holdback_never_forwards_marker_bytes(stream, split):
+    stream([FULL_RESPONSE[:split], FULL_RESPONSE[split:]])
+
+    texts, analysis = collect()
+
+    # Exactly the feedback is forwarded: no byte of the marker or the scores, and the "#" of #hashtags is not lost
+    assert "".join(texts) == FEEDBACK_TEXT
+    assert analysis["scores"]["overall"] == 0.8
+
+def test_holdback_with_one_character_chunks(stream):
+    stream(list(FULL_RESPONSE))
+
+    texts, analysis = collect()
+
+    assert "".join(texts) == FEEDBACK_TEXT
+    assert all("###" not in text for text in texts)
+    assert analysis["scores"]["content_quality"] == 0.9
+
+def test_malformed_scores_fall_back(stream):
+    stream([FEEDBACK_TEXT, STREAM_SCORES_MARKER, '{"scores": "altos"}'])
+
+    texts, analysis = collect()
+
+    assert "".join(texts) == FEEDBACK_TEXT
+    assert analysis["scores"] == {"overall": 0.7, "content_quality": 0.7, "engagement_potential": 0.7, "visual_appeal": 0.7}
+    assert analysis["suggestions"] == list(FALLBACK_POST_SUGGESTIONS)
+    assert analysis["feedback_text"] == FEEDBACK_TEXT.strip()
+
+def test_missing_scores_block_forwards_everything_and_falls_back(stream):
+    stream([FEEDBACK_TEXT[:30], FEEDBACK_TEXT[30:]])
+
+    texts, analysis = collect()
+
+    assert "".join(texts) == FEEDBACK_TEXT
+    assert analysis["scores"]["overall"] == 0.7
+    assert analysis["suggestions"] == list(FALLBACK_POST_SUGGESTIONS)
+
+def test_first_delta_arrives_before_the_model_finishes(stream):
+    # The model pauses 300 ms after the first sentence; that sentence must not wait for the rest
+    events = []
+    started_at = time.perf_counter()
+
+    async def consume():
+        async for event, data in ai_service.stream_post_analysis("Legenda", "image", "fashion"):
+            events.append((event, time.perf_counter() - started_at))
+
+    stream([FEEDBACK_TEXT, STREAM_SCORES_MARKER + SCORES_JSON], delays={1: 0.3})
+    run(consume)
+
+    first_delta_at = next(at for event, at in events if event == "delta")
+    result_at = next(at for event, at in events if event == "result")
+    assert result_at >= 0.3
+    assert first_delta_at < 0.15
+
+def parse_sse(body):
+    """(event, data) pairs of a Server-Sent Events body"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_streamed_feedback_is_persisted(stream, db):
+    user_id = ObjectId()
+    profile_id = db.profiles.insert_one({"user_id": user_id, "niche": "fashion", "subscription_status": "basic"}).inserted_id
+    app.dependency_overrides[get_current_active_user] = lambda: AuthenticatedUser(id=user_id, email="creator@example.com")
+    stream([FEEDBACK_TEXT, STREAM_SCORES_MARKER + SCORES_JSON], delays={1: 0.2})
+
+    try:
+        response = TestClient(app).post("/ai/generate-post-feedback/stream", params={
+            "post_id": "post-1",
+            "post_url": "https://instagram.com/p/post-1",
+            "post_caption": "Legenda",
+            "post_type": "image"
+        })
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [event for event, _ in events][-2:] == ["result", "done"]
+    assert "".join(data["text"] for event, data in events if event == "delta") == FEEDBACK_TEXT
+
+    done = events[-1][1]
+    assert done["ttfb_ms"] < done["total_ms"] - 150
+
+    feedback = db.posts_feedback.find_one({"post_id": "post-1"})
+    assert str(feedback["_id"]) == done["feedback_id"]
+    assert feedback["profile_id"] == profile_id
+    assert feedback["feedback_text"] == FEEDBACK_TEXT.strip()
+    assert feedback["scores"]["overall"] == 0.8
+    assert feedback["source"] == "ai"
@@ -0,0 +1,63 @@
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.auth import get_password_hash
+from app.main import app
+from ugc_shared.models import UserInDB
+
+EMAIL = "creator@example.com"
+PASSWORD = "s3nha-segura"
+
+@pytest.fixture
+def client(db, redis):
+    return TestClient(app)
+
+def login(client):
+    response = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_register_login_me_logout(client, db):
+    response = client.post("/auth/register", json={"email": EMAIL, "full_name": "Criadora", "password": PASSWORD})
+    assert response.status_code == 200
+    assert isinstance(db.users.find_one({"email": EMAIL})["_id"], ObjectId)
+
+    tokens = login(client)
+
+    response = client.get("/auth/me", headers=bearer(tokens["access_token"]))
+    assert response.status_code == 200
+    assert response.json()["email"] == EMAIL
+
+    response = client.post("/auth/logout", headers=bearer(tokens["access_token"]))
+    assert response.status_code == 200
+    assert db.users.find_one({"email": EMAIL})["token_version"] == 1
+
+    # Every token issued before the logout is revoked
+    assert client.get("/auth/me", headers=bearer(tokens["access_token"])).status_code == 401
+    assert client.post("/auth/refresh", headers=bearer(tokens["refresh_token"])).status_code == 401
+
+    # A new login gets working tokens again
+    assert client.get("/auth/me", headers=bearer(login(client)["access_token"])).status_code == 200
+
+def test_users_stored_with_string_ids_can_log_out(client, db):
+    # Users registered before ids were stored as ObjectIds
+    user = UserInDB(email=EMAIL, full_name="Criadora", hashed_password=get_password_hash(PASSWORD))
+    db.users.insert_one(user.model_dump(by_alias=True))
+    tokens = login(client)
+
+    assert client.get("/auth/me", headers=bearer(tokens["access_token"])).status_code == 200
+    assert client.post("/auth/logout", headers=bearer(tokens["access_token"])).status_code == 200
+    assert client.get("/auth/me", headers=bearer(tokens["access_token"])).status_code == 401
+
+def test_logout_of_a_deleted_user_is_404(client, db, redis):
+    client.post("/auth/register", json={"email": EMAIL, "full_name": "Criadora", "password": PASSWORD})
+    tokens = login(client)
+    user_id = db.users.find_one({"email": EMAIL})["_id"]
+    db.users.delete_one({"_id": user_id})
+
+    assert client.post("/auth/logout", headers=bearer(tokens["access_token"])).status_code == 404
+    assert redis.get(f"auth:token_version:{user_id}") is None
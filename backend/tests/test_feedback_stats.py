@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.auth import get_current_active_user
+from app.main import app
+from ugc_shared.models import AuthenticatedUser, PostFeedbackInDB
+from ugc_shared.services.feedback_stats import feedback_stats_service
+
+@pytest.fixture
+def profile(db):
+    """A profile owned by the authenticated test user"""
+    user_id = ObjectId()
+    profile_id = db.profiles.insert_one({"user_id": user_id, "niche": "fashion"}).inserted_id
+    app.dependency_overrides[get_current_active_user] = lambda: AuthenticatedUser(id=user_id, email="creator@example.com")
+    yield db.profiles.find_one({"_id": profile_id})
+    app.dependency_overrides.clear()
+
+def feedback_document(profile_id, post_id, overall):
+    """A feedback document as model_dump(by_alias=True) leaves it: ids as strings"""
+    return PostFeedbackInDB(
+        profile_id=profile_id,
+        post_id=post_id,
+        post_url=f"https://instagram.com/p/{post_id}",
+        post_type="image",
+        scores={"overall": overall, "content_quality": 0.5, "engagement_potential": 0.5, "visual_appeal": 0.5},
+        feedback_text="Bom post"
+    ).model_dump(by_alias=True)
+
+def get_summary():
+    response = TestClient(app).get("/feedback/stats/summary")
+    assert response.status_code == 200
+    return response.json()
+
+def test_recorded_feedback_shows_in_the_summary(db, profile):
+    for post_id, overall in [("p1", 0.9), ("p2", 0.5)]:
+        document = feedback_document(str(profile["_id"]), post_id, overall)
+        document["profile_id"] = ObjectId(document["profile_id"])
+        db.posts_feedback.insert_one(document)
+        feedback_stats_service.record(document)
+
+    summary = get_summary()
+
+    assert summary["total_posts_analyzed"] == 2
+    assert summary["average_scores"]["overall"] == 0.7
+    assert summary["best_post_score"] == 0.9
+    assert summary["worst_post_score"] == 0.5
+    assert db.feedback_stats.count_documents({"profile_id": profile["_id"]}) == 1
+
+def test_string_profile_ids_update_the_same_stats(db, profile):
+    # The first feedback builds the stats from the collection, the second one increments them
+    for post_id, overall in [("p1", 0.8), ("p2", 0.4)]:
+        document = feedback_document(profile["_id"], post_id, overall)
+        db.posts_feedback.insert_one(document)
+        feedback_stats_service.record(document)
+
+    summary = get_summary()
+
+    assert summary["total_posts_analyzed"] == 2
+    assert summary["average_scores"]["overall"] == 0.6
+    assert db.feedback_stats.count_documents({}) == 1
+
+def test_reconcile_rebuilds_drifted_stats(db, profile):
+    document = feedback_document(profile["_id"], "p1", 0.8)
+    db.posts_feedback.insert_one(document)
+    db.feedback_stats.insert_one({"profile_id": profile["_id"], "count": 5, "sum": {}, "updated_at": datetime.utcnow()})
+
+    assert feedback_stats_service.reconcile(document["profile_id"]) is True
+    assert feedback_stats_service.reconcile(document["profile_id"]) is False
+    assert get_summary()["total_posts_analyzed"] == 1
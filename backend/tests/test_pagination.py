@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.auth import get_current_active_user
+from app.main import app
+from app.pagination import DEPRECATION_HEADER, NEXT_CURSOR_HEADER
+from ugc_shared.models import AuthenticatedUser
+
+FEEDBACK_COUNT = 25
+
+@pytest.fixture
+def client(db):
+    """Client of a user whose profile has FEEDBACK_COUNT feedback documents, some sharing a timestamp"""
+    user_id = ObjectId()
+    profile_id = db.profiles.insert_one({"user_id": user_id, "niche": "fashion"}).inserted_id
+    started_at = datetime(2024, 1, 1)
+    db.posts_feedback.insert_many([{
+        "_id": ObjectId(),
+        "profile_id": profile_id,
+        "post_id": f"p{index}",
+        "post_url": f"https://instagram.com/p/p{index}",
+        "post_type": "image",
+        "scores": {"overall": 0.5, "content_quality": 0.5, "engagement_potential": 0.5, "visual_appeal": 0.5},
+        "feedback_text": "Bom post",
+        "created_at": started_at + timedelta(minutes=index // 2)
+    } for index in range(FEEDBACK_COUNT)])
+    app.dependency_overrides[get_current_active_user] = lambda: AuthenticatedUser(id=user_id, email="creator@example.com")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def post_ids(response):
+    return [feedback["post_id"] for feedback in response.json()]
+
+def test_cursor_walks_every_document_once(client):
+    seen = []
+    response = client.get("/feedback/", params={"limit": 10})
+    while True:
+        assert response.status_code == 200
+        assert DEPRECATION_HEADER not in response.headers
+        seen += post_ids(response)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        response = client.get("/feedback/", params={"limit": 10, "cursor": cursor})
+
+    assert len(seen) == FEEDBACK_COUNT
+    assert set(seen) == {f"p{index}" for index in range(FEEDBACK_COUNT)}
+
+def test_skip_matches_the_cursor_pages_and_is_flagged_deprecated(client):
+    first_page = client.get("/feedback/", params={"limit": 10})
+    cursor_page = client.get("/feedback/", params={"limit": 10, "cursor": first_page.headers[NEXT_CURSOR_HEADER]})
+    skip_page = client.get("/feedback/", params={"limit": 10, "skip": 10})
+
+    assert post_ids(skip_page) == post_ids(cursor_page)
+    assert skip_page.headers[DEPRECATION_HEADER] == "true"
+
+def test_deep_skip_is_still_accepted(client):
+    response = client.get("/feedback/", params={"skip": 1000})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers[DEPRECATION_HEADER] == "true"
@@ -64,6 +64,13 @@ export const AuthProvider = ({ children }) => {
 
   // Logout
   const logout = () => {
+    const token = localStorage.getItem("access_token");
+    if (token) {
+      // Revoga os tokens no servidor; a saída local não depende da resposta
+      axios
+        .post(`${apiUrl}/auth/logout`, {}, { headers: { Authorization: `Bearer ${token}` } })
+        .catch(() => {});
+    }
     setUser(null);
     localStorage.removeItem("access_token");
     localStorage.removeItem("refresh_token");
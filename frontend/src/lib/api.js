@@ -26,7 +26,14 @@ api.interceptors.request.use(
 
 // Response interceptor to handle token refresh
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    // The backend re-issues the access token when its claims change (e.g. after creating the profile)
+    const renewedToken = response.headers['x-access-token'];
+    if (renewedToken) {
+      localStorage.setItem('access_token', renewedToken);
+    }
+    return response;
+  },
   async (error) => {
     const originalRequest = error.config;
 
@@ -68,6 +75,7 @@ export const authAPI = {
   login: (credentials) => api.post('/auth/login', credentials),
   refresh: () => api.post('/auth/refresh'),
   getMe: () => api.get('/auth/me'),
+  logout: () => api.post('/auth/logout'),
 };
 
 // Profile API
@@ -75,7 +83,7 @@ export const profileAPI = {
   getProfile: () => api.get('/profiles/me'),
   createProfile: (profileData) => api.post('/profiles', profileData),
   updateProfile: (profileData) => api.put('/profiles/me', profileData),
-  getDashboard: () => api.get('/profiles/me/dashboard'),
+  getDashboard: (params = {}) => api.get('/profiles/me/dashboard', { params }),
 };
 
 // Reports API
@@ -0,0 +1,67 @@
+"""Posts scored per second by the local scoring engine.
+
+Scores synthetic posts with varied captions, media types and engagement,
+timing feature extraction alone, scoring (features and model), and the
+full analysis a sweep stores (scores, feedback text and suggestions).
+
+    python scripts/benchmarks/bench_local_scoring.py --posts 20000
+"""
+import argparse
+import random
+import time
+
+from ugc_shared.services.local_scoring import local_scorer
+
+WORDS = "post dica look moda treino receita viagem rotina maquiagem casa estilo hoje novo".split()
+ENDINGS = ["Comenta aqui o que achou!", "Salva esse post.", "O que vocês acham?", "Link na bio.", ""]
+MEDIA_TYPES = ["image", "video", "carousel", "reels"]
+
+def make_posts(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    posts = []
+    for index in range(count):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 60)))
+        hashtags = " ".join(f"#{rng.choice(WORDS)}{n}" for n in range(rng.randint(0, 20)))
+        mentions = " ".join(f"@perfil{n}" for n in range(rng.randint(0, 2)))
+        reach = rng.randint(0, 5000)
+        posts.append({
+            "post_id": f"p{index}",
+            "post_caption": f"{words} {mentions} {rng.choice(ENDINGS)} {hashtags}",
+            "post_type": rng.choice(MEDIA_TYPES),
+            "engagement_data": {
+                "likes": rng.randint(0, reach // 5 + 1),
+                "comments": rng.randint(0, reach // 50 + 1),
+                "saved": rng.randint(0, 20),
+                "shares": rng.randint(0, 10),
+                "reach": reach
+            }
+        })
+    return posts
+
+def best_of(function, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+    print(f"{args.posts} synthetic posts, best of {args.repeat} runs")
+    for name, function in [
+        ("extract_features", lambda: local_scorer.extract_features(posts)),
+        ("score", lambda: local_scorer.score(posts)),
+        ("analyze", lambda: local_scorer.analyze(posts)),
+    ]:
+        seconds = best_of(function, args.repeat)
+        print(f"{name:>16}: {seconds * 1000:8.1f} ms, {args.posts / seconds:10,.0f} posts/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Concurrent logins per second, and how much they delay other requests.
+
+Runs POST /auth/login in-process against the backend app, with mongomock
+behind get_database(), for users whose stored hash uses the chosen scheme.
+Each user logs in once, so bcrypt hashes are verified as bcrypt before
+login upgrades them to Argon2id. While the logins run, GET / is probed
+every 10 ms; the delay from when each probe was due to its answer is what
+any other endpoint would see.
+
+Run it from backend/, like the app, so the backend settings are loaded:
+
+    python ../scripts/benchmarks/bench_login.py --scheme bcrypt --logins 32
+    python ../scripts/benchmarks/bench_login.py --scheme bcrypt --inline  # hash on the event loop, as before
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import httpx
+import mongomock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+from app import auth  # noqa: E402
+from app.database import mongodb  # noqa: E402
+from app.main import app  # noqa: E402
+from ugc_shared.models import UserInDB  # noqa: E402
+
+PASSWORD = "s3nha-segura"
+
+def seed_users(database, scheme: str, count: int):
+    hashed_password = auth.pwd_context.hash(PASSWORD, scheme=scheme)
+    for index in range(count):
+        user = UserInDB(email=f"user{index}@example.com", full_name=f"User {index}", hashed_password=hashed_password)
+        document = user.model_dump(by_alias=True)
+        document["_id"] = user.id
+        database.users.insert_one(document)
+
+async def run_inline(func, *args):
+    """Hash on the event loop, as login did before the password pool"""
+    return func(*args)
+
+def percentile(values, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+async def probe(client, stop: asyncio.Event, latencies):
+    """GET / every 10 ms, recording how long after it was due each answer came (event loop stalls included)"""
+    while not stop.is_set():
+        due_at = time.perf_counter() + 0.01
+        await asyncio.sleep(0.01)
+        await client.get("/")
+        latencies.append((time.perf_counter() - due_at) * 1000)
+
+async def bench(logins: int):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        # Warm up the app, the hash backends and the pool, as on a running server
+        await client.post("/auth/login", json={"email": f"user{logins}@example.com", "password": PASSWORD})
+
+        stop = asyncio.Event()
+        latencies = []
+        prober = asyncio.create_task(probe(client, stop, latencies))
+
+        started_at = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/auth/login", json={"email": f"user{index}@example.com", "password": PASSWORD})
+            for index in range(logins)
+        ])
+        elapsed = time.perf_counter() - started_at
+
+        stop.set()
+        await prober
+    return responses, elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scheme", choices=["argon2", "bcrypt"], default="argon2")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--inline", action="store_true", help="verify passwords on the event loop")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    mongodb.database = mongomock.MongoClient().ugc_bench
+    seed_users(mongodb.database, args.scheme, args.logins + 1)
+    if args.inline:
+        auth._run_password_task = run_inline
+
+    responses, elapsed, latencies = asyncio.run(bench(args.logins))
+
+    failed = [response.status_code for response in responses if response.status_code != 200]
+    if failed:
+        sys.exit(f"{len(failed)} logins failed: {sorted(set(failed))}")
+
+    print(f"{args.logins} concurrent {args.scheme} logins ({'inline' if args.inline else 'password pool'}), "
+          f"{auth.settings.password_hash_workers} hash workers, {os.cpu_count()} CPUs")
+    print(f"  {elapsed:.2f} s, {args.logins / elapsed:.1f} logins/s")
+    print(f"  GET / during the logins: {len(latencies)} probes answered "
+          f"median {statistics.median(latencies):.1f} ms, p95 {percentile(latencies, 95):.1f} ms, "
+          f"max {max(latencies):.1f} ms after they were due")
+
+if __name__ == "__main__":
+    main()
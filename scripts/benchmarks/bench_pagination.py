@@ -0,0 +1,93 @@
+"""Page latency of the feedback listing: deprecated `skip` offsets against keyset cursors.
+
+Seeds a scratch database on a real MongoDB server with one profile's
+feedback, then reads one page at growing depths both ways, with the query
+shapes and index that GET /feedback/ uses. Reports the median latency and
+the index keys examined per page.
+
+    MONGODB_URL=mongodb://localhost:27017 python scripts/benchmarks/bench_pagination.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+from app.pagination import KEYSET_SORT, encode_cursor, keyset_query  # noqa: E402
+
+def seed(collection, profile_id, documents: int):
+    collection.create_index([("profile_id", 1), ("created_at", -1), ("_id", -1)])
+    started_at = datetime(2024, 1, 1)
+    batch = []
+    for index in range(documents):
+        batch.append({
+            "_id": ObjectId(),
+            "profile_id": profile_id,
+            "post_id": f"bench-{index}",
+            "scores": {"overall": 0.5},
+            "feedback_text": "x" * 400,
+            "created_at": started_at + timedelta(seconds=index)
+        })
+        if len(batch) == 5000:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+
+def time_page(make_cursor, repeat: int):
+    """Median milliseconds to read a page, and the index keys it examined"""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        list(make_cursor())
+        timings.append((time.perf_counter() - started_at) * 1000)
+    keys_examined = make_cursor().explain()["executionStats"]["totalKeysExamined"]
+    return statistics.median(timings), keys_examined
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 100, 1_000, 10_000, 50_000, 99_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    database_name = f"ugc_bench_{ObjectId()}"
+    collection = client[database_name].posts_feedback
+    profile_id = ObjectId()
+    query = {"profile_id": profile_id}
+
+    try:
+        seed(collection, profile_id, args.documents)
+        print(f"{args.documents} documents, pages of {args.limit}, median of {args.repeat} reads")
+        print(f"{'depth':>8} {'skip ms':>9} {'keys':>8} {'cursor ms':>10} {'keys':>6}")
+        for depth in args.depths:
+            if depth >= args.documents:
+                continue
+            # The cursor a client would hold after reading `depth` documents
+            previous = None
+            if depth:
+                previous = collection.find(query, {"created_at": 1}).sort(KEYSET_SORT).skip(depth - 1).limit(1).next()
+            cursor = encode_cursor(previous) if previous else None
+
+            def skip_page():
+                return collection.find(query).sort(KEYSET_SORT).skip(depth).limit(args.limit)
+
+            def cursor_page():
+                return collection.find(keyset_query(query, cursor)).sort(KEYSET_SORT).limit(args.limit)
+
+            assert [doc["_id"] for doc in skip_page()] == [doc["_id"] for doc in cursor_page()]
+            skip_ms, skip_keys = time_page(skip_page, args.repeat)
+            cursor_ms, cursor_keys = time_page(cursor_page, args.repeat)
+            print(f"{depth:>8} {skip_ms:>9.2f} {skip_keys:>8} {cursor_ms:>10.2f} {cursor_keys:>6}")
+    finally:
+        client.drop_database(database_name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Per-report overhead of PDF report generation.
+
+Times, for a weekly report with 7 days of metrics and 20 feedback items:
+
+- building the report styles from scratch against the per-process cache
+- the layout alone (charts skipped), which is where the styles are used
+- the full report with its chart, with and without ReportLab's ASCII85
+  pass (on by default in ReportLab, turned off by report_templates)
+
+and prints the PDF size of each full report.
+
+    python scripts/benchmarks/bench_report_overhead.py
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from reportlab import rl_config
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "worker"))
+from app.services.records import FeedbackRecord, MetricRecord  # noqa: E402
+from app.services.report_generator import report_generator  # noqa: E402
+from app.services.report_templates import report_styles, report_template  # noqa: E402
+
+PROFILE = {"_id": "bench", "display_name": "Ana", "niche": "fashion"}
+PERIOD_END = datetime(2024, 1, 8)
+METRICS = [
+    MetricRecord(PERIOD_END - timedelta(days=day), 1000 - day, 3.1, 50, 5, 900, 5)
+    for day in range(7)
+]
+FEEDBACK = [FeedbackRecord((0.5, 0.6, 0.7, 0.8), (f"Sugestão {index}",)) for index in range(20)]
+
+def fastest_ms(function, repeat: int) -> float:
+    """Fastest of `repeat` calls, in milliseconds, after one warm-up call"""
+    function()
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings) * 1000
+
+def generate_report():
+    return report_generator.generate_performance_report(
+        PROFILE, METRICS, FEEDBACK, "Relatório semanal",
+        PERIOD_END - timedelta(days=7), PERIOD_END, template=report_template("weekly")
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=15, help="full reports per measurement")
+    parser.add_argument("--layout-repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"Weekly report, {len(METRICS)} days of metrics, {len(FEEDBACK)} feedback items, fastest run")
+    print(f"  styles built per report: {fastest_ms(report_styles.__wrapped__, args.layout_repeat):8.3f} ms")
+    print(f"  styles from the cache:   {fastest_ms(report_styles, args.layout_repeat):8.3f} ms")
+
+    for use_a85 in (0, 1):
+        rl_config.useA85 = use_a85
+        full_ms = fastest_ms(generate_report, args.repeat)
+        size_kb = len(generate_report().getvalue()) / 1024
+        print(f"  full report, ASCII85 {'on ' if use_a85 else 'off'}: {full_ms:8.1f} ms, {size_kb:6.0f} KB")
+    rl_config.useA85 = 0
+
+    report_generator._generate_charts = lambda metrics_data: None
+    print(f"  layout without the chart: {fastest_ms(generate_report, args.layout_repeat):6.2f} ms")
+
+if __name__ == "__main__":
+    main()
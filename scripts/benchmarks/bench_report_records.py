@@ -0,0 +1,151 @@
+"""Time and memory to load a report's metrics and feedback: whole documents against slotted records.
+
+Encodes a batch of synthetic metrics and feedback documents as BSON, as
+the driver receives them, then measures BSON decoding plus the report
+processing (MetricsHistory and average scores) both ways:
+
+- dicts: whole documents, processed with .get lookups, as before
+- records: documents read with the records' projections and loaded as
+  MetricRecord and FeedbackRecord, as generate_profile_report does now
+
+Both ways must produce the same results.
+
+    python scripts/benchmarks/bench_report_records.py --documents 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import bson
+import numpy as np
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "worker"))
+from app.services.records import (  # noqa: E402
+    FeedbackRecord,
+    MetricRecord,
+    feedback_average_scores,
+    feedback_records,
+    metric_records,
+    metrics_history,
+)
+from ugc_shared.services.analytics import MetricsHistory, average_scores  # noqa: E402
+
+def make_metrics(count: int, rng: random.Random):
+    profile_id = ObjectId()
+    started_at = datetime(2024, 1, 1)
+    return [{
+        "_id": ObjectId(),
+        "profile_id": profile_id,
+        "date": started_at + timedelta(hours=index),
+        "followers_count": 1000 + index,
+        "following_count": 10,
+        "posts_count": 50,
+        "total_likes": 5000 + index,
+        "total_comments": 300,
+        "total_reach": 9000,
+        "avg_engagement_rate": 3.2 + rng.random(),
+        "post_metrics": [{
+            "id": str(post),
+            "media_type": "IMAGE",
+            "like_count": 10,
+            "comments_count": 2,
+            "reach": 100,
+            "timestamp": "2024-01-01T10:00:00+0000"
+        } for post in range(12)],
+        "created_at": started_at
+    } for index in range(count)]
+
+def make_feedback(count: int, rng: random.Random):
+    profile_id = ObjectId()
+    return [{
+        "_id": ObjectId(),
+        "profile_id": profile_id,
+        "post_id": str(index),
+        "post_url": f"https://instagram.com/p/{index}",
+        "post_caption": "legenda " * 40,
+        "post_type": "image",
+        "scores": {"overall": rng.random(), "content_quality": 0.5, "engagement_potential": 0.6, "visual_appeal": 0.7},
+        "feedback_text": "Bom post. " * 80,
+        "suggestions": ["Use mais hashtags relevantes para o seu nicho"] * 3,
+        "source": "ai",
+        "created_at": datetime(2024, 1, 1)
+    } for index in range(count)]
+
+def encode(documents, projection=None):
+    """The documents as BSON, reduced to `projection` as the server would"""
+    if projection:
+        documents = [{key: document[key] for key in projection if projection[key] and key in document} for document in documents]
+    return b"".join(bson.encode(document) for document in documents)
+
+def measure(load):
+    """Seconds to run `load`, and the memory its result retains and peaks at, in MB"""
+    gc.collect()
+    started_at = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - started_at
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, retained / 1e6, peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    metrics = make_metrics(args.documents, rng)
+    metrics_bson, metrics_projected = encode(metrics), encode(metrics, MetricRecord.PROJECTION)
+    del metrics
+    feedback = make_feedback(args.documents, rng)
+    feedback_bson, feedback_projected = encode(feedback), encode(feedback, FeedbackRecord.PROJECTION)
+    del feedback
+
+    def metrics_as_dicts():
+        documents = bson.decode_all(metrics_bson)
+        return documents, MetricsHistory.from_documents(documents)
+
+    def metrics_as_records():
+        records = metric_records(bson.decode_all(metrics_projected))
+        return records, metrics_history(records)
+
+    def feedback_as_dicts():
+        documents = bson.decode_all(feedback_bson)
+        return documents, average_scores(documents, 10)
+
+    def feedback_as_records():
+        records = feedback_records(bson.decode_all(feedback_projected))
+        return records, feedback_average_scores(records, 10)
+
+    print(f"{args.documents} documents, BSON decode plus processing")
+    for name, as_dicts, as_records in [
+        ("metrics", metrics_as_dicts, metrics_as_records),
+        ("feedback", feedback_as_dicts, feedback_as_records),
+    ]:
+        results = []
+        for way, load in [("dicts", as_dicts), ("records", as_records)]:
+            (_, result), elapsed, retained, peak = measure(load)
+            results.append(result)
+            print(f"  {name:>8} {way:>7}: {elapsed:6.2f} s, {retained:8.1f} MB retained, {peak:8.1f} MB peak")
+        check_same(*results)
+
+def check_same(expected, actual):
+    if isinstance(expected, MetricsHistory):
+        assert np.array_equal(expected.dates, actual.dates)
+        for field in MetricsHistory.FIELDS:
+            assert np.allclose(expected.values[field], actual.values[field])
+    else:
+        assert all(abs(expected[key] - actual[key]) < 1e-9 for key in expected)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Serialization time per response for 100-item feedback and report lists.
+
+From models: FastAPI's response_model pipeline (validation of the returned
+models, jsonable_encoder, then JSONResponse or ORJSONResponse) against the
+compiled pydantic-core serializer behind app.serializers.json_response.
+
+From stored documents, as the list endpoints read them: validating each
+document into its model and dumping it, building it with model_construct
+and dumping it, and app.serializers.trusted_json_response, which skips
+the model. Every path of a comparison must produce the same JSON.
+
+Run it from backend/, like the app, so the backend settings are loaded:
+
+    python ../scripts/benchmarks/bench_serialization.py --items 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+from app.serializers import json_response, trusted_json_response  # noqa: E402
+from ugc_shared.models import PostFeedback, Report  # noqa: E402
+
+def make_feedback_documents(count: int):
+    """Feedback documents as stored in posts_feedback"""
+    profile_id = ObjectId()
+    return [{
+        "_id": ObjectId(),
+        "profile_id": profile_id,
+        "post_id": f"p{index}",
+        "post_url": f"https://instagram.com/p/p{index}",
+        "post_caption": "legenda do post " * 10,
+        "post_type": "image",
+        "scores": {"overall": 0.5, "content_quality": 0.6, "engagement_potential": 0.7, "visual_appeal": 0.8},
+        "feedback_text": "Bom post, com uma legenda clara. " * 10,
+        "suggestions": ["Use mais hashtags", "Inclua uma CTA", "Poste Reels"],
+        "source": "ai",
+        "created_at": datetime(2024, 1, 1, 12, 0, index % 60)
+    } for index in range(count)]
+
+def make_report_documents(count: int):
+    """Report documents as stored in reports"""
+    profile_id = ObjectId()
+    return [{
+        "_id": ObjectId(),
+        "profile_id": profile_id,
+        "report_type": "weekly",
+        "period_start": datetime(2024, 1, 1),
+        "period_end": datetime(2024, 1, 8),
+        "title": f"Relatório semanal {index}",
+        "summary": "Seu engajamento cresceu nesta semana. " * 5,
+        "file_path": f"/app/reports/{profile_id}/{index}.pdf",
+        "is_ready": True,
+        "created_at": datetime(2024, 1, 8, 12, 0, index % 60)
+    } for index in range(count)]
+
+def per_call_ms(function, number: int, repeat: int) -> float:
+    """Fastest mean time of `number` calls over `repeat` rounds, in milliseconds"""
+    rounds = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            function()
+        rounds.append((time.perf_counter() - started_at) / number)
+    return min(rounds) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    documents = make_feedback_documents(args.items)
+    items = [PostFeedback(**document) for document in documents]
+    response_field = create_response_field(name="Response", type_=List[PostFeedback])
+    list_adapter = TypeAdapter(List[PostFeedback])
+    loop = asyncio.new_event_loop()
+
+    def response_model(response_class):
+        def render():
+            content = loop.run_until_complete(
+                serialize_response(field=response_field, response_content=items, is_coroutine=True)
+            )
+            return response_class(content).body
+        return render
+
+    paths = [
+        ("response_model + JSONResponse", response_model(JSONResponse)),
+        ("response_model + ORJSONResponse", response_model(ORJSONResponse)),
+        ("compiled serializer", lambda: json_response(list_adapter, items).body),
+    ]
+
+    print(f"Best mean of {args.repeat} rounds of {args.number} calls")
+    compare(f"{args.items} feedback items, from models", paths, args)
+
+    for model, documents in [
+        (PostFeedback, documents),
+        (Report, make_report_documents(args.items)),
+    ]:
+        adapter = TypeAdapter(List[model])
+        compare(f"{args.items} {model.__name__} documents", [
+            ("validate + dump", lambda: adapter.dump_json([model(**document) for document in documents], by_alias=True)),
+            ("model_construct + dump", lambda: adapter.dump_json(
+                [model.model_construct(**document) for document in documents], by_alias=True, warnings=False
+            )),
+            ("trusted_json_response", lambda: trusted_json_response(model, documents).body),
+        ], args)
+
+def compare(title, paths, args):
+    print(title)
+    expected = json.loads(paths[0][1]())
+    for name, render in paths:
+        assert json.loads(render()) == expected, f"{name} produced different JSON"
+        print(f"  {name:>32}: {per_call_ms(render, args.number, args.repeat):6.3f} ms per response")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# Code shared by the backend and worker images (models, AI, Instagram and storage services).
+# Modules read the running application's app.config.settings, app.database and
+# app.redis_client, which both images provide.
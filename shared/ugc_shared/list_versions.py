@@ -0,0 +1,23 @@
+import logging
+from typing import Iterable
+from bson import ObjectId
+from app.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Per-profile version of each listing ("reports", "feedback"), part of the listing's ETag;
+# bumped after every insert or delete of a listed document
+LIST_VERSIONS_FIELD = "list_versions"
+
+def bump_list_version(profile_ids: Iterable, listing: str):
+    """Invalidate the cached pages of `listing` for these profiles; call it after the write.
+
+    Ids may be strings, as model_dump() leaves them in stored documents.
+    """
+    try:
+        get_database().profiles.update_many(
+            {"_id": {"$in": [ObjectId(profile_id) for profile_id in profile_ids if profile_id]}},
+            {"$inc": {f"{LIST_VERSIONS_FIELD}.{listing}": 1}}
+        )
+    except Exception as e:
+        logger.error(f"Error bumping {listing} list version: {e}")
@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional, List, Dict, Any, Type
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 from enum import Enum
@@ -32,7 +32,9 @@ class PyObjectId(ObjectId):
                     core_schema.no_info_plain_validator_function(validate_object_id)
                 ])
             ]),
-            serialization=core_schema.plain_serializer_function_ser_schema(lambda x: str(x)),
+            # str() done by pydantic-core itself instead of a Python callback per field;
+            # "always" keeps model_dump() producing strings as before
+            serialization=core_schema.to_string_ser_schema(when_used="always"),
         )
 
 class UserRole(str, Enum):
@@ -74,6 +76,7 @@ class UserUpdate(BaseModel):
 class UserInDB(UserBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     hashed_password: str
+    token_version: int = 0  # Bumped to revoke every token issued before
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -83,9 +86,21 @@ class User(UserBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     created_at: datetime
     updated_at: datetime
+    token_version: int = Field(default=0, exclude=True)
 
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
+class AuthenticatedUser(BaseModel):
+    """The user behind a request, built from the access token claims alone"""
+    id: PyObjectId
+    email: str
+    role: UserRole = UserRole.CREATOR
+    is_active: bool = True
+    profile_id: Optional[PyObjectId] = None
+    token_version: int = 0
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
 # Profile Models
 class SocialMediaLinks(BaseModel):
     instagram: Optional[str] = None
@@ -216,6 +231,7 @@ class PostFeedbackBase(BaseModel):
     scores: FeedbackScore
     feedback_text: str
     suggestions: List[str] = []
+    source: str = "ai"  # "ai" or "local" (scored by the local scoring engine)
 
 class PostFeedbackCreate(PostFeedbackBase):
     pass
@@ -240,6 +256,12 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[str] = None
+    profile_id: Optional[str] = None
+    role: UserRole = UserRole.CREATOR
+    is_active: bool = True
+    token_version: int = 0
+    expires_at: Optional[int] = None
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -265,4 +287,13 @@ class DashboardCharts(BaseModel):
     engagement_evolution: List[ChartDataPoint]
     reach_evolution: List[ChartDataPoint]
 
+class DashboardRange(BaseModel):
+    days: int
+    resolution: str
+
+class DashboardData(BaseModel):
+    stats: DashboardStats
+    charts: DashboardCharts
+    range: DashboardRange
+
 
@@ -0,0 +1,175 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+import redis
+from app.config import settings
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+# Rough prompt size of one post in the analysis prompts, used to estimate sweeps up front
+PROMPT_TOKENS_PER_POST = 300
+
+class BudgetScope(NamedTuple):
+    profile_id: Optional[str]
+    tier: Optional[str]
+    priority: str
+
+class AIBudgetExceeded(Exception):
+    """Raised when an AI call is not admitted by the token budget"""
+
+    def __init__(self, budget: str, retry_after: int):
+        super().__init__(f"AI token budget exceeded ({budget}), retry in {retry_after}s")
+        self.budget = budget
+        self.retry_after = retry_after
+
+_current_scope: ContextVar[Optional[BudgetScope]] = ContextVar("ai_budget_scope", default=None)
+
+class AIBudgetManager:
+    """Daily AI token budget shared by the backend and the worker.
+
+    Prompt and completion tokens are counted in Redis per UTC day globally,
+    per subscription tier and per profile. A call is admitted while the
+    global budget and the profile's tier budget have room for its estimate;
+    background work (sweeps, precomputation) is held to a share of the
+    global budget so interactive requests are not starved.
+
+    The profile, tier and priority of the calls made inside `scope()` are
+    carried in a context variable, so AIService methods need no extra
+    arguments.
+    """
+
+    KEY_PREFIX = "ai_budget:"
+
+    @staticmethod
+    def _day(now: Optional[datetime] = None) -> str:
+        return (now or datetime.utcnow()).strftime("%Y%m%d")
+
+    @staticmethod
+    def _seconds_until_reset() -> int:
+        now = datetime.utcnow()
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(int((tomorrow - now).total_seconds()), 1)
+
+    def _keys(self, scope: Optional[BudgetScope], day: str) -> Dict[str, str]:
+        keys = {"global": f"{self.KEY_PREFIX}{day}:global"}
+        if scope and scope.tier:
+            keys["tier"] = f"{self.KEY_PREFIX}{day}:tier:{scope.tier}"
+        if scope and scope.profile_id:
+            keys["profile"] = f"{self.KEY_PREFIX}{day}:profile:{scope.profile_id}"
+        return keys
+
+    @contextmanager
+    def scope(
+        self,
+        profile_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE
+    ) -> Iterator[BudgetScope]:
+        """Attribute the AI calls made inside the block to a profile and tier"""
+        budget_scope = BudgetScope(str(profile_id) if profile_id else None, tier, priority)
+        token = _current_scope.set(budget_scope)
+        try:
+            yield budget_scope
+        finally:
+            _current_scope.reset(token)
+
+    def current_scope(self) -> Optional[BudgetScope]:
+        return _current_scope.get()
+
+    @staticmethod
+    def estimate_post_analyses(count: int) -> int:
+        """Token estimate for analyzing `count` posts"""
+        return count * (PROMPT_TOKENS_PER_POST + settings.ai_batch_max_tokens_per_post)
+
+    def check(self, estimated_tokens: int, scope: Optional[BudgetScope] = None) -> Optional[AIBudgetExceeded]:
+        """Return None if a call of `estimated_tokens` is admitted, else the reason it is deferred"""
+        if not settings.ai_budget_enabled:
+            return None
+
+        scope = scope or self.current_scope()
+        keys = self._keys(scope, self._day())
+
+        global_limit = settings.ai_daily_token_budget
+        if scope and scope.priority == PRIORITY_BACKGROUND:
+            global_limit = int(global_limit * settings.ai_background_budget_share)
+        profile_limit = settings.ai_profile_daily_token_budget.get(scope.tier) if scope and scope.tier else None
+
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hget(keys["global"], "total_tokens")
+            if "profile" in keys:
+                pipe.hget(keys["profile"], "total_tokens")
+            used = [int(value or 0) for value in pipe.execute()]
+        except redis.RedisError as e:
+            # Fail open: accounting problems must not take the AI features down
+            logger.warning(f"AI budget unavailable, admitting call: {e}")
+            return None
+
+        if used[0] + estimated_tokens > global_limit:
+            return AIBudgetExceeded("global", self._seconds_until_reset())
+        if profile_limit is not None and len(used) > 1 and used[1] + estimated_tokens > profile_limit:
+            return AIBudgetExceeded(f"profile:{scope.tier}", self._seconds_until_reset())
+        return None
+
+    def admit(self, estimated_tokens: int, scope: Optional[BudgetScope] = None):
+        """Raise AIBudgetExceeded unless a call of `estimated_tokens` is admitted"""
+        exceeded = self.check(estimated_tokens, scope)
+        if exceeded:
+            raise exceeded
+
+    def record(self, prompt_tokens: int, completion_tokens: int, scope: Optional[BudgetScope] = None):
+        """Account the tokens used by a call"""
+        scope = scope or self.current_scope()
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for key in self._keys(scope, self._day()).values():
+                pipe.hincrby(key, "prompt_tokens", prompt_tokens)
+                pipe.hincrby(key, "completion_tokens", completion_tokens)
+                pipe.hincrby(key, "total_tokens", prompt_tokens + completion_tokens)
+                pipe.hincrby(key, "requests", 1)
+                pipe.expire(key, 2 * 24 * 3600)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"AI token usage not recorded: {e}")
+
+    def usage(self, profile_id: Optional[str] = None, tier: Optional[str] = None) -> Dict[str, Any]:
+        """Today's token usage and limits, globally, per tier and for a profile"""
+        day = self._day()
+
+        def read(key: str) -> Dict[str, int]:
+            counters = get_redis().hgetall(key)
+            return {
+                field: int(counters.get(field, 0))
+                for field in ("prompt_tokens", "completion_tokens", "total_tokens", "requests")
+            }
+
+        try:
+            stats: Dict[str, Any] = {
+                "day": day,
+                "resets_in": self._seconds_until_reset(),
+                "global": {**read(f"{self.KEY_PREFIX}{day}:global"), "limit": settings.ai_daily_token_budget},
+                "tiers": {
+                    tier_name: read(f"{self.KEY_PREFIX}{day}:tier:{tier_name}")
+                    for tier_name in settings.ai_profile_daily_token_budget
+                }
+            }
+            if profile_id:
+                stats["profile"] = {
+                    **read(f"{self.KEY_PREFIX}{day}:profile:{profile_id}"),
+                    "tier": tier,
+                    "limit": settings.ai_profile_daily_token_budget.get(tier) if tier else None
+                }
+            return stats
+
+        except redis.RedisError as e:
+            logger.warning(f"AI usage stats unavailable: {e}")
+            return {}
+
+# Global instance
+ai_budget = AIBudgetManager()
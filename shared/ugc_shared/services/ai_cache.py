@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import math
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+import redis
+from app.config import settings
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+class AICache:
+    """Content-addressed Redis cache for AI analyses.
+
+    Entries are keyed by a hash of the normalized prompt inputs and model
+    parameters, expire after a TTL, and the least recently used entries are
+    evicted once the cache grows past `ai_cache_max_entries`.
+    """
+
+    KEY_PREFIX = "ai_cache:entry:"
+    LRU_KEY = "ai_cache:lru"  # Sorted set of entry keys scored by last access time
+    STATS_KEY = "ai_cache:stats"
+
+    @staticmethod
+    def normalize_text(text: Optional[str]) -> str:
+        """Normalize free text so trivially different captions share a key"""
+        text = unicodedata.normalize("NFKC", text or "")
+        return " ".join(text.split()).casefold()
+
+    @staticmethod
+    def engagement_bucket(engagement_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """Bucket engagement counts on a log2 scale (0, 1, 2-3, 4-7, ...)"""
+        if not engagement_data:
+            return None
+        return {
+            metric: int(math.log2(max(int(engagement_data.get(metric) or 0), 0) + 1))
+            for metric in ("likes", "comments", "shares", "saved", "reach")
+        }
+
+    def make_key(self, kind: str, inputs: Dict[str, Any], params: Dict[str, Any]) -> str:
+        """Build the cache key for a prompt from its inputs and model parameters"""
+        payload = json.dumps(
+            {"kind": kind, "inputs": inputs, "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return f"{self.KEY_PREFIX}{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        if not settings.ai_cache_enabled:
+            return None
+
+        try:
+            client = get_redis()
+            value = client.get(key)
+            pipe = client.pipeline(transaction=False)
+            if value is None:
+                pipe.hincrby(self.STATS_KEY, "misses", 1)
+            else:
+                pipe.hincrby(self.STATS_KEY, "hits", 1)
+                pipe.zadd(self.LRU_KEY, {key: time.time()}, xx=True)
+            pipe.execute()
+            return json.loads(value) if value is not None else None
+
+        except (redis.RedisError, ValueError) as e:
+            logger.warning(f"AI cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Store a value and evict the least recently used entries over the size bound"""
+        if not settings.ai_cache_enabled:
+            return
+
+        try:
+            client = get_redis()
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, json.dumps(value, default=str), ex=ttl or settings.ai_cache_ttl_seconds)
+            pipe.zadd(self.LRU_KEY, {key: time.time()})
+            pipe.zcard(self.LRU_KEY)
+            size = pipe.execute()[-1]
+
+            overflow = size - settings.ai_cache_max_entries
+            if overflow > 0:
+                evicted = [member for member, _ in client.zpopmin(self.LRU_KEY, overflow)]
+                if evicted:
+                    client.delete(*evicted)
+                    client.hincrby(self.STATS_KEY, "evictions", len(evicted))
+
+        except (redis.RedisError, TypeError) as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and size statistics"""
+        try:
+            client = get_redis()
+            counters = client.hgetall(self.STATS_KEY)
+            hits = int(counters.get("hits", 0))
+            misses = int(counters.get("misses", 0))
+            lookups = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "evictions": int(counters.get("evictions", 0)),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": client.zcard(self.LRU_KEY),
+                "max_entries": settings.ai_cache_max_entries
+            }
+
+        except redis.RedisError as e:
+            logger.warning(f"AI cache stats unavailable: {e}")
+            return {}
+
+# Global instance
+ai_cache = AICache()
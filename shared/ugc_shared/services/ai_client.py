@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+from app.config import settings
+from ugc_shared.services.ai_budget import ai_budget
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: transient network failures, 429s and 5xx responses
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+
+class TokenBucket:
+    """Token bucket refilled continuously at `capacity_per_minute` units per minute.
+
+    Reservations are taken up front (the balance may go negative), so waiters are
+    served in arrival order and no asyncio primitive is bound to a specific loop.
+    """
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(max(capacity_per_minute, 1))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Reserve `amount` units and return how many seconds to wait before using them"""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until `amount` units are available"""
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AsyncAIClient:
+    """Shared async OpenAI client with bounded concurrency, RPM/TPM limiting and retries"""
+
+    def __init__(self):
+        self.request_bucket = TokenBucket(settings.openai_rpm_limit)
+        self.token_bucket = TokenBucket(settings.openai_tpm_limit)
+        # The HTTP pool and the semaphore belong to the event loop that created them;
+        # the worker runs each task in a fresh loop, so keep one set per loop.
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+    def _get_state(self) -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.openai_max_connections,
+                    max_keepalive_connections=settings.openai_max_connections
+                ),
+                timeout=settings.openai_timeout_seconds
+            )
+            client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
+                http_client=http_client,
+                max_retries=0  # Retries are handled here, with jitter and rate limiting
+            )
+            state = (client, asyncio.Semaphore(settings.openai_max_concurrency))
+            self._loop_state[loop] = state
+        return state
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Rough token estimate (~4 characters per token) used for TPM limiting"""
+        prompt_chars = sum(len(message.get("content") or "") for message in messages)
+        return prompt_chars // 4 + max_tokens
+
+    @staticmethod
+    def _backoff_delay(attempt: int, error: Exception) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After when present"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, 0.5)
+            except ValueError:
+                pass
+        ceiling = min(settings.openai_retry_max_delay, settings.openai_retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        **kwargs: Any
+    ) -> Any:
+        """Run a chat completion through the shared pool.
+
+        Raises AIBudgetExceeded when the token budget does not admit the call.
+        """
+        client, semaphore = self._get_state()
+        estimated_tokens = self.estimate_tokens(messages, max_tokens)
+        ai_budget.admit(estimated_tokens)
+
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model=settings.openai_model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        **kwargs
+                    )
+                if response.usage:
+                    ai_budget.record(response.usage.prompt_tokens, response.usage.completion_tokens)
+                return response
+            except RETRYABLE_ERRORS as e:
+                if attempt >= settings.openai_max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                logger.warning(f"OpenAI request failed ({e.__class__.__name__}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def chat_text(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        **kwargs: Any
+    ) -> str:
+        """Run a chat completion and return the stripped text of the first choice"""
+        response = await self.chat(messages, max_tokens=max_tokens, temperature=temperature, **kwargs)
+        return (response.choices[0].message.content or "").strip()
+
+    async def chat_structured(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        function: Dict[str, Any]
+    ) -> str:
+        """Run a chat completion constrained to the JSON schema of `function`.
+
+        Depending on `ai_structured_output` the model is forced to call the
+        function (its arguments are returned) or asked for a JSON object.
+        """
+        mode = settings.ai_structured_output
+        if mode == "function":
+            response = await self.chat(
+                messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                tools=[{"type": "function", "function": function}],
+                tool_choice={"type": "function", "function": {"name": function["name"]}}
+            )
+            message = response.choices[0].message
+            if message.tool_calls:
+                return message.tool_calls[0].function.arguments
+            return (message.content or "").strip()
+
+        if mode == "json_object":
+            return await self.chat_text(
+                messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format={"type": "json_object"}
+            )
+
+        return await self.chat_text(messages, max_tokens=max_tokens, temperature=temperature)
+
+    async def stream_text(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream the text deltas of a chat completion.
+
+        Opening the stream is retried like `chat`; once the first chunk has
+        been received errors are raised to the caller.
+        """
+        client, semaphore = self._get_state()
+        estimated_tokens = self.estimate_tokens(messages, max_tokens)
+        ai_budget.admit(estimated_tokens)
+
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            await semaphore.acquire()
+            try:
+                stream = await client.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    **kwargs
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                semaphore.release()
+                if attempt >= settings.openai_max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                logger.warning(f"OpenAI stream failed to open ({e.__class__.__name__}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except BaseException:
+                semaphore.release()
+                raise
+
+        # Streamed responses carry no usage, so account an estimate from the text length
+        completion_chars = 0
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    completion_chars += len(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        finally:
+            semaphore.release()
+            ai_budget.record(estimated_tokens - max_tokens, completion_chars // 4)
+
+    async def aclose(self):
+        """Close the HTTP pool bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.pop(loop, None)
+        if state is not None:
+            await state[0].close()
+
+# Global instance
+ai_client = AsyncAIClient()
@@ -0,0 +1,188 @@
+import logging
+import re
+from typing import Annotated, Any, Dict, List, Optional, Union
+import redis
+from pydantic import AfterValidator, BaseModel, BeforeValidator, TypeAdapter, ValidationError
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Output shapes expected from the model
+
+Score = Annotated[float, AfterValidator(lambda value: min(max(value, 0.0), 1.0))]
+Text = Annotated[str, BeforeValidator(lambda value: value if isinstance(value, str) else str(value))]
+
+class PostAnalysisScores(BaseModel):
+    overall: Score
+    content_quality: Score
+    engagement_potential: Score
+    visual_appeal: Score
+
+class PostAnalysis(BaseModel):
+    scores: PostAnalysisScores
+    feedback_text: str
+    suggestions: List[Text] = []
+
+class PostAnalysisItem(PostAnalysis):
+    post_id: str
+
+class PostAnalysisBatch(BaseModel):
+    posts: List[Dict[str, Any]]  # Items are validated one by one so a bad item does not sink the batch
+
+class StreamedPostScores(BaseModel):
+    scores: PostAnalysisScores
+    suggestions: List[Text] = []
+
+class AudienceInsights(BaseModel):
+    audience_profile: str
+    best_posting_times: List[Text] = []
+    top_content_types: List[Text] = []
+    growth_opportunities: List[Text] = []
+    strategic_recommendations: List[Text] = []
+
+# Validators are compiled once at import time
+POST_ANALYSIS_ADAPTER = TypeAdapter(PostAnalysis)
+POST_ANALYSIS_ITEM_ADAPTER = TypeAdapter(PostAnalysisItem)
+POST_ANALYSIS_BATCH_ADAPTER = TypeAdapter(Union[PostAnalysisBatch, List[Dict[str, Any]]])  # Bare arrays when not using function calling
+STREAMED_POST_SCORES_ADAPTER = TypeAdapter(StreamedPostScores)
+AUDIENCE_INSIGHTS_ADAPTER = TypeAdapter(AudienceInsights)
+
+def output_function(name: str, description: str, model: type) -> Dict[str, Any]:
+    """Function definition used to request output matching `model`'s JSON schema"""
+    return {
+        "name": name,
+        "description": description,
+        "parameters": model.model_json_schema()
+    }
+
+POST_ANALYSIS_FUNCTION = output_function(
+    "submit_post_analysis",
+    "Registra a análise de um post",
+    PostAnalysis
+)
+POST_ANALYSIS_BATCH_FUNCTION = {
+    "name": "submit_post_analyses",
+    "description": "Registra a análise de cada post, na mesma ordem",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "posts": {"type": "array", "items": PostAnalysisItem.model_json_schema()}
+        },
+        "required": ["posts"]
+    }
+}
+AUDIENCE_INSIGHTS_FUNCTION = output_function(
+    "submit_audience_insights",
+    "Registra os insights sobre a audiência",
+    AudienceInsights
+)
+
+_CODE_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+class AIOutputParser:
+    """Validates model output against the expected shapes.
+
+    Text that is not valid JSON gets one repair pass (code fences, prose
+    around the JSON, trailing commas, truncated closing brackets) before it
+    is rejected. Outcomes are counted per output kind in Redis.
+    """
+
+    STATS_KEY = "ai_parse:stats"
+
+    @staticmethod
+    def repair_json(text: str) -> Optional[str]:
+        """Best-effort fix of near-valid JSON, or None if nothing JSON-like is found"""
+        text = _CODE_FENCE.sub("", text.strip())
+
+        starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+        if not starts:
+            return None
+        text = text[min(starts):]
+
+        # Walk the text tracking open brackets, cutting anything after the
+        # top-level value closes and closing whatever a truncated reply left open
+        stack = []
+        in_string = escaped = False
+        end = len(text)
+        for index, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if stack:
+                    stack.pop()
+                if not stack:
+                    end = index + 1
+                    break
+
+        text = text[:end]
+        if in_string:
+            text += '"'
+        text = text.rstrip().rstrip(",") + "".join(reversed(stack))
+        return _TRAILING_COMMA.sub(r"\1", text)
+
+    def parse(self, kind: str, text: Optional[str], adapter: TypeAdapter) -> Optional[Any]:
+        """Validate `text` with `adapter`, trying a repair pass on failure"""
+        if not text:
+            self._count(kind, "failed")
+            return None
+
+        try:
+            value = adapter.validate_json(text)
+            self._count(kind, "ok")
+            return value
+        except ValidationError:
+            pass
+
+        repaired = self.repair_json(text)
+        if repaired is not None and repaired != text:
+            try:
+                value = adapter.validate_json(repaired)
+                self._count(kind, "repaired")
+                return value
+            except ValidationError:
+                pass
+
+        logger.warning(f"AI output for {kind} failed validation")
+        self._count(kind, "failed")
+        return None
+
+    def validate(self, kind: str, data: Any, adapter: TypeAdapter) -> Optional[Any]:
+        """Validate already decoded data, e.g. a single item of a batch"""
+        try:
+            return adapter.validate_python(data)
+        except ValidationError:
+            self._count(kind, "failed")
+            return None
+
+    def _count(self, kind: str, outcome: str):
+        try:
+            get_redis().hincrby(self.STATS_KEY, f"{kind}:{outcome}", 1)
+        except redis.RedisError as e:
+            logger.debug(f"AI parse counter not updated: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Parse outcome counters grouped by output kind"""
+        try:
+            counters = get_redis().hgetall(self.STATS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"AI parse stats unavailable: {e}")
+            return {}
+
+        stats: Dict[str, Dict[str, int]] = {}
+        for field, count in counters.items():
+            kind, _, outcome = field.rpartition(":")
+            stats.setdefault(kind, {"ok": 0, "repaired": 0, "failed": 0})[outcome] = int(count)
+        return stats
+
+# Global instance
+ai_output_parser = AIOutputParser()
@@ -0,0 +1,707 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+from app.config import settings
+from ugc_shared.models import PostFeedbackCreate, FeedbackScore
+from ugc_shared.services.ai_client import ai_client
+from ugc_shared.services.ai_cache import ai_cache
+from ugc_shared.services.local_scoring import local_scorer
+from ugc_shared.services import analytics
+from ugc_shared.services.ai_parsing import (
+    ai_output_parser,
+    PostAnalysisBatch,
+    AUDIENCE_INSIGHTS_ADAPTER,
+    AUDIENCE_INSIGHTS_FUNCTION,
+    POST_ANALYSIS_ADAPTER,
+    POST_ANALYSIS_BATCH_ADAPTER,
+    POST_ANALYSIS_BATCH_FUNCTION,
+    POST_ANALYSIS_FUNCTION,
+    POST_ANALYSIS_ITEM_ADAPTER,
+    STREAMED_POST_SCORES_ADAPTER,
+)
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+POST_ANALYSIS_SYSTEM_PROMPT = "Você é um especialista em marketing digital e análise de conteúdo UGC."
+
+POST_ANALYSIS_FORMAT = """
+            {
+                "scores": {
+                    "overall": [nota de 0 a 1],
+                    "content_quality": [nota de 0 a 1],
+                    "engagement_potential": [nota de 0 a 1],
+                    "visual_appeal": [nota de 0 a 1]
+                },
+                "feedback_text": "[feedback detalhado em português sobre o post]",
+                "suggestions": [
+                    "[sugestão 1 para melhorar o post]",
+                    "[sugestão 2 para melhorar o post]",
+                    "[sugestão 3 para melhorar o post]"
+                ]
+            }
+"""
+
+POST_ANALYSIS_CRITERIA = """
+            Critérios de avaliação:
+            - overall: Nota geral do post considerando todos os aspectos
+            - content_quality: Qualidade do conteúdo, relevância, originalidade
+            - engagement_potential: Potencial de gerar engajamento (curtidas, comentários, compartilhamentos)
+            - visual_appeal: Atratividade visual e estética (mesmo para posts de texto)
+            
+            O feedback deve ser construtivo, específico e focado em melhorias práticas.
+            As sugestões devem ser acionáveis e relevantes para o nicho do criador.
+"""
+
+SCORE_KEYS = ("overall", "content_quality", "engagement_potential", "visual_appeal")
+
+FALLBACK_POST_SUGGESTIONS = (
+    "Considere adicionar mais elementos visuais ao seu conteúdo",
+    "Use hashtags relevantes para aumentar o alcance",
+    "Inclua uma call-to-action clara no final do post"
+)
+
+# Streamed analyses put the feedback text first and the structured part after this marker
+STREAM_SCORES_MARKER = "###SCORES###"
+
+STREAM_SCORES_FORMAT = """
+            {
+                "scores": {
+                    "overall": [nota de 0 a 1],
+                    "content_quality": [nota de 0 a 1],
+                    "engagement_potential": [nota de 0 a 1],
+                    "visual_appeal": [nota de 0 a 1]
+                },
+                "suggestions": [
+                    "[sugestão 1 para melhorar o post]",
+                    "[sugestão 2 para melhorar o post]",
+                    "[sugestão 3 para melhorar o post]"
+                ]
+            }
+"""
+
+# Bump when the analysis prompts change so cached analyses are not reused
+POST_ANALYSIS_PROMPT_VERSION = 2
+POST_ANALYSIS_TEMPERATURE = 0.7
+
+class AIService:
+    """Service for AI-powered content analysis and feedback"""
+    
+    def __init__(self):
+        if not settings.openai_api_key:
+            logger.warning("OpenAI API key not configured")
+    
+    @staticmethod
+    def _describe_post(
+        caption: str,
+        media_type: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> str:
+        """Describe a single post for the analysis prompts"""
+        description = f"""
+            Tipo de mídia: {media_type}
+            Legenda do post: "{caption}"
+            """
+        
+        if engagement_data:
+            description += f"""
+                Dados de engajamento:
+                - Curtidas: {engagement_data.get("likes", 0)}
+                - Comentários: {engagement_data.get("comments", 0)}
+                - Compartilhamentos: {engagement_data.get("shares", 0)}
+                - Salvamentos: {engagement_data.get("saved", 0)}
+                - Alcance: {engagement_data.get("reach", 0)}
+                """
+        
+        return description
+    
+    @staticmethod
+    def _post_cache_key(
+        caption: str,
+        media_type: str,
+        niche: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> str:
+        """Cache key for a post analysis, built from the normalized prompt inputs"""
+        return ai_cache.make_key(
+            "post_analysis",
+            inputs={
+                "caption": ai_cache.normalize_text(caption),
+                "media_type": (media_type or "").lower(),
+                "niche": (niche or "").lower(),
+                "engagement": ai_cache.engagement_bucket(engagement_data)
+            },
+            params={
+                "model": settings.openai_model,
+                "temperature": POST_ANALYSIS_TEMPERATURE,
+                "version": POST_ANALYSIS_PROMPT_VERSION
+            }
+        )
+    
+    def get_cached_analysis(
+        self,
+        caption: str,
+        media_type: str,
+        niche: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached post analysis without calling the model"""
+        return ai_cache.get(self._post_cache_key(caption, media_type, niche, engagement_data))
+    
+    async def analyze_post_content(
+        self, 
+        caption: str, 
+        media_type: str, 
+        niche: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Analyze post content and generate feedback using AI"""
+        
+        if not settings.openai_api_key:
+            logger.error("OpenAI API key not configured")
+            return None
+        
+        cache_key = self._post_cache_key(caption, media_type, niche, engagement_data)
+        cached_analysis = ai_cache.get(cache_key)
+        if cached_analysis:
+            return cached_analysis
+        
+        try:
+            prompt = f"""
+            Você é um especialista em marketing digital e criação de conteúdo UGC (User Generated Content).
+            Analise o seguinte post de um criador de conteúdo no nicho de {niche}.
+            {self._describe_post(caption, media_type, engagement_data)}
+            
+            Por favor, forneça uma análise detalhada do post seguindo este formato JSON:
+            {POST_ANALYSIS_FORMAT}
+            {POST_ANALYSIS_CRITERIA}
+            """
+            
+            ai_response = await ai_client.chat_structured(
+                messages=[
+                    {"role": "system", "content": POST_ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1000,
+                temperature=POST_ANALYSIS_TEMPERATURE,
+                function=POST_ANALYSIS_FUNCTION
+            )
+            
+            parsed = ai_output_parser.parse("post_analysis", ai_response, POST_ANALYSIS_ADAPTER)
+            if parsed:
+                analysis = parsed.model_dump()
+                ai_cache.set(cache_key, analysis)
+                return analysis
+            else:
+                # If the response does not match the expected shape, create a structured response
+                logger.warning("AI response was not valid JSON, creating fallback response")
+                return {
+                    "scores": {
+                        "overall": 0.7,
+                        "content_quality": 0.7,
+                        "engagement_potential": 0.7,
+                        "visual_appeal": 0.7
+                    },
+                    "feedback_text": ai_response,
+                    "suggestions": list(FALLBACK_POST_SUGGESTIONS)
+                }
+                
+        except Exception as e:
+            logger.error(f"Error analyzing post content: {e}")
+            return None
+    
+    async def stream_post_analysis(
+        self,
+        caption: str,
+        media_type: str,
+        niche: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of analyze_post_content.
+
+        Yields ("delta", text) events while the feedback text is generated and
+        a final ("result", analysis) event with the structured scores. The model
+        writes the feedback as plain text followed by a JSON block after
+        STREAM_SCORES_MARKER, so the text can be forwarded before it finishes.
+        """
+
+        if not settings.openai_api_key:
+            logger.error("OpenAI API key not configured")
+            yield "result", None
+            return
+
+        cache_key = self._post_cache_key(caption, media_type, niche, engagement_data)
+        cached_analysis = ai_cache.get(cache_key)
+        if cached_analysis:
+            yield "delta", cached_analysis.get("feedback_text", "")
+            yield "result", cached_analysis
+            return
+
+        prompt = f"""
+            Você é um especialista em marketing digital e criação de conteúdo UGC (User Generated Content).
+            Analise o seguinte post de um criador de conteúdo no nicho de {niche}.
+            {self._describe_post(caption, media_type, engagement_data)}
+
+            Escreva primeiro o feedback detalhado em português sobre o post, em texto corrido.
+            Depois, em uma nova linha, escreva exatamente {STREAM_SCORES_MARKER} seguido de um JSON neste formato:
+            {STREAM_SCORES_FORMAT}
+            {POST_ANALYSIS_CRITERIA}
+            """
+
+        # Hold back enough characters to never forward a partially received marker
+        holdback = len(STREAM_SCORES_MARKER) - 1
+        response_text = ""
+        forwarded = 0
+        marker_seen = False
+
+        async for delta in ai_client.stream_text(
+            messages=[
+                {"role": "system", "content": POST_ANALYSIS_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1000,
+            temperature=POST_ANALYSIS_TEMPERATURE
+        ):
+            response_text += delta
+            if marker_seen:
+                continue
+
+            marker_index = response_text.find(STREAM_SCORES_MARKER)
+            if marker_index >= 0:
+                marker_seen = True
+                end = marker_index
+            else:
+                end = max(len(response_text) - holdback, forwarded)
+
+            if end > forwarded:
+                yield "delta", response_text[forwarded:end]
+                forwarded = end
+
+        feedback_text, _, scores_text = response_text.partition(STREAM_SCORES_MARKER)
+        if not marker_seen and len(response_text) > forwarded:
+            yield "delta", response_text[forwarded:]
+
+        parsed = ai_output_parser.parse(
+            "post_analysis_stream",
+            scores_text if marker_seen else None,
+            STREAMED_POST_SCORES_ADAPTER
+        )
+
+        if parsed:
+            analysis = {"feedback_text": feedback_text.strip(), **parsed.model_dump()}
+            ai_cache.set(cache_key, analysis)
+        else:
+            logger.warning("Streamed AI response had no valid scores, creating fallback response")
+            analysis = {
+                "scores": {key: 0.7 for key in SCORE_KEYS},
+                "feedback_text": feedback_text.strip(),
+                "suggestions": list(FALLBACK_POST_SUGGESTIONS)
+            }
+
+        yield "result", analysis
+
+    async def generate_content_suggestions(
+        self, 
+        niche: str, 
+        recent_performance: List[Dict[str, Any]],
+        target_audience: Optional[str] = None,
+        post_metrics: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[List[str]]:
+        """Generate content suggestions based on niche and performance data.
+        
+        `post_metrics` (the per-post entries of a metrics record) adds
+        engagement per media type and the best hours to post to the prompt.
+        """
+        
+        if not settings.openai_api_key:
+            logger.error("OpenAI API key not configured")
+            return None
+        
+        try:
+            # Analyze recent performance
+            performance_summary = ""
+            if recent_performance:
+                summary = analytics.performance_summary(recent_performance)
+                performance_summary = f"""
+                Performance recente:
+                - Taxa de engajamento média: {summary["avg_engagement_rate"]:.2f}%
+                - Melhor post teve {summary["best_engagement_rate"]:.2f}% de engajamento
+                - Tipo de conteúdo que mais engaja: {summary["best_media_type"]}
+                """
+            
+            if post_metrics:
+                by_media_type = analytics.engagement_by_media_type(post_metrics)
+                best_hours = analytics.best_posting_hours(post_metrics)
+                performance_summary += f"""
+                Engajamento por alcance, por tipo de mídia: {", ".join(f"{media_type} {rate:.2f}%" for media_type, rate in by_media_type.items())}
+                Horários (UTC) com melhor engajamento: {", ".join(f"{hour:02d}:00" for hour in best_hours) or "N/A"}
+                """
+            
+            audience_context = f"Público-alvo: {target_audience}" if target_audience else ""
+            
+            prompt = f"""
+            Você é um especialista em estratégia de conteúdo para criadores UGC.
+            
+            Nicho do criador: {niche}
+            {audience_context}
+            {performance_summary}
+            
+            Gere 5 sugestões específicas e acionáveis de conteúdo para este criador.
+            As sugestões devem:
+            1. Ser relevantes para o nicho
+            2. Ter potencial de alto engajamento
+            3. Ser práticas e executáveis
+            4. Considerar tendências atuais
+            5. Levar em conta a performance recente
+            
+            Formato: Lista simples, uma sugestão por linha, sem numeração.
+            """
+            
+            suggestions_text = await ai_client.chat_text(
+                messages=[
+                    {"role": "system", "content": "Você é um especialista em estratégia de conteúdo e marketing digital."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.8
+            )
+            
+            # Split into individual suggestions
+            suggestions = [s.strip() for s in suggestions_text.split("\n") if s.strip()]
+            
+            return suggestions[:5]  # Return max 5 suggestions
+            
+        except Exception as e:
+            logger.error(f"Error generating content suggestions: {e}")
+            return None
+    
+    async def analyze_audience_insights(
+        self, 
+        follower_data: Dict[str, Any],
+        engagement_patterns: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Analyze audience data and provide insights"""
+        
+        if not settings.openai_api_key:
+            logger.error("OpenAI API key not configured")
+            return None
+        
+        try:
+            # Prepare data summary
+            data_summary = f"""
+            Dados do público:
+            - Total de seguidores: {follower_data.get("count", 0)}
+            - Crescimento recente: {follower_data.get("growth_rate", 0):.2f}%
+            
+            Padrões de engajamento:
+            """
+            
+            for pattern in engagement_patterns[:5]:  # Limit to 5 recent patterns
+                data_summary += f"- {pattern.get('date', 'N/A')}: {pattern.get('engagement_rate', 0):.2f}% de engajamento\n"
+            
+            prompt = f"""
+            Você é um analista de dados especializado em redes sociais e comportamento de audiência.
+            
+            {data_summary}
+            
+            Com base nesses dados, forneça insights sobre:
+            1. Perfil da audiência
+            2. Melhores horários para postar
+            3. Tipos de conteúdo que mais engajam
+            4. Oportunidades de crescimento
+            5. Recomendações estratégicas
+            
+            Responda em formato JSON:
+            {{
+                "audience_profile": "[descrição do perfil da audiência]",
+                "best_posting_times": ["horário1", "horário2", "horário3"],
+                "top_content_types": ["tipo1", "tipo2", "tipo3"],
+                "growth_opportunities": ["oportunidade1", "oportunidade2"],
+                "strategic_recommendations": ["recomendação1", "recomendação2", "recomendação3"]
+            }}
+            """
+            
+            ai_response = await ai_client.chat_structured(
+                messages=[
+                    {"role": "system", "content": "Você é um analista de dados especializado em redes sociais."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=800,
+                temperature=0.6,
+                function=AUDIENCE_INSIGHTS_FUNCTION
+            )
+            
+            parsed = ai_output_parser.parse("audience_insights", ai_response, AUDIENCE_INSIGHTS_ADAPTER)
+            if parsed:
+                return parsed.model_dump()
+            else:
+                logger.warning("AI response was not valid JSON for audience insights")
+                return {
+                    "audience_profile": "Análise detalhada não disponível no momento",
+                    "best_posting_times": ["09:00", "12:00", "18:00"],
+                    "top_content_types": ["Imagens", "Vídeos", "Carrosséis"],
+                    "growth_opportunities": ["Aumentar frequência de posts", "Usar mais hashtags"],
+                    "strategic_recommendations": ["Foque em conteúdo visual", "Interaja mais com seguidores", "Poste consistentemente"]
+                }
+                
+        except Exception as e:
+            logger.error(f"Error analyzing audience insights: {e}")
+            return None
+    
+    async def analyze_posts_batch(
+        self,
+        posts: List[Dict[str, Any]],
+        niche: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Analyze several posts in a single request.
+        
+        Returns the valid analyses keyed by post_id. Posts missing from the
+        response, or whose item fails validation, are left out so the caller
+        can fall back to a single-post analysis.
+        """
+        
+        if not settings.openai_api_key:
+            logger.error("OpenAI API key not configured")
+            return {}
+        
+        try:
+            posts_description = ""
+            for index, post in enumerate(posts, 1):
+                posts_description += f"""
+            Post {index} (post_id: "{post["post_id"]}"):
+            {self._describe_post(post.get("post_caption", ""), post.get("post_type", "image"), post.get("engagement_data"))}
+            """
+            
+            prompt = f"""
+            Você é um especialista em marketing digital e criação de conteúdo UGC (User Generated Content).
+            Analise os {len(posts)} posts a seguir de um criador de conteúdo no nicho de {niche}.
+            {posts_description}
+            
+            Responda apenas com um array JSON contendo um objeto por post, na mesma ordem,
+            cada objeto com o campo "post_id" do post analisado e seguindo este formato:
+            {POST_ANALYSIS_FORMAT}
+            {POST_ANALYSIS_CRITERIA}
+            """
+            
+            ai_response = await ai_client.chat_structured(
+                messages=[
+                    {"role": "system", "content": POST_ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=settings.ai_batch_max_tokens_per_post * len(posts),
+                temperature=POST_ANALYSIS_TEMPERATURE,
+                function=POST_ANALYSIS_BATCH_FUNCTION
+            )
+            
+            parsed = ai_output_parser.parse("post_analysis_batch", ai_response, POST_ANALYSIS_BATCH_ADAPTER)
+            if parsed is None:
+                logger.warning("Batched AI response was not valid JSON")
+                return {}
+            items = parsed.posts if isinstance(parsed, PostAnalysisBatch) else parsed
+            
+            requested_ids = {post["post_id"] for post in posts}
+            analyses = {}
+            for item in items:
+                analysis = ai_output_parser.validate("post_analysis_batch_item", item, POST_ANALYSIS_ITEM_ADAPTER)
+                if analysis and analysis.post_id in requested_ids:
+                    analyses[analysis.post_id] = analysis.model_dump(exclude={"post_id"})
+            
+            if len(analyses) < len(posts):
+                logger.warning(f"Batched AI analysis returned {len(analyses)} valid items for {len(posts)} posts")
+            
+            return analyses
+            
+        except Exception as e:
+            logger.error(f"Error analyzing posts batch: {e}")
+            return {}
+    
+    @staticmethod
+    def build_post_feedback(
+        profile_id: str,
+        post: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> PostFeedbackCreate:
+        """Turn an analysis dict into a PostFeedbackCreate record"""
+        
+        # Create feedback scores
+        scores = FeedbackScore(
+            overall=analysis["scores"].get("overall", 0.5),
+            content_quality=analysis["scores"].get("content_quality", 0.5),
+            engagement_potential=analysis["scores"].get("engagement_potential", 0.5),
+            visual_appeal=analysis["scores"].get("visual_appeal", 0.5)
+        )
+        
+        # Create post feedback
+        # Comentário: profile_id é convertido para ObjectId aqui para corresponder ao tipo PyObjectId no modelo.
+        return PostFeedbackCreate(
+            profile_id=ObjectId(profile_id),
+            post_id=post["post_id"],
+            post_url=post.get("post_url", ""),
+            post_caption=post.get("post_caption", ""),
+            post_type=post.get("post_type", "image"),
+            scores=scores,
+            feedback_text=analysis.get("feedback_text", ""),
+            suggestions=analysis.get("suggestions", []),
+            source=analysis.get("source", "ai")
+        )
+    
+    async def create_post_feedback(
+        self,
+        profile_id: str,
+        post_id: str,
+        post_url: str,
+        post_caption: str,
+        post_type: str,
+        niche: str,
+        engagement_data: Optional[Dict[str, int]] = None
+    ) -> Optional[PostFeedbackCreate]:
+        """Create comprehensive post feedback using AI analysis"""
+        
+        try:
+            # Get AI analysis
+            analysis = await self.analyze_post_content(
+                caption=post_caption,
+                media_type=post_type,
+                niche=niche,
+                engagement_data=engagement_data
+            )
+            
+            if not analysis:
+                logger.error("Failed to get AI analysis for post")
+                return None
+            
+            return self.build_post_feedback(
+                profile_id,
+                {
+                    "post_id": post_id,
+                    "post_url": post_url,
+                    "post_caption": post_caption,
+                    "post_type": post_type
+                },
+                analysis
+            )
+            
+        except Exception as e:
+            logger.error(f"Error creating post feedback: {e}")
+            return None
+    
+    async def create_posts_feedback(
+        self,
+        profile_id: str,
+        niche: str,
+        posts: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> List[Optional[PostFeedbackCreate]]:
+        """Create feedback for several posts.
+        
+        Each post is a dict with post_id, post_url, post_caption, post_type and
+        optionally engagement_data. Posts are scored `batch_size` at a time in a
+        single request, batches run concurrently, and posts a batch could not
+        score fall back to a single-post analysis. Results keep the order of
+        `posts`; failed analyses are returned as None.
+        """
+        
+        batch_size = batch_size or settings.ai_batch_size
+        
+        async def analyze_chunk(chunk: List[Dict[str, Any]]) -> List[Optional[PostFeedbackCreate]]:
+            analyses = await self.analyze_posts_batch(chunk, niche) if len(chunk) > 1 else {}
+            for post in chunk:
+                if post["post_id"] in analyses:
+                    ai_cache.set(post["cache_key"], analyses[post["post_id"]])
+            
+            results = []
+            for post in chunk:
+                analysis = analyses.get(post["post_id"])
+                if analysis:
+                    results.append(self.build_post_feedback(profile_id, post, analysis))
+                else:
+                    results.append(await self.create_post_feedback(
+                        profile_id=profile_id,
+                        post_id=post["post_id"],
+                        post_url=post.get("post_url", ""),
+                        post_caption=post.get("post_caption", ""),
+                        post_type=post.get("post_type", "image"),
+                        niche=niche,
+                        engagement_data=post.get("engagement_data")
+                    ))
+            return results
+        
+        # Serve what we can from the cache and only send the rest to the model
+        feedbacks: Dict[str, Optional[PostFeedbackCreate]] = {}
+        uncached_posts = []
+        for post in posts:
+            cache_key = self._post_cache_key(
+                post.get("post_caption", ""),
+                post.get("post_type", "image"),
+                niche,
+                post.get("engagement_data")
+            )
+            cached_analysis = ai_cache.get(cache_key)
+            if cached_analysis:
+                feedbacks[post["post_id"]] = self.build_post_feedback(profile_id, post, cached_analysis)
+            else:
+                uncached_posts.append({**post, "cache_key": cache_key})
+        
+        chunks = [uncached_posts[i:i + batch_size] for i in range(0, len(uncached_posts), batch_size)]
+        chunk_results = await asyncio.gather(*[analyze_chunk(chunk) for chunk in chunks])
+        for chunk, results in zip(chunks, chunk_results):
+            for post, feedback in zip(chunk, results):
+                feedbacks[post["post_id"]] = feedback
+        
+        return [feedbacks.get(post["post_id"]) for post in posts]
+    
+    async def create_posts_feedback_local_first(
+        self,
+        profile_id: str,
+        niche: str,
+        posts: List[Dict[str, Any]],
+        baseline_engagement_rate: Optional[float] = None,
+        llm_max_posts: Optional[int] = None
+    ) -> List[Optional[PostFeedbackCreate]]:
+        """Create feedback for several posts, scoring them locally first.
+        
+        Every post is scored by the local engine; up to `llm_max_posts` of
+        the lowest scoring ones get a full AI analysis instead, and keep the
+        local feedback if that fails. Results keep the order of `posts`.
+        """
+        
+        if llm_max_posts is None:
+            llm_max_posts = settings.ai_sweep_llm_max_posts
+        
+        local_analyses = local_scorer.analyze(posts, baseline_engagement_rate)
+        selected = local_scorer.select_for_llm(
+            local_analyses,
+            max_posts=llm_max_posts if settings.openai_api_key else 0,
+            threshold=settings.ai_sweep_llm_score_threshold
+        )
+        
+        ai_feedbacks = await self.create_posts_feedback(
+            profile_id=profile_id,
+            niche=niche,
+            posts=[posts[index] for index in selected]
+        ) if selected else []
+        
+        feedbacks = [
+            self.build_post_feedback(profile_id, post, analysis)
+            for post, analysis in zip(posts, local_analyses)
+        ]
+        for index, feedback in zip(selected, ai_feedbacks):
+            if feedback:
+                feedbacks[index] = feedback
+        
+        logger.info(f"Scored {len(posts)} posts locally, {len(selected)} sent to AI analysis")
+        return feedbacks
+    
+    async def aclose(self):
+        """Release the HTTP pool held for the current event loop"""
+        await ai_client.aclose()
+
+# Global instance
+ai_service = AIService()
+
+# Comentário: Nenhuma alteração direta foi necessária neste arquivo para compatibilidade com Pydantic v2,
+# pois ele utiliza modelos que já foram atualizados em `app/models.py` e a instanciação de modelos
+# a partir de dados do banco de dados funciona de forma compatível com Pydantic v2.
+# A única alteração foi na formatação de f-strings para usar aspas duplas de forma consistente.
+
+
@@ -0,0 +1,185 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCORE_KEYS = ("overall", "content_quality", "engagement_potential", "visual_appeal")
+INTERACTION_KEYS = ("likes", "comments", "shares", "saved")
+
+def _to_datetime64(values: Sequence[Any]) -> np.ndarray:
+    """Convert datetimes or Instagram ISO timestamps ("2024-01-31T18:00:00+0000") to datetime64[s]"""
+    return np.array(
+        [value if isinstance(value, datetime) else str(value)[:19] for value in values],
+        dtype="datetime64[s]"
+    )
+
+def growth_rate(current: float, previous: float) -> float:
+    """Growth percentage from `previous` to `current`, 0 when there is no previous value"""
+    if not previous:
+        return 0.0
+    return ((current - previous) / previous) * 100
+
+def engagement_rate(interactions: float, followers: float, posts: int = 1) -> float:
+    """Average interactions per post as a percentage of followers"""
+    if followers <= 0 or posts <= 0:
+        return 0.0
+    return (interactions / (followers * posts)) * 100
+
+class MetricsHistory:
+    """A profile's metrics documents loaded once into NumPy arrays, oldest first"""
+
+    FIELDS = ("followers_count", "avg_engagement_rate", "total_likes", "total_comments", "total_reach", "posts_count")
+
+    def __init__(self, dates: np.ndarray, values: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.values = values
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[Dict[str, Any]]) -> "MetricsHistory":
+        """Build the history from metrics documents in any order"""
+        dates = _to_datetime64([document["date"] for document in documents])
+        order = np.argsort(dates, kind="stable")
+        values = {
+            field: np.array([document.get(field) or 0 for document in documents], dtype=float)[order]
+            for field in cls.FIELDS
+        }
+        return cls(dates[order], values)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def latest(self, field: str) -> float:
+        return float(self.values[field][-1]) if len(self) else 0.0
+
+    def value_at(self, field: str, when: datetime) -> Optional[float]:
+        """Last value recorded at or before `when`"""
+        index = np.searchsorted(self.dates, np.datetime64(when, "s"), side="right") - 1
+        return float(self.values[field][index]) if index >= 0 else None
+
+    def growth(self, field: str, since: Optional[datetime] = None) -> float:
+        """Growth percentage of `field` from `since` (or the first record) to the latest record"""
+        if not len(self):
+            return 0.0
+        previous = self.value_at(field, since) if since else float(self.values[field][0])
+        return growth_rate(self.latest(field), previous or 0.0)
+
+    def rolling_mean(self, field: str, window: int) -> np.ndarray:
+        """Trailing moving average over `window` records (shorter at the start)"""
+        values = self.values[field]
+        if not len(values):
+            return values
+        cumulative = np.cumsum(np.insert(values, 0, 0.0))
+        counts = np.minimum(np.arange(1, len(values) + 1), window)
+        return (cumulative[1:] - cumulative[np.arange(len(values)) + 1 - counts]) / counts
+
+    def resample(self, field: str, unit: str = "D") -> Dict[str, np.ndarray]:
+        """Last value of `field` per calendar unit ("h", "D", "W" or "M")"""
+        if not len(self):
+            return {"dates": self.dates, "values": self.values[field]}
+        buckets = self.dates.astype(f"datetime64[{unit}]")
+        # Index of the last record in each bucket
+        last = np.flatnonzero(np.append(buckets[1:] != buckets[:-1], True))
+        return {"dates": buckets[last], "values": self.values[field][last]}
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept when downsampling a series to `threshold` points.
+
+    Largest-Triangle-Three-Buckets: keeps the first and last points and, in
+    each bucket in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket, which
+    preserves peaks and dips that plain averaging would flatten.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (count - 1, count)
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+def post_interactions(post_metrics: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Matrix of likes, comments, shares and saved per post"""
+    return np.array(
+        [[post.get(key) or 0 for key in INTERACTION_KEYS] for post in post_metrics],
+        dtype=float
+    ).reshape(len(post_metrics), len(INTERACTION_KEYS))
+
+def reach_engagement_rates(post_metrics: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Interactions per reach (%) for each post, NaN where reach is unknown"""
+    interactions = post_interactions(post_metrics).sum(axis=1)
+    reach = np.array([post.get("reach") or 0 for post in post_metrics], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(reach > 0, interactions / reach * 100, np.nan)
+
+def summarize_post_metrics(post_metrics: Sequence[Dict[str, Any]], followers: float) -> Dict[str, float]:
+    """Totals over a set of posts and their average engagement rate over followers"""
+    interactions = post_interactions(post_metrics)
+    totals = interactions.sum(axis=0)
+    reach = float(sum(post.get("reach") or 0 for post in post_metrics))
+    return {
+        "total_likes": int(totals[0]),
+        "total_comments": int(totals[1]),
+        "total_reach": int(reach),
+        "avg_engagement_rate": engagement_rate(totals[0] + totals[1], followers, len(post_metrics))
+    }
+
+def best_posting_hours(post_metrics: Sequence[Dict[str, Any]], top: int = 3) -> List[int]:
+    """UTC hours whose posts had the highest mean engagement per reach"""
+    posts = [post for post in post_metrics if post.get("timestamp")]
+    if not posts:
+        return []
+    hours = _to_datetime64([post["timestamp"] for post in posts]).astype("datetime64[h]").astype(np.int64) % 24
+    rates = np.nan_to_num(reach_engagement_rates(posts))
+    totals = np.bincount(hours, weights=rates, minlength=24)
+    counts = np.bincount(hours, minlength=24)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, totals / counts, -1.0)
+    ranked = np.argsort(-means, kind="stable")
+    return [int(hour) for hour in ranked[:top] if means[hour] >= 0]
+
+def engagement_by_media_type(post_metrics: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Mean engagement per reach (%) for each media type, best first"""
+    if not post_metrics:
+        return {}
+    media_types = np.array([(post.get("media_type") or "unknown").lower() for post in post_metrics])
+    rates = np.nan_to_num(reach_engagement_rates(post_metrics))
+    names, inverse = np.unique(media_types, return_inverse=True)
+    means = np.bincount(inverse, weights=rates) / np.bincount(inverse)
+    order = np.argsort(-means, kind="stable")
+    return {str(names[index]): round(float(means[index]), 2) for index in order}
+
+def average_scores(feedback: Sequence[Dict[str, Any]], scale: float = 1.0) -> Dict[str, float]:
+    """Mean of each feedback score, multiplied by `scale`"""
+    if not feedback:
+        return {key: 0 for key in SCORE_KEYS}
+    scores = np.array(
+        [[(item.get("scores") or {}).get(key, 0) for key in SCORE_KEYS] for item in feedback],
+        dtype=float
+    )
+    return {key: float(value) for key, value in zip(SCORE_KEYS, scores.mean(axis=0) * scale)}
+
+def performance_summary(recent_performance: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Average and best engagement of recent posts or metrics records"""
+    rates = np.array([item.get("engagement_rate") or 0 for item in recent_performance], dtype=float)
+    if not len(rates):
+        return {}
+    best = int(np.argmax(rates))
+    return {
+        "avg_engagement_rate": float(rates.mean()),
+        "best_engagement_rate": float(rates[best]),
+        "best_media_type": recent_performance[best].get("media_type", "N/A")
+    }
@@ -0,0 +1,142 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.database import get_database
+
+logger = logging.getLogger(__name__)
+
+SCORE_KEYS = ("overall", "content_quality", "engagement_potential", "visual_appeal")
+
+class FeedbackStatsService:
+    """Running per-profile aggregates of post feedback scores.
+
+    One `feedback_stats` document per profile holds the feedback count and,
+    for each score, its sum, min and max. Every feedback insert updates it
+    with a single atomic $inc/$min/$max, so the summary is one document
+    read instead of a $group over all of the profile's feedback. Profiles
+    without a stats document (created before it existed) are rebuilt from
+    `posts_feedback` on first use, and `reconcile` rebuilds any document
+    that drifted from the collection.
+
+    Stats are keyed by the profile's ObjectId; methods also accept the id
+    as a string, as model_dump() leaves it in older feedback documents.
+    """
+
+    @staticmethod
+    def _scores(feedback: Dict[str, Any]) -> Dict[str, float]:
+        scores = feedback.get("scores") or {}
+        return {key: float(scores.get(key) or 0.0) for key in SCORE_KEYS}
+
+    def record(self, feedback: Dict[str, Any]):
+        """Add an inserted feedback document to its profile's aggregates"""
+        db = get_database()
+        profile_id = ObjectId(feedback["profile_id"])
+        scores = self._scores(feedback)
+
+        try:
+            result = db.feedback_stats.update_one(
+                {"profile_id": profile_id},
+                {
+                    "$inc": {"count": 1, **{f"sum.{key}": value for key, value in scores.items()}},
+                    "$min": {f"min.{key}": value for key, value in scores.items()},
+                    "$max": {f"max.{key}": value for key, value in scores.items()},
+                    "$set": {"updated_at": datetime.utcnow()}
+                }
+            )
+            if not result.matched_count:
+                # No running aggregates yet: build them from the collection, which already holds this feedback
+                self.recompute(profile_id)
+
+        except Exception as e:
+            # The summary falls back to recomputing and reconciliation fixes the drift
+            logger.error(f"Error updating feedback stats for profile {profile_id}: {e}")
+
+    def _aggregate(self, profile_id: ObjectId) -> Dict[str, Any]:
+        """A profile's aggregates computed from `posts_feedback`"""
+        db = get_database()
+        group: Dict[str, Any] = {"_id": None, "count": {"$sum": 1}}
+        for key in SCORE_KEYS:
+            group[f"sum_{key}"] = {"$sum": f"$scores.{key}"}
+            group[f"min_{key}"] = {"$min": f"$scores.{key}"}
+            group[f"max_{key}"] = {"$max": f"$scores.{key}"}
+
+        # Feedback inserted before profile ids were stored as ObjectIds holds them as strings
+        match = {"profile_id": {"$in": [profile_id, str(profile_id)]}}
+        result = list(db.posts_feedback.aggregate([{"$match": match}, {"$group": group}]))
+        totals = result[0] if result else {"count": 0}
+
+        stats = {
+            "profile_id": profile_id,
+            "count": totals["count"],
+            "sum": {key: float(totals.get(f"sum_{key}") or 0.0) for key in SCORE_KEYS},
+            "min": {key: float(totals.get(f"min_{key}") or 0.0) for key in SCORE_KEYS},
+            "max": {key: float(totals.get(f"max_{key}") or 0.0) for key in SCORE_KEYS},
+            "updated_at": datetime.utcnow()
+        }
+        if not stats["count"]:
+            # Let the first $min/$max of a new profile set the bounds
+            del stats["min"], stats["max"]
+        return stats
+
+    def _store(self, stats: Dict[str, Any]):
+        db = get_database()
+        profile_id = stats["profile_id"]
+        try:
+            db.feedback_stats.replace_one({"profile_id": profile_id}, stats, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent rebuild created the document first
+            db.feedback_stats.replace_one({"profile_id": profile_id}, stats)
+
+    def recompute(self, profile_id: ObjectId) -> Dict[str, Any]:
+        """Rebuild a profile's aggregates from `posts_feedback`"""
+        stats = self._aggregate(ObjectId(profile_id))
+        self._store(stats)
+        return stats
+
+    def get(self, profile_id: ObjectId) -> Dict[str, Any]:
+        """A profile's aggregates, rebuilt if missing"""
+        profile_id = ObjectId(profile_id)
+        stats = get_database().feedback_stats.find_one({"profile_id": profile_id}, {"_id": 0})
+        return stats or self.recompute(profile_id)
+
+    @staticmethod
+    def summary(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Summary response from a profile's aggregates"""
+        count = stats.get("count", 0)
+        sums = stats.get("sum") or {}
+        return {
+            "total_posts_analyzed": count,
+            "average_scores": {
+                key: round(sums.get(key, 0.0) / count, 2) if count else 0.0
+                for key in SCORE_KEYS
+            },
+            "best_post_score": round((stats.get("max") or {}).get("overall", 0.0), 2) if count else 0.0,
+            "worst_post_score": round((stats.get("min") or {}).get("overall", 0.0), 2) if count else 0.0
+        }
+
+    def reconcile(self, profile_id: ObjectId, tolerance: float = 1e-6) -> bool:
+        """Compare a profile's aggregates with the collection and rebuild them on drift.
+
+        Returns True if drift was found.
+        """
+        profile_id = ObjectId(profile_id)
+        stored = get_database().feedback_stats.find_one({"profile_id": profile_id}) or {}
+        fresh = self._aggregate(profile_id)
+
+        drifted = stored.get("count", 0) != fresh["count"] or any(
+            abs((stored.get(part) or {}).get(key, 0.0) - (fresh.get(part) or {}).get(key, 0.0)) > tolerance
+            for part in ("sum", "min", "max")
+            for key in SCORE_KEYS
+        )
+        if drifted:
+            logger.warning(
+                f"Feedback stats drift for profile {profile_id}: "
+                f"stored count {stored.get('count', 0)}, actual {fresh['count']}"
+            )
+            self._store(fresh)
+        return drifted
+
+# Global instance
+feedback_stats_service = FeedbackStatsService()
@@ -4,7 +4,8 @@ from typing import Optional, Dict, List, Any
 from datetime import datetime, timedelta
 from app.config import settings
 from app.database import get_database
-from app.models import ProfileInDB, MetricsInDB
+from ugc_shared.models import MetricsInDB
+from ugc_shared.services.analytics import summarize_post_metrics
 from bson import ObjectId
 
 logger = logging.getLogger(__name__)
@@ -250,9 +251,6 @@ class InstagramService:
             
             # Collect media insights
             post_metrics = []
-            total_likes = 0
-            total_comments = 0
-            total_reach = 0
             
             for media in media_list:
                 media_insights = self.get_media_insights(access_token, media['id'])
@@ -269,17 +267,10 @@ class InstagramService:
                         'impressions': media_insights.get('impressions', 0),
                     }
                     post_metrics.append(post_metric)
-                    
-                    total_likes += post_metric['likes']
-                    total_comments += post_metric['comments']
-                    total_reach += post_metric['reach']
             
-            # Calculate engagement rate
+            # Calculate totals and engagement rate
             follower_count = account_insights.get('follower_count', 0)
-            avg_engagement_rate = 0.0
-            if follower_count > 0 and post_metrics:
-                total_engagement = total_likes + total_comments
-                avg_engagement_rate = (total_engagement / (follower_count * len(post_metrics))) * 100
+            summary = summarize_post_metrics(post_metrics, follower_count)
             
             # Create metrics record
             metrics_data = MetricsInDB(
@@ -288,10 +279,10 @@ class InstagramService:
                 followers_count=follower_count,
                 following_count=0,  # Not available in Instagram Basic Display API
                 posts_count=len(media_list),
-                avg_engagement_rate=avg_engagement_rate,
-                total_likes=total_likes,
-                total_comments=total_comments,
-                total_reach=total_reach,
+                avg_engagement_rate=summary['avg_engagement_rate'],
+                total_likes=summary['total_likes'],
+                total_comments=summary['total_comments'],
+                total_reach=summary['total_reach'],
                 post_metrics=post_metrics
             )
             
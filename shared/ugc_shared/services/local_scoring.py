@@ -0,0 +1,182 @@
+import re
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from ugc_shared.services.analytics import reach_engagement_rates
+
+logger = logging.getLogger(__name__)
+
+CTA_PATTERN = re.compile(
+    r"\b(coment|salv[ae]|compartilh|marque|sig[ae]m?\b|clique|link na bio|arrast|"
+    r"comment|save|share|tag|follow|click|link in bio|swipe)",
+    re.IGNORECASE
+)
+HASHTAG_PATTERN = re.compile(r"#\w+")
+MENTION_PATTERN = re.compile(r"@\w+")
+
+FEATURE_NAMES = (
+    "caption_length",       # Closeness of the caption length to the ~200 character sweet spot
+    "hashtags",             # Rises up to 5 hashtags, falls off past 15
+    "cta",                  # Call to action present
+    "question",             # Asks the audience something
+    "mentions",             # Mentions other accounts
+    "media_video",
+    "media_carousel",
+    "relative_engagement",  # Engagement vs. the profile's typical post, squashed to [-1, 1]
+)
+
+# Hand-tuned linear model: one column per score in SCORE_NAMES, one row per feature
+SCORE_NAMES = ("overall", "content_quality", "engagement_potential", "visual_appeal")
+WEIGHTS = np.array([
+    # overall, content_quality, engagement_potential, visual_appeal
+    [0.8, 1.2, 0.4, 0.2],   # caption_length
+    [0.4, 0.2, 0.8, 0.0],   # hashtags
+    [0.6, 0.3, 1.0, 0.0],   # cta
+    [0.3, 0.2, 0.6, 0.0],   # question
+    [0.1, 0.0, 0.3, 0.0],   # mentions
+    [0.3, 0.2, 0.5, 0.8],   # media_video
+    [0.3, 0.4, 0.3, 0.6],   # media_carousel
+    [1.2, 0.6, 1.4, 0.6],   # relative_engagement
+])
+BIAS = np.array([-1.0, -0.8, -1.2, 0.0])
+
+class LocalScoringEngine:
+    """CPU-only post scoring from caption, media type and engagement features.
+
+    Produces the same analysis shape as AIService.analyze_post_content
+    (scores, feedback_text, suggestions) in microseconds per post, so bulk
+    sweeps can score every post locally and spend LLM calls only on the
+    posts that need them.
+    """
+
+    def baseline_engagement_rate(self, post_metrics: Sequence[Dict[str, Any]]) -> Optional[float]:
+        """Median engagement rate of a profile's past posts (the `post_metrics` of a metrics record)"""
+        rates = reach_engagement_rates(post_metrics)
+        if not np.isfinite(rates).any():
+            return None
+        return float(np.nanmedian(rates))
+
+    def extract_features(
+        self,
+        posts: Sequence[Dict[str, Any]],
+        baseline_engagement_rate: Optional[float] = None
+    ) -> np.ndarray:
+        """Feature matrix of shape (len(posts), len(FEATURE_NAMES)).
+
+        Without a baseline, engagement is compared to the median of `posts`.
+        """
+        captions = [post.get("post_caption") or "" for post in posts]
+        media_types = np.array([(post.get("post_type") or "image").lower() for post in posts])
+
+        caption_length = np.fromiter((len(caption) for caption in captions), dtype=float, count=len(posts))
+        hashtags = np.fromiter((len(HASHTAG_PATTERN.findall(caption)) for caption in captions), dtype=float, count=len(posts))
+        mentions = np.fromiter((len(MENTION_PATTERN.findall(caption)) for caption in captions), dtype=float, count=len(posts))
+        cta = np.fromiter((CTA_PATTERN.search(caption) is not None for caption in captions), dtype=float, count=len(posts))
+        question = np.fromiter(("?" in caption for caption in captions), dtype=float, count=len(posts))
+
+        rate = reach_engagement_rates([post.get("engagement_data") or {} for post in posts])
+        if not baseline_engagement_rate and np.isfinite(rate).any():
+            baseline_engagement_rate = float(np.nanmedian(rate))
+
+        if baseline_engagement_rate and baseline_engagement_rate > 0:
+            relative_engagement = np.tanh(np.log(np.nan_to_num(rate, nan=baseline_engagement_rate) / baseline_engagement_rate + 1e-9))
+        else:
+            relative_engagement = np.zeros(len(posts))
+
+        features = np.column_stack([
+            np.exp(-((np.log1p(caption_length) - np.log(200)) ** 2) / (2 * 0.8 ** 2)),
+            np.clip(hashtags / 5, 0, 1) - np.clip((hashtags - 15) / 15, 0, 1),
+            cta,
+            question,
+            np.clip(mentions / 2, 0, 1),
+            np.isin(media_types, ("video", "reels")).astype(float),
+            np.isin(media_types, ("carousel", "carousel_album")).astype(float),
+            relative_engagement
+        ])
+        return features.reshape(len(posts), len(FEATURE_NAMES))
+
+    def score(
+        self,
+        posts: Sequence[Dict[str, Any]],
+        baseline_engagement_rate: Optional[float] = None
+    ) -> np.ndarray:
+        """Scores in [0, 1] of shape (len(posts), len(SCORE_NAMES))"""
+        return self._predict(self.extract_features(posts, baseline_engagement_rate))
+
+    @staticmethod
+    def _predict(features: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-(features @ WEIGHTS + BIAS)))
+
+    def analyze(
+        self,
+        posts: Sequence[Dict[str, Any]],
+        baseline_engagement_rate: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyses in the AIService format, in the order of `posts`"""
+        if not posts:
+            return []
+
+        features = self.extract_features(posts, baseline_engagement_rate)
+        scores = self._predict(features)
+
+        return [
+            {
+                "scores": {name: round(float(value), 3) for name, value in zip(SCORE_NAMES, post_scores)},
+                **self._describe(dict(zip(FEATURE_NAMES, post_features))),
+                "source": "local"
+            }
+            for post_features, post_scores in zip(features, scores)
+        ]
+
+    @staticmethod
+    def _describe(features: Dict[str, float]) -> Dict[str, Any]:
+        """Feedback text and suggestions from the features of one post"""
+        strengths = []
+        suggestions = []
+
+        if features["caption_length"] >= 0.6:
+            strengths.append("a legenda tem um bom tamanho")
+        else:
+            suggestions.append("Ajuste o tamanho da legenda: textos entre 100 e 300 caracteres costumam engajar mais")
+
+        if features["hashtags"] >= 0.6:
+            strengths.append("o uso de hashtags está equilibrado")
+        else:
+            suggestions.append("Use entre 3 e 10 hashtags relevantes para o seu nicho")
+
+        if features["cta"]:
+            strengths.append("há uma chamada para ação")
+        else:
+            suggestions.append("Inclua uma call-to-action clara no final do post")
+
+        if features["question"]:
+            strengths.append("o post convida a audiência a responder")
+        else:
+            suggestions.append("Faça uma pergunta para incentivar comentários")
+
+        if features["relative_engagement"] > 0.2:
+            strengths.append("o engajamento está acima da sua média")
+        elif features["relative_engagement"] < -0.2:
+            suggestions.append("O engajamento ficou abaixo da sua média: teste outro formato ou horário")
+
+        feedback_text = "Análise automática: " + (
+            ", ".join(strengths) + "." if strengths else "o post tem pontos a melhorar."
+        )
+        return {"feedback_text": feedback_text, "suggestions": suggestions[:3]}
+
+    @staticmethod
+    def select_for_llm(analyses: Sequence[Dict[str, Any]], max_posts: int, threshold: float) -> List[int]:
+        """Indices of the locally analyzed posts worth a full LLM analysis.
+
+        Picks up to `max_posts` posts whose local overall score is below
+        `threshold`, lowest first, since those gain most from detailed
+        feedback.
+        """
+        if max_posts <= 0 or not analyses:
+            return []
+        overall = np.fromiter((analysis["scores"]["overall"] for analysis in analyses), dtype=float, count=len(analyses))
+        candidates = np.flatnonzero(overall < threshold)
+        return candidates[np.argsort(overall[candidates], kind="stable")][:max_posts].tolist()
+
+# Global instance
+local_scorer = LocalScoringEngine()
@@ -0,0 +1,156 @@
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class LocalReportStorage:
+    """Report files in a directory shared by the worker and the backend"""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        """Absolute path of `key`; refuses keys that point outside the root"""
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Invalid report key: {key}")
+        return path
+
+    def save(self, key: str, data: BinaryIO, content_type: str):
+        """Write `data` under `key`, replacing the file atomically"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                shutil.copyfileobj(data, temp_file)
+            os.replace(temp_path, path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+
+    def read(self, key: str) -> bytes:
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def delete(self, key: str) -> bool:
+        """Delete `key`; returns False if it did not exist"""
+        try:
+            os.remove(self.path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        """Local files have no URL of their own; the API serves them"""
+        return None
+
+class S3ReportStorage:
+    """Report files in an S3-compatible bucket (AWS S3, MinIO)"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024
+    ):
+        # Only needed for this backend
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        client_options = dict(
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"})
+        )
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **client_options)
+        # Pre-signed URLs must use the host browsers reach, which may differ from the internal one
+        self.signing_client = (
+            boto3.client("s3", endpoint_url=public_endpoint_url, **client_options)
+            if public_endpoint_url else self.client
+        )
+        # Files above one part are uploaded in parts as they are read, without buffering them whole
+        self.transfer_config = TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size)
+
+    def save(self, key: str, data: BinaryIO, content_type: str):
+        self.client.upload_fileobj(
+            data,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config
+        )
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def delete(self, key: str) -> bool:
+        # S3 deletes are idempotent and do not say whether the object existed
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    def url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        """Time-limited URL downloading `key` straight from the bucket"""
+        return self.signing_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+                "ResponseContentType": "application/pdf"
+            },
+            ExpiresIn=expires_in
+        )
+
+def report_file_key(report: Dict[str, Any]) -> Optional[str]:
+    """Storage key of a report's PDF; reports saved before storage keys only have a local path"""
+    if report.get("file_key"):
+        return report["file_key"]
+    if report.get("file_path"):
+        return os.path.relpath(report["file_path"], settings.reports_dir)
+    return None
+
+def create_report_storage():
+    """The storage backend selected by REPORTS_STORAGE ("local" or "s3")"""
+    if settings.reports_storage == "s3":
+        return S3ReportStorage(
+            bucket=settings.reports_s3_bucket,
+            endpoint_url=settings.reports_s3_endpoint_url,
+            public_endpoint_url=settings.reports_s3_public_endpoint_url,
+            region=settings.reports_s3_region,
+            access_key_id=settings.reports_s3_access_key_id,
+            secret_access_key=settings.reports_s3_secret_access_key,
+            part_size=settings.reports_s3_part_size_mb * 1024 * 1024
+        )
+    return LocalReportStorage(settings.reports_dir)
+
+# Global instance
+report_storage = create_report_storage()
@@ -49,5 +49,13 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.ai_tasks.analyze_recent_posts',
         'schedule': 7200.0,  # Every 2 hours
     },
+    'generate-content-suggestions-daily': {
+        'task': 'app.tasks.ai_tasks.generate_content_suggestions_for_all',
+        'schedule': 86400.0,  # Every day
+    },
+    'reconcile-feedback-stats-daily': {
+        'task': 'app.tasks.ai_tasks.reconcile_feedback_stats',
+        'schedule': 86400.0,  # Every day
+    },
 }
 
@@ -1,5 +1,6 @@
+import json
 import os
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings:
     # Database
@@ -8,20 +9,59 @@ class Settings:
     
     # Redis (for Celery)
     redis_url: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2.0"))  # Locks and AI counters; the Celery broker has its own
     
     # Instagram API
     instagram_app_id: Optional[str] = os.getenv("INSTAGRAM_APP_ID")
     instagram_app_secret: Optional[str] = os.getenv("INSTAGRAM_APP_SECRET")
+    instagram_redirect_uri: str = os.getenv("INSTAGRAM_REDIRECT_URI", "http://localhost:3000/auth/instagram/callback")
     
-    # OpenAI
+    # OpenAI (read by the shared AI services in ugc_shared; keep the defaults in line with the backend's)
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+    openai_base_url: Optional[str] = os.getenv("OPENAI_BASE_URL")  # Point at a local fake server for testing
+    openai_model: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    openai_timeout_seconds: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    openai_max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    openai_rpm_limit: int = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+    openai_tpm_limit: int = int(os.getenv("OPENAI_TPM_LIMIT", "60000"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+    openai_retry_base_delay: float = float(os.getenv("OPENAI_RETRY_BASE_DELAY", "0.5"))
+    openai_retry_max_delay: float = float(os.getenv("OPENAI_RETRY_MAX_DELAY", "20"))
+    
+    # AI analysis
+    ai_sweep_mode: str = os.getenv("AI_SWEEP_MODE", "local")  # "local" or "llm"
+    ai_batch_size: int = int(os.getenv("AI_BATCH_SIZE", "5"))
+    ai_batch_max_tokens_per_post: int = int(os.getenv("AI_BATCH_MAX_TOKENS_PER_POST", "400"))
+    ai_sweep_llm_max_posts: int = int(os.getenv("AI_SWEEP_LLM_MAX_POSTS", "2"))
+    ai_sweep_llm_score_threshold: float = float(os.getenv("AI_SWEEP_LLM_SCORE_THRESHOLD", "0.6"))
+    ai_structured_output: str = os.getenv("AI_STRUCTURED_OUTPUT", "function")  # "function", "json_object" or "off"
+    ai_cache_enabled: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    ai_cache_ttl_seconds: int = int(os.getenv("AI_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    ai_cache_max_entries: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", "50000"))
+    ai_budget_enabled: bool = os.getenv("AI_BUDGET_ENABLED", "true").lower() == "true"
+    ai_daily_token_budget: int = int(os.getenv("AI_DAILY_TOKEN_BUDGET", "2000000"))
+    ai_background_budget_share: float = float(os.getenv("AI_BACKGROUND_BUDGET_SHARE", "0.8"))
+    # JSON object, as the backend's pydantic-settings reads it
+    ai_profile_daily_token_budget: Dict[str, int] = json.loads(
+        os.getenv("AI_PROFILE_DAILY_TOKEN_BUDGET", '{"free": 20000, "basic": 100000, "premium": 500000}')
+    )
+    ai_job_ttl_seconds: int = int(os.getenv("AI_JOB_TTL_SECONDS", "3600"))
     
     # Email
     sendgrid_api_key: Optional[str] = os.getenv("SENDGRID_API_KEY")
     from_email: str = os.getenv("FROM_EMAIL", "noreply@ugcsaas.com")
     
     # Reports
+    reports_storage: str = os.getenv("REPORTS_STORAGE", "local")  # "local" (reports_dir) or "s3"
     reports_dir: str = os.getenv("REPORTS_DIR", "/app/reports")
+    reports_s3_bucket: str = os.getenv("REPORTS_S3_BUCKET", "reports")
+    reports_s3_endpoint_url: Optional[str] = os.getenv("REPORTS_S3_ENDPOINT_URL")
+    reports_s3_public_endpoint_url: Optional[str] = os.getenv("REPORTS_S3_PUBLIC_ENDPOINT_URL")
+    reports_s3_region: Optional[str] = os.getenv("REPORTS_S3_REGION")
+    reports_s3_access_key_id: Optional[str] = os.getenv("REPORTS_S3_ACCESS_KEY_ID")
+    reports_s3_secret_access_key: Optional[str] = os.getenv("REPORTS_S3_SECRET_ACCESS_KEY")
+    reports_s3_part_size_mb: int = int(os.getenv("REPORTS_S3_PART_SIZE_MB", "8"))
 
 settings = Settings()
 
@@ -34,4 +34,3 @@ def close_mongo_connection():
 def get_database() -> Database:
     """Get database instance"""
     return mongodb.database
-
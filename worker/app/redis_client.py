@@ -0,0 +1,21 @@
+import redis
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RedisClient:
+    client: redis.Redis = None
+
+redis_client = RedisClient()
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client, creating the connection pool on first use"""
+    if redis_client.client is None:
+        redis_client.client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout
+        )
+    return redis_client.client
@@ -22,7 +22,7 @@ class EmailService:
         to_email: str,
         user_name: str,
         report_title: str,
-        report_path: Optional[str] = None
+        report_pdf: Optional[bytes] = None
     ) -> bool:
         """Send report notification email"""
         
@@ -143,11 +143,9 @@ class EmailService:
             )
             
             # Attach PDF if provided
-            if report_path:
+            if report_pdf:
                 try:
-                    with open(report_path, 'rb') as f:
-                        data = f.read()
-                        encoded_file = base64.b64encode(data).decode()
+                    encoded_file = base64.b64encode(report_pdf).decode()
                     
                     attachment = Attachment(
                         FileContent(encoded_file),
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar, Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+from ugc_shared.services.analytics import SCORE_KEYS, MetricsHistory
+
+@dataclass(slots=True, frozen=True)
+class MetricRecord:
+    """The fields of a metrics document that reports use"""
+
+    date: datetime
+    followers_count: int
+    avg_engagement_rate: float
+    total_likes: int
+    total_comments: int
+    total_reach: int
+    posts_count: int
+
+    # Leaves out post_metrics, by far the largest part of each document
+    PROJECTION: ClassVar[Dict[str, int]] = {
+        "_id": 0, "date": 1, "followers_count": 1, "avg_engagement_rate": 1,
+        "total_likes": 1, "total_comments": 1, "total_reach": 1, "posts_count": 1
+    }
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "MetricRecord":
+        get = document.get
+        return cls(
+            document["date"],
+            get("followers_count") or 0,
+            get("avg_engagement_rate") or 0.0,
+            get("total_likes") or 0,
+            get("total_comments") or 0,
+            get("total_reach") or 0,
+            get("posts_count") or 0
+        )
+
+@dataclass(slots=True, frozen=True)
+class FeedbackRecord:
+    """The scores and suggestions of a post feedback document"""
+
+    scores: Tuple[float, ...]  # In SCORE_KEYS order
+    suggestions: Tuple[str, ...]
+
+    PROJECTION: ClassVar[Dict[str, int]] = {"_id": 0, "scores": 1, "suggestions": 1}
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "FeedbackRecord":
+        scores = document.get("scores") or {}
+        return cls(
+            tuple(float(scores.get(key) or 0.0) for key in SCORE_KEYS),
+            tuple(document.get("suggestions") or ())
+        )
+
+def metric_records(documents: Iterable[Dict[str, Any]]) -> List[MetricRecord]:
+    """Records from a metrics cursor (query it with MetricRecord.PROJECTION)"""
+    return [MetricRecord.from_document(document) for document in documents]
+
+def feedback_records(documents: Iterable[Dict[str, Any]]) -> List[FeedbackRecord]:
+    """Records from a posts_feedback cursor (query it with FeedbackRecord.PROJECTION)"""
+    return [FeedbackRecord.from_document(document) for document in documents]
+
+def metrics_history(records: Sequence[MetricRecord]) -> MetricsHistory:
+    """MetricsHistory of records in any order"""
+    dates = np.array([record.date for record in records], dtype="datetime64[s]")
+    order = np.argsort(dates, kind="stable")
+    values = {
+        field: np.array([getattr(record, field) for record in records], dtype=float)[order]
+        for field in MetricsHistory.FIELDS
+    }
+    return MetricsHistory(dates[order], values)
+
+def feedback_average_scores(records: Sequence[FeedbackRecord], scale: float = 1.0) -> Dict[str, float]:
+    """Mean of each feedback score, multiplied by `scale`"""
+    if not records:
+        return {key: 0 for key in SCORE_KEYS}
+    means = np.array([record.scores for record in records], dtype=float).mean(axis=0) * scale
+    return {key: float(value) for key, value in zip(SCORE_KEYS, means)}
@@ -1,11 +1,8 @@
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Image
 from reportlab.lib.units import inch
-from reportlab.lib import colors
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.graphics.charts.barcharts import VerticalBarChart
@@ -16,16 +13,19 @@ import numpy as np
 from io import BytesIO
 import base64
 import logging
+from ugc_shared.services.analytics import growth_rate
+from app.services.records import FeedbackRecord, MetricRecord, feedback_average_scores, metrics_history
+from app.services.report_templates import TEMPLATE_VERSION, ReportTemplate, report_styles
 
 logger = logging.getLogger(__name__)
 
 class ReportGenerator:
     """Service for generating PDF reports"""
     
-    def __init__(self, reports_dir: str = "/app/reports"):
-        self.reports_dir = reports_dir
-        os.makedirs(reports_dir, exist_ok=True)
-        
+    # Part of every report fingerprint; bumped in report_templates
+    TEMPLATE_VERSION = TEMPLATE_VERSION
+    
+    def __init__(self):
         # Set up matplotlib style
         plt.style.use('seaborn-v0_8')
         sns.set_palette("husl")
@@ -33,117 +33,85 @@ class ReportGenerator:
     def generate_performance_report(
         self,
         profile_data: Dict[str, Any],
-        metrics_data: List[Dict[str, Any]],
-        feedback_data: List[Dict[str, Any]],
+        metrics_data: List[MetricRecord],
+        feedback_data: List[FeedbackRecord],
         report_title: str,
         period_start: datetime,
-        period_end: datetime
-    ) -> str:
-        """Generate a comprehensive performance report"""
+        period_end: datetime,
+        template: ReportTemplate
+    ) -> BytesIO:
+        """Generate a comprehensive performance report from metrics records (newest first) and feedback records.
+
+        `template` selects the sections shown. Returns the PDF in a buffer
+        positioned at its start, ready for the storage backend.
+        """
         
         try:
-            # Create filename
-            filename = f"report_{profile_data['_id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            filepath = os.path.join(self.reports_dir, filename)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(filepath, pagesize=A4)
+            # Create PDF document in memory
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=A4)
             story = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                textColor=colors.HexColor('#2563eb')
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                spaceAfter=12,
-                textColor=colors.HexColor('#1f2937')
-            )
+            styles = report_styles()
+            sections = template.sections
+            title_style = styles.title
+            heading_style = styles.heading
             
             # Title
             story.append(Paragraph(report_title, title_style))
             story.append(Spacer(1, 20))
             
             # Profile info
-            story.append(Paragraph("Informações do Perfil", heading_style))
-            profile_info = [
-                ['Nome:', profile_data.get('display_name', 'N/A')],
-                ['Nicho:', profile_data.get('niche', 'N/A').title()],
-                ['Período:', f"{period_start.strftime('%d/%m/%Y')} - {period_end.strftime('%d/%m/%Y')}"],
-                ['Gerado em:', datetime.now().strftime('%d/%m/%Y às %H:%M')]
-            ]
-            
-            profile_table = Table(profile_info, colWidths=[2*inch, 4*inch])
-            profile_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            
-            story.append(profile_table)
-            story.append(Spacer(1, 30))
+            if 'profile' in sections:
+                story.append(Paragraph("Informações do Perfil", heading_style))
+                profile_info = [
+                    ['Nome:', profile_data.get('display_name', 'N/A')],
+                    ['Nicho:', profile_data.get('niche', 'N/A').title()],
+                    ['Período:', f"{period_start.strftime('%d/%m/%Y')} - {period_end.strftime('%d/%m/%Y')}"],
+                    ['Gerado em:', datetime.now().strftime('%d/%m/%Y às %H:%M')]
+                ]
+                
+                profile_table = Table(profile_info, colWidths=[2*inch, 4*inch])
+                profile_table.setStyle(styles.profile_table)
+                
+                story.append(profile_table)
+                story.append(Spacer(1, 30))
             
             # Metrics summary
-            if metrics_data:
+            if metrics_data and 'metrics' in sections:
                 story.append(Paragraph("Resumo de Métricas", heading_style))
                 
-                latest_metrics = metrics_data[0] if metrics_data else {}
-                oldest_metrics = metrics_data[-1] if len(metrics_data) > 1 else latest_metrics
-                
-                # Calculate growth
-                followers_growth = self._calculate_growth(
-                    latest_metrics.get('followers_count', 0),
-                    oldest_metrics.get('followers_count', 0)
-                )
+                latest_metrics = metrics_data[0]
                 
-                engagement_growth = self._calculate_growth(
-                    latest_metrics.get('avg_engagement_rate', 0),
-                    oldest_metrics.get('avg_engagement_rate', 0)
-                )
+                # Calculate growth over the period
+                history = metrics_history(metrics_data)
+                followers_growth = history.growth('followers_count')
+                engagement_growth = history.growth('avg_engagement_rate')
                 
                 metrics_summary = [
                     ['Métrica', 'Valor Atual', 'Crescimento'],
-                    ['Seguidores', f"{latest_metrics.get('followers_count', 0):,}", f"{followers_growth:+.1f}%"],
-                    ['Taxa de Engajamento', f"{latest_metrics.get('avg_engagement_rate', 0):.2f}%", f"{engagement_growth:+.1f}%"],
-                    ['Total de Curtidas', f"{latest_metrics.get('total_likes', 0):,}", "-"],
-                    ['Total de Comentários', f"{latest_metrics.get('total_comments', 0):,}", "-"],
-                    ['Posts Analisados', f"{latest_metrics.get('posts_count', 0)}", "-"]
+                    ['Seguidores', f"{latest_metrics.followers_count:,}", f"{followers_growth:+.1f}%"],
+                    ['Taxa de Engajamento', f"{latest_metrics.avg_engagement_rate:.2f}%", f"{engagement_growth:+.1f}%"],
+                    ['Total de Curtidas', f"{latest_metrics.total_likes:,}", "-"],
+                    ['Total de Comentários', f"{latest_metrics.total_comments:,}", "-"],
+                    ['Posts Analisados', f"{latest_metrics.posts_count}", "-"]
                 ]
                 
                 metrics_table = Table(metrics_summary, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-                metrics_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')])
-                ]))
+                metrics_table.setStyle(styles.metrics_table)
                 
                 story.append(metrics_table)
                 story.append(Spacer(1, 30))
-                
-                # Generate charts
-                charts_path = self._generate_charts(metrics_data)
-                if charts_path:
+            
+            # Generate charts
+            if metrics_data and 'charts' in sections:
+                charts_png = self._generate_charts(metrics_data)
+                if charts_png:
                     story.append(Paragraph("Evolução das Métricas", heading_style))
-                    story.append(Image(charts_path, width=6*inch, height=4*inch))
+                    story.append(Image(charts_png, width=6*inch, height=4*inch))
                     story.append(Spacer(1, 20))
             
             # Feedback analysis
-            if feedback_data:
+            if feedback_data and 'feedback' in sections:
                 story.append(Paragraph("Análise de Feedback", heading_style))
                 
                 # Calculate average scores
@@ -158,50 +126,45 @@ class ReportGenerator:
                 ]
                 
                 feedback_table = Table(feedback_summary, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-                feedback_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')])
-                ]))
+                feedback_table.setStyle(styles.feedback_table)
                 
                 story.append(feedback_table)
                 story.append(Spacer(1, 20))
-                
-                # Top suggestions
+            
+            # Top suggestions
+            if feedback_data and 'suggestions' in sections:
                 all_suggestions = []
                 for feedback in feedback_data:
-                    all_suggestions.extend(feedback.get('suggestions', []))
+                    all_suggestions.extend(feedback.suggestions)
                 
                 if all_suggestions:
                     story.append(Paragraph("Principais Sugestões de Melhoria", heading_style))
                     
-                    # Get unique suggestions (limit to top 5)
-                    unique_suggestions = list(set(all_suggestions))[:5]
+                    # Get unique suggestions (limited by the template)
+                    unique_suggestions = list(set(all_suggestions))[:template.max_suggestions]
                     
                     for i, suggestion in enumerate(unique_suggestions, 1):
-                        story.append(Paragraph(f"{i}. {suggestion}", styles['Normal']))
+                        story.append(Paragraph(f"{i}. {suggestion}", styles.body))
                         story.append(Spacer(1, 6))
                     
                     story.append(Spacer(1, 20))
             
             # Recommendations
-            story.append(Paragraph("Recomendações Estratégicas", heading_style))
-            
-            recommendations = self._generate_recommendations(metrics_data, feedback_data, profile_data)
-            
-            for i, rec in enumerate(recommendations, 1):
-                story.append(Paragraph(f"{i}. {rec}", styles['Normal']))
-                story.append(Spacer(1, 8))
+            if 'recommendations' in sections:
+                story.append(Paragraph("Recomendações Estratégicas", heading_style))
+                
+                recommendations = self._generate_recommendations(metrics_data, feedback_data, profile_data)
+                
+                for i, rec in enumerate(recommendations, 1):
+                    story.append(Paragraph(f"{i}. {rec}", styles.body))
+                    story.append(Spacer(1, 8))
             
             # Build PDF
             doc.build(story)
+            buffer.seek(0)
             
-            logger.info(f"Report generated successfully: {filepath}")
-            return filepath
+            logger.info(f"Report generated successfully for profile {profile_data['_id']} ({buffer.getbuffer().nbytes} bytes)")
+            return buffer
             
         except Exception as e:
             logger.error(f"Error generating report: {e}")
@@ -209,24 +172,11 @@ class ReportGenerator:
     
     def _calculate_growth(self, current: float, previous: float) -> float:
         """Calculate growth percentage"""
-        if previous == 0:
-            return 0.0
-        return ((current - previous) / previous) * 100
+        return growth_rate(current, previous)
     
-    def _calculate_average_scores(self, feedback_data: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _calculate_average_scores(self, feedback_data: List[FeedbackRecord]) -> Dict[str, float]:
         """Calculate average scores from feedback data"""
-        if not feedback_data:
-            return {'overall': 0, 'content_quality': 0, 'engagement_potential': 0, 'visual_appeal': 0}
-        
-        totals = {'overall': 0, 'content_quality': 0, 'engagement_potential': 0, 'visual_appeal': 0}
-        count = len(feedback_data)
-        
-        for feedback in feedback_data:
-            scores = feedback.get('scores', {})
-            for key in totals.keys():
-                totals[key] += scores.get(key, 0) * 10  # Convert to 0-10 scale
-        
-        return {key: total / count for key, total in totals.items()}
+        return feedback_average_scores(feedback_data, scale=10)  # Convert to 0-10 scale
     
     def _get_score_classification(self, score: float) -> str:
         """Get classification for a score"""
@@ -239,16 +189,17 @@ class ReportGenerator:
         else:
             return "Precisa Melhorar"
     
-    def _generate_charts(self, metrics_data: List[Dict[str, Any]]) -> Optional[str]:
-        """Generate charts for metrics data"""
+    def _generate_charts(self, metrics_data: List[MetricRecord]) -> Optional[BytesIO]:
+        """Generate charts for metrics data as an in-memory PNG"""
+        fig = None
         try:
             if not metrics_data:
                 return None
             
             # Prepare data
-            dates = [m.get('date', datetime.now()) for m in reversed(metrics_data)]
-            followers = [m.get('followers_count', 0) for m in reversed(metrics_data)]
-            engagement = [m.get('avg_engagement_rate', 0) for m in reversed(metrics_data)]
+            dates = [m.date for m in reversed(metrics_data)]
+            followers = [m.followers_count for m in reversed(metrics_data)]
+            engagement = [m.avg_engagement_rate for m in reversed(metrics_data)]
             
             # Create figure with subplots
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
@@ -268,23 +219,26 @@ class ReportGenerator:
             ax2.grid(True, alpha=0.3)
             ax2.tick_params(axis='x', rotation=45)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
-            # Save chart
-            chart_path = os.path.join(self.reports_dir, f"chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            # Render chart into memory; the PDF reads it from the buffer
+            chart_png = BytesIO()
+            fig.savefig(chart_png, format='png', dpi=300, bbox_inches='tight')
+            chart_png.seek(0)
             
-            return chart_path
+            return chart_png
             
         except Exception as e:
             logger.error(f"Error generating charts: {e}")
             return None
+        finally:
+            if fig is not None:
+                plt.close(fig)
     
     def _generate_recommendations(
         self, 
-        metrics_data: List[Dict[str, Any]], 
-        feedback_data: List[Dict[str, Any]],
+        metrics_data: List[MetricRecord], 
+        feedback_data: List[FeedbackRecord],
         profile_data: Dict[str, Any]
     ) -> List[str]:
         """Generate strategic recommendations based on data"""
@@ -297,13 +251,13 @@ class ReportGenerator:
             previous = metrics_data[-1]
             
             followers_growth = self._calculate_growth(
-                latest.get('followers_count', 0),
-                previous.get('followers_count', 0)
+                latest.followers_count,
+                previous.followers_count
             )
             
             engagement_growth = self._calculate_growth(
-                latest.get('avg_engagement_rate', 0),
-                previous.get('avg_engagement_rate', 0)
+                latest.avg_engagement_rate,
+                previous.avg_engagement_rate
             )
             
             if followers_growth < 5:
@@ -312,7 +266,7 @@ class ReportGenerator:
             if engagement_growth < 0:
                 recommendations.append("Sua taxa de engajamento está diminuindo. Considere criar conteúdo mais interativo e responder aos comentários mais rapidamente.")
             
-            if latest.get('avg_engagement_rate', 0) < 3:
+            if latest.avg_engagement_rate < 3:
                 recommendations.append("Sua taxa de engajamento está abaixo da média. Experimente diferentes tipos de conteúdo e horários de postagem.")
         
         # Analyze feedback data
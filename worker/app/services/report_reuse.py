@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+from dataclasses import astuple
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+import redis
+from app.database import get_database
+from app.redis_client import get_redis
+from app.services.records import FeedbackRecord, MetricRecord
+from ugc_shared.services.report_storage import report_file_key, report_storage
+
+logger = logging.getLogger(__name__)
+
+class ReportReuseService:
+    """Reuse of generated reports whose inputs have not changed.
+
+    A report's fingerprint hashes everything its PDF is rendered from: the
+    template version, the report type and dates shown in the title, the
+    profile fields it prints and the metrics and feedback records of the
+    period. A request with the fingerprint of a stored report gets that
+    report back instead of a new render; any new or changed record, or a
+    template change, produces a new fingerprint.
+    """
+
+    STATS_KEY = "reports:reuse:stats"  # Read by the backend's /reports/reuse/stats
+
+    def fingerprint(
+        self,
+        template_version: int,
+        profile: Dict[str, Any],
+        report_type: str,
+        period_start: datetime,
+        period_end: datetime,
+        metrics: Sequence[MetricRecord],
+        feedback: Sequence[FeedbackRecord]
+    ) -> str:
+        digest = hashlib.sha256()
+        header = {
+            "template": template_version,
+            "type": report_type,
+            # The report shows days only; runs within the same days over the same data are identical
+            "period": [period_start.strftime("%Y-%m-%d"), period_end.strftime("%Y-%m-%d")],
+            "profile": [profile.get("display_name"), profile.get("niche")]
+        }
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+        for record in metrics:
+            digest.update(repr(astuple(record)).encode("utf-8"))
+        digest.update(b"|")
+        for record in feedback:
+            digest.update(repr(astuple(record)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def find(self, profile_id: Any, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """The newest ready report with this fingerprint whose file is still stored"""
+        report = get_database().reports.find_one(
+            {"profile_id": profile_id, "fingerprint": fingerprint, "is_ready": True},
+            {"title": 1, "file_key": 1, "file_path": 1},
+            sort=[("created_at", -1)]
+        )
+        file_key = report_file_key(report) if report else None
+        found = bool(file_key) and report_storage.exists(file_key)
+        self._count("hits" if found else "misses")
+        return report if found else None
+
+    def _count(self, field: str):
+        try:
+            get_redis().hincrby(self.STATS_KEY, field, 1)
+        except redis.RedisError as e:
+            logger.warning(f"Report reuse stats unavailable: {e}")
+
+# Global instance
+report_reuse = ReportReuseService()
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+# Part of every report fingerprint: bump it when the layout or a template changes so stored reports are regenerated
+TEMPLATE_VERSION = 2
+
+# PDF streams are only zlib-compressed. ReportLab's ASCII85 pass runs in pure Python over
+# every stream (mostly the chart) and makes files 20% larger.
+rl_config.useA85 = 0
+
+# Every section a report can show, in the order they are rendered
+SECTIONS = ("profile", "metrics", "charts", "feedback", "suggestions", "recommendations")
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    """What a report type shows"""
+
+    name: str
+    period_days: int  # Period covered when the request does not give one
+    sections: Tuple[str, ...] = SECTIONS
+    max_suggestions: int = 5
+
+REPORT_TEMPLATES: Dict[str, ReportTemplate] = {
+    "weekly": ReportTemplate("weekly", period_days=7),
+    "monthly": ReportTemplate("monthly", period_days=30),
+    "custom": ReportTemplate("custom", period_days=30),
+}
+
+def report_template(report_type: str) -> ReportTemplate:
+    """Template of a report type; unknown types are rendered as custom reports"""
+    return REPORT_TEMPLATES.get(report_type, REPORT_TEMPLATES["custom"])
+
+@dataclass(frozen=True)
+class ReportStyles:
+    """Paragraph and table styles of the report layout"""
+
+    title: ParagraphStyle
+    heading: ParagraphStyle
+    body: ParagraphStyle
+    profile_table: TableStyle
+    metrics_table: TableStyle
+    feedback_table: TableStyle
+
+@lru_cache(maxsize=None)
+def report_styles() -> ReportStyles:
+    """Styles shared by every report, built once per process.
+
+    Tables only read their TableStyle's commands and paragraphs only read
+    their style, so one instance serves every report.
+    """
+    sample = getSampleStyleSheet()
+    return ReportStyles(
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=colors.HexColor('#2563eb')
+        ),
+        heading=ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=colors.HexColor('#1f2937')
+        ),
+        body=sample['Normal'],
+        profile_table=TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
+        ]),
+        metrics_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')])
+        ]),
+        feedback_table=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')])
+        ])
+    )
@@ -1,26 +1,41 @@
 from celery import current_task
 from app.celery_app import celery_app
 from app.database import get_database, connect_to_mongo
+from ugc_shared.list_versions import bump_list_version
+from app.redis_client import get_redis
+from app.config import settings
+from ugc_shared.models import PostFeedbackInDB
+from ugc_shared.services.ai_budget import ai_budget, BudgetScope, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from ugc_shared.services.ai_service import ai_service
+from ugc_shared.services.feedback_stats import feedback_stats_service
+from ugc_shared.services.instagram_service import instagram_service
+from ugc_shared.services.local_scoring import local_scorer
 from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import ReturnDocument
+import hashlib
+import json
 import logging
-import sys
-import os
+import asyncio
 
-# Add the backend directory to the path to import services
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'backend'))
+logger = logging.getLogger(__name__)
 
-try:
-    from app.services.ai_service import ai_service
-    from app.services.instagram_service import instagram_service
-    from app.models import PostFeedbackInDB
-except ImportError:
-    # Fallback if import fails
-    ai_service = None
-    instagram_service = None
-    PostFeedbackInDB = None
+# Job records created by the backend's AIJobService
+AI_JOB_KEY_PREFIX = "ai_job:"
 
-logger = logging.getLogger(__name__)
+def _run_async(coro):
+    """Run a coroutine on a fresh event loop, releasing the AI HTTP pool afterwards"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(ai_service.aclose())
+        loop.close()
+
+def _budget_scope(profile_id: str, tier: str, priority: str = PRIORITY_BACKGROUND):
+    """Attribute the AI calls made inside the block to a profile in the token budget"""
+    return ai_budget.scope(profile_id, tier, priority)
 
 @celery_app.task(bind=True)
 def analyze_recent_posts(self):
@@ -102,15 +117,7 @@ def analyze_profile_posts(self, profile_id: str, limit: int = 5):
             raise ValueError(f"No Instagram tokens for profile {profile_id}")
         
         niche = profile.get('niche', 'lifestyle')
-        
-        if not instagram_service or not ai_service:
-            logger.error("Required services not available")
-            return {
-                'profile_id': profile_id,
-                'success': False,
-                'error': 'Required services not available',
-                'completed_at': datetime.utcnow().isoformat()
-            }
+        tier = profile.get('subscription_status', 'free')
         
         # Get recent posts from Instagram
         posts = instagram_service.get_user_media(
@@ -128,40 +135,102 @@ def analyze_profile_posts(self, profile_id: str, limit: int = 5):
                 'completed_at': datetime.utcnow().isoformat()
             }
         
-        analyzed_count = 0
+        # Skip posts that already have feedback (one query instead of one per post)
+        post_ids = [post['id'] for post in posts]
+        existing_ids = {
+            doc['post_id'] for doc in db.posts_feedback.find(
+                {"post_id": {"$in": post_ids}},
+                {"post_id": 1}
+            )
+        }
+        
+        # In local mode only a few posts reach the LLM, and none when the token
+        # budget has no room for them; in llm mode the sweep is deferred instead
+        local_mode = settings.ai_sweep_mode == 'local'
+        new_count = sum(1 for post in posts if post['id'] not in existing_ids)
+        llm_count = min(new_count, settings.ai_sweep_llm_max_posts) if local_mode else new_count
+        if llm_count:
+            exceeded = ai_budget.check(
+                ai_budget.estimate_post_analyses(llm_count),
+                BudgetScope(profile_id, tier, PRIORITY_BACKGROUND)
+            )
+            if exceeded and local_mode:
+                logger.info(f"Scoring posts for profile {profile_id} locally only: {exceeded}")
+                llm_count = 0
+            elif exceeded:
+                logger.info(f"Deferring post analysis for profile {profile_id}: {exceeded}")
+                return {
+                    'profile_id': profile_id,
+                    'success': True,
+                    'analyzed_posts': 0,
+                    'deferred': True,
+                    'retry_after': exceeded.retry_after,
+                    'completed_at': datetime.utcnow().isoformat()
+                }
         
+        pending_posts = []
         for post in posts:
-            try:
-                post_id = post['id']
-                
-                # Check if feedback already exists
-                existing_feedback = db.posts_feedback.find_one({"post_id": post_id})
-                if existing_feedback:
-                    continue
-                
-                # Get post insights
-                insights = instagram_service.get_media_insights(
-                    instagram_tokens['access_token'],
-                    post_id
-                )
-                
-                # Create post feedback using AI
-                feedback = ai_service.create_post_feedback(
+            if post['id'] in existing_ids:
+                continue
+            
+            # Get post insights
+            insights = instagram_service.get_media_insights(
+                instagram_tokens['access_token'],
+                post['id']
+            )
+            
+            pending_posts.append({
+                'post_id': post['id'],
+                'post_url': post.get('permalink', ''),
+                'post_caption': post.get('caption', ''),
+                'post_type': post.get('media_type', 'IMAGE').lower(),
+                'engagement_data': insights
+            })
+        
+        # Analyze all pending posts concurrently
+        if not pending_posts:
+            feedbacks = []
+        elif local_mode:
+            latest_metric = db.metrics.find_one(
+                {"profile_id": ObjectId(profile_id)},
+                {"post_metrics": 1},
+                sort=[("date", -1)]
+            )
+            with _budget_scope(profile_id, tier):
+                feedbacks = _run_async(ai_service.create_posts_feedback_local_first(
                     profile_id=profile_id,
-                    post_id=post_id,
-                    post_url=post.get('permalink', ''),
-                    post_caption=post.get('caption', ''),
-                    post_type=post.get('media_type', 'IMAGE').lower(),
                     niche=niche,
-                    engagement_data=insights
-                )
-                
-                if feedback and PostFeedbackInDB:
+                    posts=pending_posts,
+                    baseline_engagement_rate=local_scorer.baseline_engagement_rate(
+                        (latest_metric or {}).get('post_metrics', [])
+                    ),
+                    llm_max_posts=llm_count
+                ))
+        else:
+            with _budget_scope(profile_id, tier):
+                feedbacks = _run_async(ai_service.create_posts_feedback(
+                    profile_id=profile_id,
+                    niche=niche,
+                    posts=pending_posts
+                ))
+        
+        analyzed_count = 0
+        
+        for post, feedback in zip(pending_posts, feedbacks):
+            post_id = post['post_id']
+            try:
+                if feedback:
                     # Save feedback to database
                     feedback_data = PostFeedbackInDB(**feedback.dict())
-                    result = db.posts_feedback.insert_one(feedback_data.dict(by_alias=True))
+                    feedback_document = feedback_data.dict(by_alias=True)
+                    # dict() turns ObjectIds into strings; feedback is looked up by ObjectId everywhere
+                    feedback_document["_id"] = feedback_data.id
+                    feedback_document["profile_id"] = feedback_data.profile_id
+                    result = db.posts_feedback.insert_one(feedback_document)
                     
                     if result.inserted_id:
+                        feedback_stats_service.record(feedback_document)
+                        bump_list_version([feedback_document["profile_id"]], "feedback")
                         analyzed_count += 1
                         logger.info(f"Created feedback for post {post_id}")
                     else:
@@ -170,7 +239,7 @@ def analyze_profile_posts(self, profile_id: str, limit: int = 5):
                     logger.error(f"Failed to create feedback for post {post_id}")
                     
             except Exception as e:
-                logger.error(f"Error analyzing post {post.get('id')}: {e}")
+                logger.error(f"Error saving feedback for post {post_id}: {e}")
         
         logger.info(f"Analyzed {analyzed_count} posts for profile {profile_id}")
         
@@ -191,6 +260,41 @@ def analyze_profile_posts(self, profile_id: str, limit: int = 5):
             'completed_at': datetime.utcnow().isoformat()
         }
 
+@celery_app.task(bind=True)
+def reconcile_feedback_stats(self):
+    """Check every profile's running feedback aggregates against posts_feedback and fix drift"""
+    try:
+        connect_to_mongo()
+        db = get_database()
+        
+        # Older feedback holds the profile id as a string: count each profile once
+        profile_ids = {ObjectId(profile_id) for profile_id in db.posts_feedback.distinct("profile_id")}
+        drifted = 0
+        
+        for profile_id in profile_ids:
+            try:
+                if feedback_stats_service.reconcile(profile_id):
+                    drifted += 1
+            except Exception as e:
+                logger.error(f"Error reconciling feedback stats for profile {profile_id}: {e}")
+        
+        logger.info(f"Reconciled feedback stats for {len(profile_ids)} profiles, {drifted} drifted")
+        
+        return {
+            'success': True,
+            'profiles_checked': len(profile_ids),
+            'profiles_drifted': drifted,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in reconcile_feedback_stats: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
 @celery_app.task(bind=True)
 def generate_content_suggestions_for_all(self):
     """Generate content suggestions for all active profiles"""
@@ -267,18 +371,10 @@ def generate_profile_content_suggestions(self, profile_id: str):
         
         niche = profile.get('niche', 'lifestyle')
         
-        if not ai_service:
-            logger.error("AI service not available")
-            return {
-                'profile_id': profile_id,
-                'success': False,
-                'error': 'AI service not available',
-                'completed_at': datetime.utcnow().isoformat()
-            }
-        
         # Get recent performance data
         recent_metrics = list(db.metrics.find(
-            {"profile_id": ObjectId(profile_id)}
+            {"profile_id": ObjectId(profile_id)},
+            {"followers_count": 1, "avg_engagement_rate": 1, "date": 1, "post_metrics": 1}
         ).sort("date", -1).limit(5))
         
         # Convert metrics to performance data
@@ -293,11 +389,12 @@ def generate_profile_content_suggestions(self, profile_id: str):
                 })
         
         # Generate content suggestions using AI
-        suggestions = ai_service.generate_content_suggestions(
-            profile_id=profile_id,
-            niche=niche,
-            performance_data=recent_performance
-        )
+        with _budget_scope(profile_id, profile.get('subscription_status', 'free')):
+            suggestions = _run_async(ai_service.generate_content_suggestions(
+                niche=niche,
+                recent_performance=recent_performance,
+                post_metrics=recent_metrics[0].get('post_metrics', []) if recent_metrics else None
+            ))
         
         # Save suggestions to database
         if suggestions:
@@ -341,4 +438,277 @@ def generate_profile_content_suggestions(self, profile_id: str):
             'success': False,
             'error': str(e),
             'completed_at': datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
+
+def _audience_inputs(recent_metrics: list) -> tuple:
+    """Build the audience insights inputs from metrics ordered newest first"""
+    latest_metric = recent_metrics[0]
+    oldest_metric = recent_metrics[-1]
+    
+    follower_growth = 0
+    if oldest_metric.get('followers_count', 0) > 0:
+        follower_growth = ((latest_metric.get('followers_count', 0) - oldest_metric.get('followers_count', 0)) / oldest_metric.get('followers_count', 1)) * 100
+    
+    follower_data = {
+        'count': latest_metric.get('followers_count', 0),
+        'growth_rate': follower_growth
+    }
+    
+    engagement_patterns = [
+        {
+            'date': metric['date'].strftime('%Y-%m-%d') if metric.get('date') else 'N/A',
+            'engagement_rate': metric.get('avg_engagement_rate', 0)
+        }
+        for metric in recent_metrics
+    ]
+    
+    return follower_data, engagement_patterns
+
+def _audience_input_hash(follower_data: dict, engagement_patterns: list) -> str:
+    """Hash the inputs at the resolution that matters for the insights.
+    
+    Follower counts are kept to 3 significant digits, growth to whole percent
+    and engagement rates to 0.1 points, so hourly noise does not trigger a new
+    analysis but a material change does.
+    """
+    followers = follower_data['count']
+    material = {
+        'followers': float(f"{followers:.3g}") if followers else 0,
+        'growth': round(follower_data['growth_rate']),
+        'engagement': [round(p['engagement_rate'], 1) for p in engagement_patterns]
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _basic_audience_insights(follower_data: dict, engagement_patterns: list) -> dict:
+    """Provide basic insights based on data when the AI analysis is unavailable"""
+    avg_engagement = sum(p['engagement_rate'] for p in engagement_patterns) / len(engagement_patterns) if engagement_patterns else 0
+    
+    return {
+        'audience_profile': f"Sua audiência de {follower_data['count']} seguidores tem uma taxa de engajamento média de {avg_engagement:.2f}%",
+        'best_posting_times': ['09:00', '12:00', '18:00'],
+        'top_content_types': ['Imagens', 'Vídeos', 'Stories'],
+        'growth_opportunities': [
+            'Postar com mais consistência',
+            'Usar hashtags relevantes',
+            'Interagir mais com seguidores'
+        ],
+        'strategic_recommendations': [
+            'Mantenha uma frequência regular de posts',
+            'Responda aos comentários rapidamente',
+            'Crie conteúdo que gere conversas'
+        ]
+    }
+
+@celery_app.task(bind=True)
+def compute_audience_insights(self, profile_id: str, force: bool = False):
+    """Compute and store audience insights for a profile when its data changed materially"""
+    try:
+        connect_to_mongo()
+        db = get_database()
+        
+        current_task.update_state(
+            state='PROGRESS',
+            meta={'status': f'Computing audience insights for profile {profile_id}'}
+        )
+        
+        # Get recent metrics for analysis
+        recent_metrics = list(db.metrics.find(
+            {"profile_id": ObjectId(profile_id)},
+            {"followers_count": 1, "avg_engagement_rate": 1, "date": 1}
+        ).sort("date", -1).limit(10))
+        
+        if not recent_metrics:
+            return {
+                'profile_id': profile_id,
+                'success': True,
+                'updated': False,
+                'reason': 'no_metrics',
+                'completed_at': datetime.utcnow().isoformat()
+            }
+        
+        follower_data, engagement_patterns = _audience_inputs(recent_metrics)
+        input_hash = _audience_input_hash(follower_data, engagement_patterns)
+        
+        existing = db.audience_insights.find_one(
+            {"profile_id": ObjectId(profile_id)},
+            {"input_hash": 1}
+        )
+        if existing and existing.get('input_hash') == input_hash and not force:
+            logger.info(f"Audience data unchanged for profile {profile_id}, keeping stored insights")
+            return {
+                'profile_id': profile_id,
+                'success': True,
+                'updated': False,
+                'reason': 'unchanged',
+                'completed_at': datetime.utcnow().isoformat()
+            }
+        
+        profile = db.profiles.find_one({"_id": ObjectId(profile_id)}, {"subscription_status": 1}) or {}
+        with _budget_scope(profile_id, profile.get('subscription_status', 'free')):
+            insights = _run_async(ai_service.analyze_audience_insights(
+                follower_data=follower_data,
+                engagement_patterns=engagement_patterns
+            ))
+        source = 'ai' if insights else 'basic'
+        if not insights:
+            insights = _basic_audience_insights(follower_data, engagement_patterns)
+        
+        now = datetime.utcnow()
+        update = {
+            "$set": {
+                "insights": insights,
+                "source": source,
+                "follower_data": follower_data,
+                "updated_at": now
+            },
+            "$inc": {"version": 1},
+            "$setOnInsert": {"created_at": now}
+        }
+        # Fallback insights keep no input hash, so the next run retries the AI analysis on the same data
+        if source == 'ai':
+            update["$set"]["input_hash"] = input_hash
+        else:
+            update["$unset"] = {"input_hash": ""}
+        result = db.audience_insights.find_one_and_update(
+            {"profile_id": ObjectId(profile_id)},
+            update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"version": 1}
+        )
+        
+        logger.info(f"Stored audience insights v{result['version']} for profile {profile_id} ({source})")
+        
+        return {
+            'profile_id': profile_id,
+            'success': True,
+            'updated': True,
+            'version': result['version'],
+            'source': source,
+            'completed_at': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error computing audience insights for profile {profile_id}: {e}")
+        return {
+            'profile_id': profile_id,
+            'success': False,
+            'error': str(e),
+            'completed_at': datetime.utcnow().isoformat()
+        }
+
+def _update_job(job_id: str, **fields):
+    """Update an AI job record created by the backend"""
+    key = f"{AI_JOB_KEY_PREFIX}{job_id}"
+    try:
+        client = get_redis()
+        value = client.get(key)
+        job = json.loads(value) if value else {'job_id': job_id}
+        job.update(fields, updated_at=datetime.utcnow().isoformat())
+        client.set(key, json.dumps(job, default=str), ex=settings.ai_job_ttl_seconds)
+    except Exception as e:
+        logger.error(f"Error updating AI job {job_id}: {e}")
+
+def _fail_job(job_id: str, request_key: str, error: str):
+    """Mark a job as failed and let identical requests start a new one"""
+    _update_job(job_id, status='failed', error=error)
+    try:
+        get_redis().delete(request_key)
+    except Exception as e:
+        logger.warning(f"Error releasing AI job request {request_key}: {e}")
+
+@celery_app.task(bind=True)
+def run_post_analysis(
+    self,
+    job_id: str,
+    request_key: str,
+    caption: str,
+    media_type: str,
+    niche: str,
+    profile_id: str = None,
+    tier: str = 'free'
+):
+    """Analyze a post for an AI job submitted through the API"""
+    try:
+        _update_job(job_id, status='running')
+        
+        with _budget_scope(profile_id, tier, PRIORITY_INTERACTIVE):
+            analysis = _run_async(ai_service.analyze_post_content(
+                caption=caption,
+                media_type=media_type,
+                niche=niche
+            ))
+        
+        if not analysis:
+            _fail_job(job_id, request_key, 'Failed to analyze post content')
+            return {'job_id': job_id, 'success': False}
+        
+        _update_job(job_id, status='completed', result=analysis)
+        return {'job_id': job_id, 'success': True}
+        
+    except Exception as e:
+        logger.error(f"Error in post analysis job {job_id}: {e}")
+        _fail_job(job_id, request_key, 'Internal error')
+        return {'job_id': job_id, 'success': False, 'error': str(e)}
+
+@celery_app.task(bind=True)
+def run_post_feedback(
+    self,
+    job_id: str,
+    request_key: str,
+    profile_id: str,
+    post_id: str,
+    post_url: str,
+    post_caption: str,
+    post_type: str,
+    niche: str,
+    tier: str = 'free'
+):
+    """Generate and save feedback for a post for an AI job submitted through the API"""
+    try:
+        connect_to_mongo()
+        db = get_database()
+        
+        _update_job(job_id, status='running')
+        
+        existing_feedback = db.posts_feedback.find_one({"post_id": post_id}, {"_id": 1})
+        if existing_feedback:
+            _update_job(job_id, status='completed', result={
+                'message': 'Feedback already exists for this post',
+                'feedback_id': str(existing_feedback['_id'])
+            })
+            return {'job_id': job_id, 'success': True}
+        
+        with _budget_scope(profile_id, tier, PRIORITY_INTERACTIVE):
+            feedback = _run_async(ai_service.create_post_feedback(
+                profile_id=profile_id,
+                post_id=post_id,
+                post_url=post_url,
+                post_caption=post_caption,
+                post_type=post_type,
+                niche=niche
+            ))
+        
+        if not feedback:
+            _fail_job(job_id, request_key, 'Failed to generate post feedback')
+            return {'job_id': job_id, 'success': False}
+        
+        feedback_data = PostFeedbackInDB(**feedback.model_dump())
+        feedback_document = feedback_data.model_dump(by_alias=True)
+        # model_dump() turns ObjectIds into strings; feedback is looked up by ObjectId everywhere
+        feedback_document["_id"] = feedback_data.id
+        feedback_document["profile_id"] = feedback_data.profile_id
+        result = db.posts_feedback.insert_one(feedback_document)
+        feedback_stats_service.record(feedback_document)
+        bump_list_version([feedback_document["profile_id"]], "feedback")
+        
+        _update_job(job_id, status='completed', result={
+            'message': 'Post feedback generated successfully',
+            'feedback_id': str(result.inserted_id)
+        })
+        return {'job_id': job_id, 'success': True, 'feedback_id': str(result.inserted_id)}
+        
+    except Exception as e:
+        logger.error(f"Error in post feedback job {job_id}: {e}")
+        _fail_job(job_id, request_key, 'Internal error')
+        return {'job_id': job_id, 'success': False, 'error': str(e)}
@@ -2,12 +2,25 @@ from celery import current_task
 from app.celery_app import celery_app
 from app.database import get_database, connect_to_mongo
 from app.services.email_service import email_service
+from ugc_shared.services.report_storage import report_file_key, report_storage
 from datetime import datetime
+from typing import Optional
 from bson import ObjectId
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _report_pdf(report: dict) -> Optional[bytes]:
+    """A report's PDF from storage, or None to send the email without it"""
+    key = report_file_key(report)
+    if not key:
+        return None
+    try:
+        return report_storage.read(key)
+    except Exception as e:
+        logger.warning(f"Could not read report file {key}: {e}")
+        return None
+
 @celery_app.task(bind=True)
 def send_welcome_email(self, user_id: str):
     """Send welcome email to a new user"""
@@ -85,7 +98,7 @@ def send_report_notification(self, user_id: str, report_id: str):
             to_email=user['email'],
             user_name=user['full_name'],
             report_title=report['title'],
-            report_path=report.get('file_path')
+            report_pdf=_report_pdf(report)
         )
         
         if success:
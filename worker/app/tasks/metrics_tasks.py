@@ -1,20 +1,11 @@
 from celery import current_task
 from app.celery_app import celery_app
 from app.database import get_database, connect_to_mongo
+from app.tasks.ai_tasks import compute_audience_insights
 from datetime import datetime, timedelta
+from ugc_shared.services.instagram_service import instagram_service
 import logging
 import asyncio
-import sys
-import os
-
-# Add the backend directory to the path to import services
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'backend'))
-
-try:
-    from app.services.instagram_service import instagram_service
-except ImportError:
-    # Fallback if import fails
-    instagram_service = None
 
 logger = logging.getLogger(__name__)
 
@@ -50,27 +41,24 @@ def collect_all_metrics(self):
                     }
                 )
                 
-                if instagram_service:
-                    # Use asyncio to run the async function
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    success = loop.run_until_complete(
-                        instagram_service.collect_user_metrics(profile_id)
-                    )
-                    
-                    loop.close()
-                    
-                    if success:
-                        success_count += 1
-                        logger.info(f"Successfully collected metrics for profile {profile_id}")
-                    else:
-                        error_count += 1
-                        logger.error(f"Failed to collect metrics for profile {profile_id}")
+                # Use asyncio to run the async function
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                
+                success = loop.run_until_complete(
+                    instagram_service.collect_user_metrics(profile_id)
+                )
+                
+                loop.close()
+                
+                if success:
+                    success_count += 1
+                    logger.info(f"Successfully collected metrics for profile {profile_id}")
+                    compute_audience_insights.delay(profile_id)
                 else:
-                    logger.warning("Instagram service not available")
                     error_count += 1
-                    
+                    logger.error(f"Failed to collect metrics for profile {profile_id}")
+                
             except Exception as e:
                 error_count += 1
                 logger.error(f"Error collecting metrics for profile {profile.get('_id')}: {e}")
@@ -100,41 +88,33 @@ def collect_profile_metrics(self, profile_id: str):
             meta={'status': f'Collecting metrics for profile {profile_id}'}
         )
         
-        if instagram_service:
-            # Use asyncio to run the async function
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            success = loop.run_until_complete(
-                instagram_service.collect_user_metrics(profile_id)
-            )
-            
-            loop.close()
-            
-            if success:
-                logger.info(f"Successfully collected metrics for profile {profile_id}")
-                return {
-                    'profile_id': profile_id,
-                    'success': True,
-                    'completed_at': datetime.utcnow().isoformat()
-                }
-            else:
-                logger.error(f"Failed to collect metrics for profile {profile_id}")
-                return {
-                    'profile_id': profile_id,
-                    'success': False,
-                    'error': 'Failed to collect metrics',
-                    'completed_at': datetime.utcnow().isoformat()
-                }
+        # Use asyncio to run the async function
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        success = loop.run_until_complete(
+            instagram_service.collect_user_metrics(profile_id)
+        )
+        
+        loop.close()
+        
+        if success:
+            logger.info(f"Successfully collected metrics for profile {profile_id}")
+            compute_audience_insights.delay(profile_id)
+            return {
+                'profile_id': profile_id,
+                'success': True,
+                'completed_at': datetime.utcnow().isoformat()
+            }
         else:
-            logger.error("Instagram service not available")
+            logger.error(f"Failed to collect metrics for profile {profile_id}")
             return {
                 'profile_id': profile_id,
                 'success': False,
-                'error': 'Instagram service not available',
+                'error': 'Failed to collect metrics',
                 'completed_at': datetime.utcnow().isoformat()
             }
-            
+        
     except Exception as e:
         logger.error(f"Error collecting metrics for profile {profile_id}: {e}")
         return {
@@ -1,11 +1,19 @@
 from celery import current_task
 from app.celery_app import celery_app
 from app.database import get_database, connect_to_mongo
+from ugc_shared.list_versions import bump_list_version
 from app.services.report_generator import report_generator
 from app.services.email_service import email_service
+from app.services.records import FeedbackRecord, MetricRecord, feedback_records, metric_records
+from app.services.report_reuse import report_reuse
+from ugc_shared.services.report_storage import report_file_key, report_storage
+from app.services.report_templates import report_template
+from app.config import settings
 from datetime import datetime, timedelta
 from bson import ObjectId
+import glob
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -158,13 +166,13 @@ def generate_profile_report(
     try:
         connect_to_mongo()
         db = get_database()
+        template = report_template(report_type)
         
         # Set default date range if not provided
         if not period_end:
             period_end = datetime.utcnow()
         if not period_start:
-            days = 7 if report_type == 'weekly' else 30
-            period_start = period_end - timedelta(days=days)
+            period_start = period_end - timedelta(days=template.period_days)
         
         current_task.update_state(
             state='PROGRESS',
@@ -172,51 +180,85 @@ def generate_profile_report(
         )
         
         # Get profile data
-        profile = db.profiles.find_one({"_id": ObjectId(profile_id)})
+        profile = db.profiles.find_one({"_id": ObjectId(profile_id)}, {"display_name": 1, "niche": 1, "user_id": 1})
         if not profile:
             raise ValueError(f"Profile {profile_id} not found")
         
         # Get user data for email
-        user = db.users.find_one({"_id": profile['user_id']})
+        user = db.users.find_one({"_id": profile['user_id']}, {"email": 1, "full_name": 1})
         if not user:
             raise ValueError(f"User for profile {profile_id} not found")
         
-        # Get metrics data for the period
-        metrics_data = list(db.metrics.find({
+        # Get metrics data for the period, only the fields the report uses
+        metrics_data = metric_records(db.metrics.find({
             "profile_id": ObjectId(profile_id),
             "date": {
                 "$gte": period_start,
                 "$lte": period_end
             }
-        }).sort("date", -1))
+        }, MetricRecord.PROJECTION).sort("date", -1))
         
         # Get feedback data for the period
-        feedback_data = list(db.posts_feedback.find({
+        feedback_data = feedback_records(db.posts_feedback.find({
             "profile_id": ObjectId(profile_id),
             "created_at": {
                 "$gte": period_start,
                 "$lte": period_end
             }
-        }).sort("created_at", -1))
+        }, FeedbackRecord.PROJECTION).sort("created_at", -1))
         
         # Generate report title
         report_title = f"Relatório {report_type.title()} - {period_start.strftime('%d/%m/%Y')} a {period_end.strftime('%d/%m/%Y')}"
         
+        # Reuse the stored report when nothing it is rendered from has changed
+        fingerprint = report_reuse.fingerprint(
+            report_generator.TEMPLATE_VERSION,
+            profile,
+            report_type,
+            period_start,
+            period_end,
+            metrics_data,
+            feedback_data
+        )
+        existing_report = report_reuse.find(ObjectId(profile_id), fingerprint)
+        if existing_report:
+            # Its notification went out when it was generated
+            logger.info(f"Reusing report {existing_report['_id']} for profile {profile_id}: inputs unchanged")
+            return {
+                'profile_id': profile_id,
+                'report_id': str(existing_report['_id']),
+                'report_type': report_type,
+                'file_key': report_file_key(existing_report),
+                'reused': True,
+                'email_sent': False,
+                'completed_at': datetime.utcnow().isoformat()
+            }
+        
         # Generate PDF report
         current_task.update_state(
             state='PROGRESS',
             meta={'status': 'Generating PDF report'}
         )
         
-        report_path = report_generator.generate_performance_report(
+        report_pdf = report_generator.generate_performance_report(
             profile_data=profile,
             metrics_data=metrics_data,
             feedback_data=feedback_data,
             report_title=report_title,
             period_start=period_start,
-            period_end=period_end
+            period_end=period_end,
+            template=template
+        )
+        
+        # Upload the PDF straight from the buffer
+        current_task.update_state(
+            state='PROGRESS',
+            meta={'status': f'Storing PDF report ({report_storage.name})'}
         )
         
+        file_key = f"report_{profile_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
+        report_storage.save(file_key, report_pdf, "application/pdf")
+        
         # Save report record to database
         current_task.update_state(
             state='PROGRESS',
@@ -230,13 +272,16 @@ def generate_profile_report(
             "report_type": report_type,
             "period_start": period_start,
             "period_end": period_end,
-            "file_path": report_path,
+            "file_key": file_key,
+            "fingerprint": fingerprint,
+            "template_version": report_generator.TEMPLATE_VERSION,
             "is_ready": True,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
         
         result = db.reports.insert_one(report_record)
+        bump_list_version([ObjectId(profile_id)], "reports")
         report_id = str(result.inserted_id)
         
         # Send email notification
@@ -250,7 +295,7 @@ def generate_profile_report(
                 to_email=user['email'],
                 user_name=user['full_name'],
                 report_title=report_title,
-                report_path=report_path
+                report_pdf=report_pdf.getvalue()
             )
             
             if not email_sent:
@@ -262,7 +307,8 @@ def generate_profile_report(
             'profile_id': profile_id,
             'report_id': report_id,
             'report_type': report_type,
-            'report_path': report_path,
+            'file_key': file_key,
+            'reused': False,
             'email_sent': send_email and email_sent,
             'completed_at': datetime.utcnow().isoformat()
         }
@@ -281,32 +327,46 @@ def cleanup_old_reports(self, days_to_keep: int = 180):
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
         
         # Get old reports
-        old_reports = list(db.reports.find({
-            "created_at": {"$lt": cutoff_date}
-        }))
+        old_reports = db.reports.find(
+            {"created_at": {"$lt": cutoff_date}},
+            {"file_key": 1, "file_path": 1, "profile_id": 1}
+        )
         
         deleted_files = 0
+        affected_profiles = set()
         
         # Delete files
         for report in old_reports:
+            affected_profiles.add(report.get("profile_id"))
+            file_key = report_file_key(report)
             try:
-                file_path = report.get('file_path')
-                if file_path and os.path.exists(file_path):
-                    os.remove(file_path)
+                if file_key and report_storage.delete(file_key):
                     deleted_files += 1
             except Exception as e:
-                logger.warning(f"Could not delete report file {file_path}: {e}")
+                logger.warning(f"Could not delete report file {file_key}: {e}")
         
         # Delete database records
         result = db.reports.delete_many({
             "created_at": {"$lt": cutoff_date}
         })
+        if result.deleted_count:
+            bump_list_version(affected_profiles, "reports")
+        
+        # Charts used to be written next to the reports and never removed; they are now rendered in memory
+        deleted_charts = 0
+        for chart_path in glob.glob(os.path.join(settings.reports_dir, "chart_*.png")):
+            try:
+                os.remove(chart_path)
+                deleted_charts += 1
+            except OSError as e:
+                logger.warning(f"Could not delete chart file {chart_path}: {e}")
         
-        logger.info(f"Cleaned up {result.deleted_count} old report records and {deleted_files} files")
+        logger.info(f"Cleaned up {result.deleted_count} old report records, {deleted_files} files and {deleted_charts} leftover charts")
         
         return {
             'deleted_records': result.deleted_count,
             'deleted_files': deleted_files,
+            'deleted_charts': deleted_charts,
             'cutoff_date': cutoff_date.isoformat(),
             'completed_at': datetime.utcnow().isoformat()
         }